@@ -0,0 +1,238 @@
+# SolarCalculator/src/backend/batch.py
+# Batch runner streaming JSONL events through the input, solar potential and results stages on a process pool.
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from itertools import islice
+from json import dumps as j_dumps, loads as j_loads
+from logging import getLogger
+from os import cpu_count
+from os.path import isfile, getsize
+from time import perf_counter
+from typing import Callable, Iterator, List, Set, Tuple
+
+from pydantic import BaseModel
+
+from utils import check_http_response, Status
+from dynamo_writer import DynamoBatchWriter, DynamoWriteError, BATCH_SIZE
+
+LOGGER = getLogger(__name__)
+
+BATCH_MAX_WORKERS = cpu_count() or 1
+PROGRESS_EVERY = 100  # Log progress after this many events.
+# Results' DynamoDB items are sent back from the workers under this key and batch written by the parent, which only
+# checkpoints an event's line once its items are written (see run_batch()).
+DYNAMODB_ITEMS_KEY = '_dynamodb_items'
+
+
+class _ItemCollector:
+    """Stands in for a DynamoBatchWriter in the workers, collecting the items an event would write."""
+
+    def __init__(self, table_name: str):
+        self.table_name = table_name
+        self.items = []
+
+    def put_item(self, item: dict) -> None:
+        self.items.append(item)
+
+
+def run_event(event: dict) -> dict:
+    """
+    Run one event through the in-process pipeline (see pipeline.py) and return the results dict, with the DynamoDB
+    items to write under DYNAMODB_ITEMS_KEY.
+    """
+
+    # Imported in the workers only, so the parent process never loads the results stage's dependencies.
+    from config import DYNAMODB_TABLE_NAME
+    from pipeline import pipeline_handler
+
+    collector = _ItemCollector(table_name=DYNAMODB_TABLE_NAME)
+    result = pipeline_handler(event=event, writer=collector)
+    result[DYNAMODB_ITEMS_KEY] = collector.items
+    return result
+
+
+def _status_code(data: dict) -> int:
+    """Return the status code of a stage's output, whose status is a dict on success and a Status on failure."""
+
+    status = data.get('status')
+    return status.status_code if isinstance(status, Status) else (status or {}).get('status_code')
+
+
+def _to_json(obj):
+    """json.dumps default for the pydantic models (e.g., Status) that stage handlers leave in failed outputs."""
+
+    if isinstance(obj, BaseModel):
+        return obj.dict()
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+def _init_worker() -> None:
+    """Let worker processes share in-flight PVWatts lookups through the solar cache."""
+
+    import solar_potential
+    solar_potential.COALESCE_ACROSS_PROCESSES = True
+
+
+def _run_line(line_number: int, line: str,
+              pipeline: Callable[[dict], dict]) -> Tuple[int, str, bool, List[dict]]:
+    """
+    Process one JSONL line in a worker and return its line number, output JSONL line, success and the DynamoDB
+    items still to be written for it.
+    """
+
+    try:
+        result = pipeline(j_loads(line))
+    except Exception as e:
+        LOGGER.error(f'Line {line_number} failed: {e}', exc_info=True)
+        result = {'status': Status(status_code=400, message=f'Batch event failed due to error: {e.__repr__()}')}
+    items = result.pop(DYNAMODB_ITEMS_KEY, None) or []
+    ok = check_http_response(response_code=_status_code(result))
+
+    return line_number, j_dumps({'line': line_number, **result}, default=_to_json), ok, items
+
+
+def _write_items(writer, lines: List[Tuple[int, str, bool, List[dict]]]) -> Set[int]:
+    """Batch write the DynamoDB items of lines and return the line numbers whose items could not be written."""
+
+    failed_uids = set()
+    requests = [item for *_, items in lines for item in items]
+    try:
+        for item in requests:
+            try:
+                writer.put_item(item=item)
+            except DynamoWriteError as e:
+                failed_uids.update(request['PutRequest']['Item'].get('uid') for request in e.requests)
+        writer.flush()
+    except DynamoWriteError as e:
+        failed_uids.update(request['PutRequest']['Item'].get('uid') for request in e.requests)
+
+    return {line_number for line_number, *_, items in lines if any(item.get('uid') in failed_uids for item in items)}
+
+
+def load_checkpoint(out_path: str) -> Set[int]:
+    """
+    Return the input line numbers already written to out_path.
+    A partially written last line (from an interrupted run) is truncated so the file can be appended to.
+    """
+
+    if not isfile(out_path) or not getsize(out_path):
+        return set()
+
+    with open(out_path, 'rb+') as out:
+        data = out.read()
+        end = data.rfind(b'\n') + 1
+        if end != len(data):
+            LOGGER.warning(f'Truncating a partially written line from: {out_path}')
+            out.truncate(end)
+
+    return {j_loads(line)['line'] for line in data[:end].splitlines() if line.strip()}
+
+
+def _read_events(in_path: str, skip: Set[int]) -> Iterator[Tuple[int, str]]:
+    """Lazily yield (line number, line) for the non blank lines of in_path that are not in skip."""
+
+    with open(in_path, 'r') as file:
+        for line_number, line in enumerate(file, start=1):
+            if line.strip() and line_number not in skip:
+                yield line_number, line
+
+
+def run_batch(in_path: str, out_path: str, max_workers: int = BATCH_MAX_WORKERS,
+              pipeline: Callable[[dict], dict] = run_event, progress_every: int = PROGRESS_EVERY,
+              writer: DynamoBatchWriter = None) -> dict:
+    """
+    Stream the events in a JSONL file through pipeline on a process pool and append the results to a JSONL file.
+    Each output line carries the input 'line' number, so rerunning after an interruption resumes where it stopped.
+    Lines are only written once their DynamoDB items (see run_event()) are, in batch writes of up to 25 items. A line
+    whose items could not be written is left out, so it is rerun on resume.
+
+    :param in_path: Path to a JSONL file of events (one main_handler() event per line).
+    :param out_path: Path to the JSONL results file, which is also the checkpoint.
+    :param max_workers: Number of worker processes, defaults to one per core.
+    :param pipeline: Picklable top level function run on each event, defaults to run_event().
+    :param progress_every: Log progress and throughput after this many events.
+    :param writer: DynamoBatchWriter for the items, created for DYNAMODB_TABLE_NAME once the first item arrives.
+    :return dictionary summary of the run.
+    """
+
+    done_lines = load_checkpoint(out_path=out_path)
+    total = sum(1 for _ in _read_events(in_path=in_path, skip=done_lines))
+    LOGGER.info(f'Running batch over {total} events from {in_path} with {max_workers} workers '
+                f'({len(done_lines)} already complete)')
+
+    events = _read_events(in_path=in_path, skip=done_lines)
+    processed, failed, start = 0, 0, perf_counter()
+    unwritten, unwritten_items = [], 0  # Finished lines waiting on their DynamoDB items' batch write
+
+    def checkpoint() -> None:
+        """Write the DynamoDB items of the unwritten lines, then the lines whose items were written."""
+
+        nonlocal writer, processed, failed, unwritten, unwritten_items
+        not_written = set()
+        if unwritten_items:
+            if writer is None:
+                from config import DYNAMODB_TABLE_NAME
+                writer = DynamoBatchWriter(table_name=DYNAMODB_TABLE_NAME, key_names=['uid'], flush_interval=0)
+            not_written = _write_items(writer=writer, lines=unwritten)
+        for line_number, result, ok, _ in unwritten:
+            processed += 1
+            if line_number in not_written:
+                LOGGER.error(f'Line {line_number} is not checkpointed since its DynamoDB items were not written')
+                failed += 1
+                continue
+            out.write(result + '\n')
+            failed += not ok
+            if processed % progress_every == 0 or processed == total:
+                elapsed = perf_counter() - start
+                rate = processed / elapsed if elapsed else 0
+                eta = (total - processed) / rate if rate else 0
+                LOGGER.info(f'Batch progress: {processed}/{total} events ({failed} failed), '
+                            f'{rate:.1f} events/s, eta {eta:.0f}s')
+        # Flush each checkpoint so an interrupted run loses at most the events still in flight or unwritten.
+        out.flush()
+        unwritten, unwritten_items = [], 0
+
+    with open(out_path, 'a') as out, \
+            ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker) as executor:
+        # Only keep a bounded number of events in flight so large files are never loaded all at once.
+        pending = {executor.submit(_run_line, *event, pipeline) for event in islice(events, max_workers * 2)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                for event in islice(events, 1):
+                    pending.add(executor.submit(_run_line, *event, pipeline))
+                line = future.result()
+                unwritten.append(line)
+                unwritten_items += len(line[3])
+            # Write once a batch of items is ready, or right away if the lines have none
+            if not unwritten_items or unwritten_items >= BATCH_SIZE or not pending:
+                checkpoint()
+        if unwritten:
+            checkpoint()
+    if writer is not None:
+        writer.close()
+
+    elapsed = perf_counter() - start
+    summary = {
+        'processed': processed,
+        'failed': failed,
+        'skipped': len(done_lines),
+        'seconds': round(elapsed, 3),
+        'events_per_second': round(processed / elapsed, 2) if elapsed else 0,
+    }
+    LOGGER.info(f'Batch complete: {summary}')
+    return summary
+
+
+if __name__ == '__main__':
+    from logging import basicConfig, INFO
+
+    parser = ArgumentParser(description='Run a JSONL file of events through the SolarCalculator pipeline.')
+    parser.add_argument('in_path', help='JSONL file with one event per line.')
+    parser.add_argument('out_path', help='JSONL results file. Rerunning with the same file resumes the batch.')
+    parser.add_argument('--workers', type=int, default=BATCH_MAX_WORKERS, help='Number of worker processes.')
+    parser.add_argument('--progress-every', type=int, default=PROGRESS_EVERY)
+    args = parser.parse_args()
+
+    basicConfig(level=INFO, format='%(levelname)s:%(asctime)s: %(message)s')
+    print(run_batch(args.in_path, args.out_path, max_workers=args.workers, progress_every=args.progress_every))
@@ -0,0 +1,52 @@
+# SolarCalculator/src/backend/cassette.py
+# Record/replay of PVWatts responses as json cassettes so the pipeline can run and be measured offline.
+from logging import getLogger
+from json import dump as j_dump, load as j_load
+from os import makedirs
+from os.path import join, isfile
+from typing import Literal, Optional
+
+from utils import ROOT
+from solar_cache import cache_key
+
+LOGGER = getLogger(__name__)
+
+CASSETTE_DIR = join(ROOT, 'samples/pvwatts/cassettes')
+
+
+class CassetteError(Exception):
+    """Custom exception for a request with no recorded cassette while replaying."""
+
+
+class Cassette:
+    """
+    A directory of recorded PVWatts responses, one json file per request keyed like the response cache.
+    In 'record' mode live responses are written to it, in 'replay' mode responses are only ever read from it.
+    """
+
+    def __init__(self, mode: Literal['record', 'replay'], path: str = CASSETTE_DIR):
+        self.mode = mode
+        self.path = path
+        if mode == 'record':
+            makedirs(path, exist_ok=True)
+
+    def _file(self, params: dict) -> str:
+        """Return the path of the cassette for params."""
+
+        return join(self.path, f'{cache_key(params)}.json')
+
+    def play(self, params: dict) -> Optional[dict]:
+        """Return the recorded response for params or None if it was never recorded."""
+
+        file_path = self._file(params=params)
+        if not isfile(file_path):
+            return None
+        with open(file_path, 'r') as file:
+            return j_load(file).get('response')
+
+    def record(self, params: dict, response: dict) -> None:
+        """Write a response to the cassette for params. The api key is never part of params so is not recorded."""
+
+        with open(self._file(params=params), 'w') as file:
+            j_dump({'params': params, 'response': response}, file, indent=2)
+        LOGGER.info(f'PVWatts response recorded to cassette: {self._file(params=params)}')
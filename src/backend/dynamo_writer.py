@@ -0,0 +1 @@
+../utils/dynamo_writer.py
\ No newline at end of file
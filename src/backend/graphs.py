@@ -0,0 +1,187 @@
+# SolarCalculator/src/backend/graphs.py
+# Thread-safe comparison graph renderer using matplotlib's object-oriented api on the Agg backend (no pyplot).
+from argparse import ArgumentParser
+from io import BytesIO
+from logging import getLogger
+from threading import local
+from time import perf_counter
+from typing import Literal, Sequence
+
+from utils import MONTHS_MAP
+
+LOGGER = getLogger(__name__)
+
+GRAPH_FORMAT = 'png'
+# key: [first dataset color, second dataset color]
+COLOR_MAP = {
+    'energy': ['indianred', 'gold'],
+    'cost': ['red', 'green']
+}
+_MONTHS = list(MONTHS_MAP.values())
+_TEMPLATES = local()
+
+
+class GraphTemplate:
+    """
+    A pre-styled figure that is rendered, cleared and reused for every graph drawn by one thread.
+    Figures never touch pyplot, so they are not registered globally and are freed with the template.
+    """
+
+    def __init__(self):
+        # matplotlib is only imported once a graph is rendered, keeping it out of the cold start of every stage
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        self.figure = Figure()
+        self.canvas = FigureCanvasAgg(self.figure)
+        self.ax = self.figure.add_subplot()
+        self.renders = 0
+        # tight_layout() is a large share of a render, so the margins it finds are reused for graphs whose labels
+        # take the same space: same type, y label and number of digits in the tallest bar.
+        self._layouts = {}
+
+    def _style(self) -> None:
+        """Apply the template styling (clearing the axes resets it)."""
+
+        self.ax.set_facecolor('lightseagreen')
+        self.ax.set_xlabel(xlabel='Month')
+
+    def _plot_bar(self, values: Sequence[float], label: str, color: str, top: bool, graph_type: str) -> None:
+        """Plot a bar-plot with its values displayed on the bars."""
+
+        bars = self.ax.bar(
+            x=_MONTHS,
+            height=values,
+            width=1,
+            color=color,
+            label=label,
+            edgecolor='white',
+            capstyle='round',
+            alpha=0.5 if top else 1
+        )
+        self.ax.bar_label(container=bars, padding=-15, fmt='$%g' if graph_type == 'cost' else '%g')
+
+    def render(self, title: str, values1: Sequence[float], values2: Sequence[float], label1: str, label2: str,
+               y_label: str, graph_type: Literal['energy', 'cost'], fmt: str = GRAPH_FORMAT) -> bytes:
+        """Draw 2 overlying monthly bar-plots for comparison and return the encoded image."""
+
+        self._style()
+        try:
+            self.ax.set_title(label=title, weight='bold')
+            self._plot_bar(values=values1, label=label1, color=COLOR_MAP[graph_type][0], top=False,
+                           graph_type=graph_type)
+            self._plot_bar(values=values2, label=label2, color=COLOR_MAP[graph_type][1], top=True,
+                           graph_type=graph_type)
+            self.ax.set_ylabel(ylabel=y_label)
+            # Rotate month (x) labels by 45 degrees
+            self.ax.tick_params(axis='x', labelrotation=45)
+            self.ax.legend(fontsize="large", loc='lower center')
+            layout_key = (graph_type, y_label, len(str(int(max(max(values1), max(values2), 0)))))
+            if layout_key in self._layouts:
+                self.figure.subplots_adjust(**self._layouts[layout_key])
+            else:
+                self.figure.tight_layout()
+                params = self.figure.subplotpars
+                self._layouts[layout_key] = {
+                    'left': params.left, 'right': params.right, 'bottom': params.bottom, 'top': params.top
+                }
+
+            data = BytesIO()
+            self.figure.savefig(data, format=fmt, transparent=True)
+            self.renders += 1
+            return data.getvalue()
+        finally:
+            # Release this graph's artists right away instead of holding them until the next render.
+            self.ax.clear()
+
+
+def get_template() -> GraphTemplate:
+    """Return this thread's GraphTemplate, creating it on first use."""
+
+    template = getattr(_TEMPLATES, 'template', None)
+    if template is None:
+        template = _TEMPLATES.template = GraphTemplate()
+    return template
+
+
+def release_template() -> None:
+    """Drop this thread's GraphTemplate so its figure is freed (e.g., before a worker thread exits)."""
+
+    template = getattr(_TEMPLATES, 'template', None)
+    if template is not None:
+        template.figure.clear()
+        del _TEMPLATES.template
+
+
+def render_comparison_graph(title: str, values1: Sequence[float], values2: Sequence[float], label1: str,
+                            label2: str, y_label: str, graph_type: Literal['energy', 'cost'],
+                            fmt: str = GRAPH_FORMAT) -> bytes:
+    """Render a comparison graph of 2 sets of 12 monthly values on this thread's template and return its bytes."""
+
+    return get_template().render(
+        title=title, values1=values1, values2=values2, label1=label1, label2=label2, y_label=y_label,
+        graph_type=graph_type, fmt=fmt
+    )
+
+
+def warm_template() -> None:
+    """
+    Render a throwaway graph of each type on this thread's template, loading matplotlib, the Agg backend and its
+    font cache before the first real graph. Also the render pool's worker initializer (see results.py).
+    """
+
+    values = [float(value) for value in range(100, 1300, 100)]
+    for graph_type in ('energy', 'cost'):
+        render_comparison_graph(title='Warmup', values1=values, values2=values[::-1], label1='Warmup 1',
+                                label2='Warmup 2', y_label='Warmup', graph_type=graph_type)
+
+
+def _rss_kb() -> int:
+    """Return the current resident set size (KB), falling back to the peak where /proc is unavailable."""
+
+    try:
+        with open('/proc/self/statm', 'r') as statm:
+            from os import sysconf
+            return int(statm.read().split()[1]) * sysconf('SC_PAGE_SIZE') // 1024
+    except OSError:
+        from resource import getrusage, RUSAGE_SELF
+        return getrusage(RUSAGE_SELF).ru_maxrss
+
+
+def benchmark_memory(renders: int = 10000, sample_every: int = 1000) -> dict:
+    """
+    Render the same energy graph repeatedly and sample memory use, to show it stays flat.
+    :return dictionary of the rss samples (KB), growth after the first sample (KB) and renders per second.
+    """
+
+    consumption = [820, 780, 760, 740, 740, 710, 705, 715, 710, 702, 750, 780]
+    production = [600, 680, 820, 900, 980, 990, 1000, 990, 890, 790, 660, 610]
+    samples, start = [], perf_counter()
+    for i in range(1, renders + 1):
+        render_comparison_graph(
+            title="Energy Consumption vs Potential Production", values1=consumption, values2=production,
+            label1='Energy Consumption', label2='Potential Energy Production', y_label='kiloWattHours',
+            graph_type='energy'
+        )
+        if i % sample_every == 0:
+            samples.append(_rss_kb())
+            LOGGER.info(f'{i} renders, rss {samples[-1]} KB')
+
+    return {
+        'renders': renders,
+        'rss_kb': samples,
+        'growth_kb': samples[-1] - samples[0] if samples else 0,
+        'renders_per_second': round(renders / (perf_counter() - start), 1),
+    }
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description='Benchmark comparison graph rendering memory use.')
+    parser.add_argument('--renders', type=int, default=10000)
+    parser.add_argument('--sample-every', type=int, default=1000)
+    args = parser.parse_args()
+
+    result = benchmark_memory(renders=args.renders, sample_every=args.sample_every)
+    print(f"{result['renders']} renders at {result['renders_per_second']}/s")
+    print(f"rss (KB) every {args.sample_every} renders: {result['rss_kb']}")
+    print(f"growth after the first sample: {result['growth_kb']} KB")
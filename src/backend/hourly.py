@@ -0,0 +1,106 @@
+# SolarCalculator/src/backend/hourly.py
+# Hourly (8760 point) solar production profiles stored as float32 NumPy arrays with a memory-mapped disk cache.
+import numpy as np
+
+from logging import getLogger
+from os import makedirs, replace, getpid, listdir, remove, stat, utime
+from os.path import join
+from tempfile import gettempdir
+from time import time
+
+from solar_cache import cache_key, CACHE_TTL
+from solar_potential import _get_params, _get_iridescence_obj
+
+LOGGER = getLogger(__name__)
+
+HOURLY_CACHE_DIR = join(gettempdir(), 'solar_hourly')
+# Profiles are ~35 KB each, so at most ~35 MB of Lambda's /tmp (512 MB by default). Expired like the json cache.
+HOURLY_CACHE_MAX_ENTRIES = 1000
+HOURLY_CACHE_TTL = CACHE_TTL
+HOURS_PER_YEAR = 8760
+# PVWatts uses a typical (non leap) year, so months always start at the same hour.
+_MONTH_DAYS = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+MONTH_STARTS = np.concatenate(([0], np.cumsum(_MONTH_DAYS * 24)[:-1]))
+
+
+def monthly_totals(hourly: np.ndarray) -> np.ndarray:
+    """Sum an hourly series (or a stack of them along the last axis) into 12 monthly totals."""
+
+    return np.add.reduceat(hourly, MONTH_STARTS, axis=-1)
+
+
+def self_consumption_monthly(production: np.ndarray, consumption: np.ndarray) -> np.ndarray:
+    """Return the monthly kWh of production consumed on site (the hourly minimum of production and consumption)."""
+
+    return monthly_totals(np.minimum(production, consumption))
+
+
+def _evict_hourly_profiles(now: float, keep: str) -> None:
+    """
+    Remove the cached profiles older than HOURLY_CACHE_TTL, then the least recently used beyond
+    HOURLY_CACHE_MAX_ENTRIES, never the profile at keep (just written). A profile's modified time is when it was
+    written, its access time when it was last used.
+    """
+
+    profiles = []
+    for file_name in listdir(HOURLY_CACHE_DIR):
+        file_path = join(HOURLY_CACHE_DIR, file_name)
+        if not file_name.endswith('.npy') or file_name.endswith('.tmp.npy') or file_path == keep:
+            continue
+        try:
+            file_stat = stat(file_path)
+            if now - file_stat.st_mtime > HOURLY_CACHE_TTL:
+                remove(file_path)
+            else:
+                profiles.append((file_stat.st_atime, file_path))
+        except FileNotFoundError:
+            # Already evicted by another process
+            continue
+
+    for _, file_path in sorted(profiles)[:max(len(profiles) + 1 - HOURLY_CACHE_MAX_ENTRIES, 0)]:
+        try:
+            remove(file_path)
+        except FileNotFoundError:
+            continue
+
+
+def get_hourly_profile(address: str, **orientation) -> np.ndarray:
+    """
+    Get the hourly ac output (kWh) of a normalized (1 kW) array at the address as a read-only float32 array.
+    Profiles are cached as .npy files and memory-mapped, so repeat lookups neither call the api nor copy the data.
+
+    :param address: String of the address you are analyzing.
+    :param orientation: Optional azimuth, tilt, array_type, module_type and losses params (see _get_params()).
+    :return: float32 array of 8760 hourly kWh values.
+    """
+
+    params = dict(_get_params(capacity=1, address=address, **orientation), timeframe='hourly')
+    file_path = join(HOURLY_CACHE_DIR, f'{cache_key(params)}.npy')
+    now = time()
+    try:
+        written = stat(file_path).st_mtime
+        if now - written <= HOURLY_CACHE_TTL:
+            # Mark it as used (explicitly, since /tmp may be mounted noatime) while keeping when it was written.
+            utime(file_path, (now, written))
+            LOGGER.info(f'Hourly solar profile served from the disk cache: {file_path}')
+            return np.load(file_path, mmap_mode='r')
+    except FileNotFoundError:
+        pass
+
+    # Hourly responses are large, so they are kept out of the json response cache.
+    outputs = _get_iridescence_obj(params=params, use_cache=False).get('outputs')
+    # PVWatts reports hourly ac output in W (Wh per hour)
+    profile = np.asarray(outputs.get('ac'), dtype=np.float32) / np.float32(1000)
+    if profile.shape != (HOURS_PER_YEAR,):
+        LOGGER.error(f'The hourly solar profile has {profile.size} values instead of {HOURS_PER_YEAR}')
+        raise ValueError(f'The hourly solar profile has {profile.size} values instead of {HOURS_PER_YEAR}.')
+
+    # Write to a temporary file first so concurrent readers never map a partially written profile.
+    makedirs(HOURLY_CACHE_DIR, exist_ok=True)
+    tmp_path = f'{file_path}.{getpid()}.{id(profile)}.tmp.npy'
+    np.save(tmp_path, profile)
+    replace(tmp_path, file_path)
+    LOGGER.info(f'Hourly solar profile cached to: {file_path}')
+    _evict_hourly_profiles(now=now, keep=file_path)
+
+    return np.load(file_path, mmap_mode='r')
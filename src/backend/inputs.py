@@ -3,13 +3,20 @@
 from pydantic import PositiveFloat
 
 from logging import getLogger
-from typing import Callable
+from typing import Callable, Iterable, Iterator, List, Tuple
 from datetime import datetime as dt
+from hashlib import sha256
 
 from utils import IntListMonthly, InputData, Status, MONTHS_MAP
+from sheets_client import SheetsClient, get_sheets_client
 
 LOGGER = getLogger(__name__)
 
+# Bulk csv/xlsx layout: a header row then one customer per row with 12 monthly consumption (kWh) and cost ($) columns.
+BULK_CSV_CONSUMPTION = [f'{month} kWh' for month in MONTHS_MAP.values()]
+BULK_CSV_COST = [f'{month} $' for month in MONTHS_MAP.values()]
+BULK_CSV_COLUMNS = ['name', 'address', 'mod_kwh'] + BULK_CSV_CONSUMPTION + BULK_CSV_COST
+
 
 class InputError(Exception):
     """Custom exception for an invalid Input keyword"""
@@ -105,22 +112,18 @@ def input_csv(file_path: str, time_stamp: str) -> InputData:
     LOGGER.info(f'Collecting input data from csv at following location: {file_path}')
 
     def _read_data(r_min: int, r_max: int, column: int, convert: bool, round_to: int = None) -> list:
-        """Read data from input csv based on range min and max values. Converts str to float if specified."""
+        """Read data from the csv rows based on range min and max values. Converts str to float if specified."""
 
-        # Create output list
-        output = []
-        # Open the file in the context manager
-        with open(file_path, 'r') as file:
-            csv = reader(file)
-            # Get input consumption and cost data from csv
-            data_rows = [row for i, row in enumerate(csv) if i in range(r_min, r_max)]
-            # Write the data in the column specified to the output list
-            for row in data_rows:
-                output.append(row[column])
+        # Write the data in the column specified to the output list
+        output = [row[column] for row in rows[r_min:r_max]]
 
         # Convert values to floats and round them if convert is True, else return the output as is
         return [round(float(val), round_to) for val in output] if convert else output
 
+    # Read the file once, the single customer template is only 17 rows long
+    with open(file_path, 'r', newline='') as file:
+        rows = list(reader(file))
+
     # Get data from input csv file
     consumption = _read_data(r_min=1, r_max=13, column=2, convert=True, round_to=0)
     cost = _read_data(r_min=1, r_max=13, column=3, convert=True, round_to=2)
@@ -145,6 +148,92 @@ def input_csv(file_path: str, time_stamp: str) -> InputData:
     return result
 
 
+def _bulk_uid_suffix(*source) -> str:
+    """
+    Return a short hash of where a bulk customer was read from (e.g., sheet and row), appended to their name and
+    time_stamp so customers sharing a name in one bulk input get distinct uids.
+    """
+
+    return sha256(repr(source).encode()).hexdigest()[:8]
+
+
+def _input_bulk_row(row: dict, time_stamp: str, source: tuple = ()) -> InputData:
+    """Build an InputData object from one row of a bulk csv or xlsx. source (e.g., the row number) keys its uid."""
+
+    consumption = [round(float(row[column])) for column in BULK_CSV_CONSUMPTION]
+    cost = [round(float(row[column]), 2) for column in BULK_CSV_COST]
+    name = _clean_name(name=row['name'])
+
+    return InputData(
+        uid=row.get('uid') or name + time_stamp + _bulk_uid_suffix(*source),
+        name=name,
+        time_stamp=dt.now().__str__(),
+        status=Status(status_code=200, message="The customer was read from a bulk input successfully."),
+        address=row['address'],
+        mod_kwh=_validate_mod_kwh(in_data=row['mod_kwh']),
+        consumption_monthly=consumption,
+        consumption_annual=sum(consumption),
+        cost_monthly=cost,
+        cost_annual=round(sum(cost), 2),
+        cost_per_kwh=_calculate_cost_per_kwh(cost=cost, consumption=consumption)
+    )
+
+
+def _input_bulk_rows(rows: Iterable[Tuple[int, dict]], time_stamp: str, errors: List[dict] = None,
+                     source: str = 'the bulk input', **location) -> Iterator[InputData]:
+    """
+    Yield an InputData object for each numbered row, reporting invalid rows to errors (see input_csv_bulk()).
+    location (e.g., the sheet name) is added to each error. Returns the number of customers yielded.
+    """
+
+    count = 0
+    for row_number, row in rows:
+        try:
+            input_data = _input_bulk_row(row=row, time_stamp=time_stamp, source=(*location.values(), row_number))
+        except (ValueError, TypeError, ArithmeticError, KeyError) as e:
+            # e.g., non-numeric values, a 0 kWh month (ZeroDivisionError) or a missing column
+            LOGGER.error(f'Row {row_number} of {source} is invalid: {e}')
+            if errors is None:
+                raise ValueError(f"Row {row_number} of {source} is invalid: {e}") from e
+            errors.append({**location, 'row': row_number, 'name': row.get('name'), 'error': str(e)})
+            continue
+        count += 1
+        yield input_data
+
+    return count
+
+
+def input_csv_bulk(file_path: str, time_stamp: str, errors: List[dict] = None) -> Iterator[InputData]:
+    """
+    Lazily read a bulk csv (one customer per row, see BULK_CSV_COLUMNS) in a single pass, yielding InputData objects.
+    An optional uid column overrides the generated uid.
+
+    :param file_path: Path to the bulk csv.
+    :param time_stamp: Appended to each customer's cleaned name, with a hash of their row, to create their uid.
+    :param errors: If passed, invalid rows are appended to it as {'row', 'name', 'error'} dicts and skipped.
+        Otherwise the first invalid row raises a ValueError.
+    :return generator of InputData objects in file order.
+    """
+
+    from csv import DictReader
+
+    LOGGER.info(f'Streaming input data from bulk csv at following location: {file_path}')
+
+    with open(file_path, 'r', newline='') as file:
+        csv = DictReader(file)
+        missing = [column for column in BULK_CSV_COLUMNS if column not in (csv.fieldnames or [])]
+        if missing:
+            LOGGER.error(f'The bulk csv is missing the following columns: {missing}')
+            raise ValueError(f"The bulk csv is missing the following columns: {missing}")
+
+        # Row 1 is the header
+        count = yield from _input_bulk_rows(
+            rows=enumerate(csv, start=2), time_stamp=time_stamp, errors=errors, source='the bulk csv'
+        )
+
+    LOGGER.info(f'{count} customers successfully collected from bulk csv: {file_path}')
+
+
 @validate
 def input_xlsx(file_path: str, time_stamp: str) -> InputData:
     """Read a xlsx at specified path and return InputData object."""
@@ -191,92 +280,77 @@ def input_xlsx(file_path: str, time_stamp: str) -> InputData:
     return result
 
 
-# @validate
-def input_sheets(sheet_id: str, time_stamp: str) -> InputData:
+def input_xlsx_bulk(file_path: str, time_stamp: str, errors: List[dict] = None,
+                    sheet_names: List[str] = None) -> Iterator[InputData]:
     """
-    _authenticate_google_api_token() script from below and updated slightly by me.
-    https://medium.com/analytics-vidhya/how-to-read-and-write-data-to-google-spreadsheet-using-python-ebf54d51a72c
-
-    Will redirect to a google authenticate page if you have not run in a while and ask you to manually authenticate.
-        Should find a way around this. Probably a permissions issue.
+    Lazily read a bulk xlsx, yielding InputData objects. Every sheet (or each of sheet_names) uses the bulk csv
+    layout (see BULK_CSV_COLUMNS). The workbook is opened read-only and rows are streamed, so memory use stays flat
+    however large the workbook is.
+
+    :param file_path: Path to the bulk xlsx.
+    :param time_stamp: Appended to each customer's cleaned name, with a hash of their row, to create their uid.
+    :param errors: If passed, invalid rows are appended to it as {'sheet', 'row', 'name', 'error'} dicts and skipped.
+        Otherwise the first invalid row or sheet raises a ValueError.
+    :param sheet_names: Sheets to read, defaults to all of them in workbook order.
+    :return generator of InputData objects in workbook order.
     """
 
-    from googleapiclient.discovery import build, Resource
-    from google_auth_oauthlib.flow import InstalledAppFlow
-    from google.auth.transport.requests import Request
-    from google.auth.exceptions import RefreshError
-    from os import remove as os_remove
-    from os.path import exists as os_exists
-    import pickle
+    from openpyxl import load_workbook
 
-    LOGGER.info(f'Collecting input data from the Google Sheet with the following sheet id: {sheet_id}')
+    LOGGER.info(f'Streaming input data from bulk xlsx at following location: {file_path}')
+
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        count = 0
+        for sheet_name in sheet_names or workbook.sheetnames:
+            rows = workbook[sheet_name].iter_rows(values_only=True)
+            header = [str(column).strip() if column is not None else None for column in next(rows, ())]
+            missing = [column for column in BULK_CSV_COLUMNS if column not in header]
+            if missing:
+                LOGGER.error(f'Sheet {sheet_name} of the bulk xlsx is missing the following columns: {missing}')
+                if errors is None:
+                    raise ValueError(f"Sheet {sheet_name} of the bulk xlsx is missing the following columns: {missing}")
+                errors.append({'sheet': sheet_name, 'row': 1, 'name': None, 'error': f'Missing columns: {missing}'})
+                continue
+
+            # Row 1 is the header, blank rows (which openpyxl reports for formatted but empty cells) are skipped
+            numbered_rows = (
+                (row_number, dict(zip(header, values)))
+                for row_number, values in enumerate(rows, start=2) if any(value is not None for value in values)
+            )
+            count += yield from _input_bulk_rows(
+                rows=numbered_rows, time_stamp=time_stamp, errors=errors,
+                source=f'sheet {sheet_name} of the bulk xlsx', sheet=sheet_name
+            )
+    finally:
+        # Read-only workbooks hold the file open until closed
+        workbook.close()
+
+    LOGGER.info(f'{count} customers successfully collected from bulk xlsx: {file_path}')
 
-    scopes = ['https://www.googleapis.com/auth/spreadsheets']
-
-    def _authenticate_google_api_token() -> Resource:
-        """Helper function to authenticate a google sheets api token"""
-
-        LOGGER.info('Attempting to authenticate the google sheets api')
-
-        # 1. set credentials to None
-        credentials = None
-        # 2. if token.pickle exists, open it and set credentials to it
-        if os_exists('./.creds/token.pickle'):
-            LOGGER.info('token.pickle object found')
-            with open('./.creds/token.pickle', 'rb') as token:
-                credentials = pickle.load(token)
-        # 3. if token.pickle did not exist or was invalid do 3.a or 3.b then recreate the token.pickle
-        if not credentials or not credentials.valid:
-            LOGGER.info('Credentials token.pickle found but invalid, attempting to resolve')
-            # 3.a if you have a credentials object but they're expired and support refreshing \
-            #     try to refresh and if that fails then log this error
-            if credentials and credentials.expired and credentials.refresh_token:
-                try:
-                    credentials.refresh(Request())
-                    LOGGER.info('Refreshing the token.pickle successful')
-                except RefreshError:
-                    LOGGER.error("Credentials could not be refreshed, deleting token.pickle and trying again")
-                    os_remove('./.creds/token.pickle')
-                    # Recursive call to rerun the process once the token is deleted. Max call stack = 1
-                    _authenticate_google_api_token()
-            # 3.b in all other cases, create a new flow and token.pickle
-            else:
-                flow = InstalledAppFlow.from_client_secrets_file(
-                    r'./.creds/credentials.json', scopes)
-                credentials = flow.run_local_server(port=0)
-            # Finally, recreate the token.pickle
-            with open('./.creds/token.pickle', 'wb') as token:
-                pickle.dump(credentials, token)
-
-        # 4. Build and return a service (Resource) object
-        LOGGER.info('Successfully authenticated the google sheets api')
-        return build('sheets', 'v4', credentials=credentials)
+
+def _input_sheet_response(response: dict, time_stamp: str, message: str, uid_suffix: str = '') -> InputData:
+    """Build an InputData object from a batchGet response for the SHEET_RANGES of an input sheet."""
 
     def _read_data(column: int, convert: bool, round_to: int = None) -> list:
         """Read data from input google sheet. Converts str to float if specified."""
 
         # Get data from specified column
-        output = input_data.get('valueRanges')[column].get('values')
+        output = response.get('valueRanges')[column].get('values')
         # Convert values to floats and round them if convert is True, else return the output as is
         return [round(float(sublist[0]), round_to) for sublist in output] if convert else output
 
-    # Call the Sheets API and get raw data
-    sheet_ranges = ['C2:C13', 'D2:D13', 'C15:C17']
-    service = _authenticate_google_api_token()
-    sheet = service.spreadsheets()
-    input_data = sheet.values().batchGet(spreadsheetId=sheet_id, ranges=sheet_ranges).execute()
-
     # Get data from input google sheet
     user_data = _read_data(column=2, convert=False)
     consumption = _read_data(column=0, convert=True, round_to=0)
     cost = _read_data(column=1, convert=True, round_to=2)
 
     # Instantiate InputData model
-    result = InputData(
-        uid=_clean_name(user_data[0][0]) + time_stamp,
+    return InputData(
+        uid=_clean_name(user_data[0][0]) + time_stamp + uid_suffix,
         name=_clean_name(user_data[0][0]),
         time_stamp=dt.now().__str__(),
-        status=Status(status_code=200, message="get_inputs() called input_sheets() successfully."),
+        status=Status(status_code=200, message=message),
         address=user_data[1][0],
         mod_kwh=_validate_mod_kwh(in_data=user_data[2][0]),
         consumption_monthly=consumption,
@@ -286,10 +360,61 @@ def input_sheets(sheet_id: str, time_stamp: str) -> InputData:
         cost_per_kwh=_calculate_cost_per_kwh(cost=cost, consumption=consumption)
     )
 
+
+# @validate
+def input_sheets(sheet_id: str, time_stamp: str) -> InputData:
+    """Read a Google Sheet with the process wide Sheets client and return InputData object."""
+
+    LOGGER.info(f'Collecting input data from the Google Sheet with the following sheet id: {sheet_id}')
+
+    result = _input_sheet_response(
+        response=get_sheets_client().batch_get(sheet_id=sheet_id),
+        time_stamp=time_stamp,
+        message="get_inputs() called input_sheets() successfully."
+    )
+
     LOGGER.info(f'InputData successfully collected from Google Sheet')
     return result
 
 
+def input_sheets_bulk(sheet_ids: Iterable[str], time_stamp: str, errors: List[dict] = None,
+                      client: SheetsClient = None, max_workers: int = None) -> Iterator[InputData]:
+    """
+    Read many Google Sheets concurrently with bounded parallelism, yielding InputData objects as each completes.
+
+    :param sheet_ids: Iterable (may be a lazy generator) of sheet ids.
+    :param time_stamp: Appended to each customer's cleaned name, with a hash of their sheet id, to create their uid.
+    :param errors: If passed, sheets that cannot be read or validated are appended to it as {'sheet_id', 'error'}
+        dicts and skipped. Otherwise the first invalid sheet raises a ValueError.
+    :param client: SheetsClient to read with, defaults to the process wide client.
+    :param max_workers: Maximum number of concurrent reads, defaults to the client's.
+    :return generator of InputData objects in completion order.
+    """
+
+    client = client or get_sheets_client()
+    count = 0
+    for sheet_id, response in client.batch_get_many(sheet_ids=sheet_ids, max_workers=max_workers):
+        try:
+            if isinstance(response, Exception):
+                raise response
+            input_data = _input_sheet_response(
+                response=response,
+                time_stamp=time_stamp,
+                message="The customer was read from a bulk input successfully.",
+                uid_suffix=_bulk_uid_suffix(sheet_id)
+            )
+        except Exception as e:
+            LOGGER.error(f'The Google Sheet {sheet_id} is invalid: {e}')
+            if errors is None:
+                raise ValueError(f"The Google Sheet {sheet_id} is invalid: {e}") from e
+            errors.append({'sheet_id': sheet_id, 'error': str(e)})
+            continue
+        count += 1
+        yield input_data
+
+    LOGGER.info(f'{count} customers successfully collected from Google Sheets')
+
+
 @validate
 def input_form(input_obj: dict) -> InputData:
     """Takes web input object and returns InputData object."""
@@ -325,14 +450,16 @@ def get_inputs(input_event: dict) -> InputData:
 
     input_type = input_event.get('type')
     LOGGER.info(f'The event type has been found to be: {input_type}')
+    # Appended to the customer's name to create the uid of file and sheet inputs
+    time_stamp = dt.now().__str__()
 
     # If/elif/else clause to call correct handler function. Raise and log error if no input function is called.
     if input_type == 'csv':
-        input_data = input_csv(file_path=input_event['csv_source'])
+        input_data = input_csv(file_path=input_event['csv_source'], time_stamp=time_stamp)
     elif input_type == 'xlsx':
-        input_data = input_xlsx(file_path=input_event['xlsx_source'])
+        input_data = input_xlsx(file_path=input_event['xlsx_source'], time_stamp=time_stamp)
     elif input_type == 'sheet':
-        input_data = input_sheets(sheet_id=input_event['sheet_id'])
+        input_data = input_sheets(sheet_id=input_event['sheet_id'], time_stamp=time_stamp)
     elif input_type == 'form':
         input_data = input_form(input_obj=input_event['form'])
     else:
@@ -1,21 +1,13 @@
 # # SolarCalculator/src/main.py
 # This is the main module for running this program.
-from logging import getLogger, basicConfig, ERROR
+from logging import getLogger
 
 from utils import check_http_response, Status
 
 from inputs import input_handler
 from solar_potential import solar_potential_handler
 from results import results_handler
-
-basicConfig(
-    # filename='src/logs/main.log', # When running flask app
-    filename='logs/main.log',
-    level=ERROR,
-    format='%(levelname)s:%(filename)s:%(asctime)s:%(funcName)s(): %(message)s',
-    datefmt='%Y/%m/%d-%H.%M.%S',
-    filemode='w',
-)
+from warmup import is_warmup_event, warmup_handler
 
 LOGGER = getLogger(__name__)
 
@@ -25,6 +17,10 @@ def main_handler(event: dict, context) -> dict:
 
     LOGGER.info('main_handler() called.')
 
+    # Warmup events only load what the first request would (graphs, AWS clients, solar cache), not the pipeline
+    if is_warmup_event(event=event):
+        return warmup_handler(event=event)
+
     # Get Input data
     data_input = input_handler(
         event=event,
@@ -48,20 +44,32 @@ def main_handler(event: dict, context) -> dict:
     # Get Results data
     data_results = results_handler(
         input_data=data_input,
-        solar_data=data_solar_potential
+        solar_data=data_solar_potential,
+        chart_mode=event.get("chart_mode")
     )
-    if not check_object(data_results):
+    if not check_http_response(response_code=data_results.get("status").get("status_code")):
         LOGGER.error(
-            f'InputData was returned with a X status code  '
-            + f'and the following message: Y')
+            f'Results were returned with a {data_results.get("status").get("status_code")} status code  '
+            f'and the following message: {data_results.get("status").get("message")}')
     LOGGER.info(f'Results data successfully received for: {data_results.get("uid")}')
 
     return data_results
 
 
 if __name__ == '__main__':
+    from logging import basicConfig, ERROR
     from utils import import_json, SAMPLES
 
+    # Only log to a file when run locally. Lambda's filesystem is read-only outside /tmp and it configures logging.
+    basicConfig(
+        # filename='src/logs/main.log', # When running flask app
+        filename='logs/main.log',
+        level=ERROR,
+        format='%(levelname)s:%(filename)s:%(asctime)s:%(funcName)s(): %(message)s',
+        datefmt='%Y/%m/%d-%H.%M.%S',
+        filemode='w',
+    )
+
     OUT = main_handler(event=import_json(SAMPLES['event_valid_form']), context=None)
     print(OUT)
     # print("STATUS_CODE: ", OUT.get('status').get('status_code'))
@@ -0,0 +1,159 @@
+# SolarCalculator/src/backend/nrel_client.py
+# Pooled, timeout aware http client for the NREL PVWatts api with retries and latency metrics.
+from requests import Session, Response
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError as RequestsConnectionError, Timeout
+
+from logging import getLogger
+from collections import deque
+from random import uniform
+from statistics import mean, quantiles
+from threading import Lock
+from time import perf_counter, sleep
+from typing import Optional
+
+LOGGER = getLogger(__name__)
+
+try:
+    # OPTIONAL: Point the pipeline at another PVWatts endpoint, e.g., the local stand-in in pvwatts_server.py.
+    from config import NREL_URL
+except ImportError:
+    NREL_URL = 'https://developer.nrel.gov/api/pvwatts/v6.json'
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class NRELError(Exception):
+    """Custom exception for a request to the NREL api that failed or could not be retried successfully."""
+
+    def __init__(self, message: str, status_code: int = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class NRELClient:
+    """
+    Client for the PVWatts api. One instance (see get_nrel_client()) is shared by every call in a worker so the
+    keep-alive connections of its Session are reused instead of paying for a new TLS handshake on each request.
+    """
+
+    def __init__(self, url: str = NREL_URL, connect_timeout: float = 3.05, read_timeout: float = 20,
+                 max_retries: int = 3, backoff: float = 0.5, max_backoff: float = 8, pool_size: int = 10):
+        self.url = url
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.session = Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        # Metrics
+        self.calls, self.retries, self.failures = 0, 0, 0
+        self.latencies = deque(maxlen=1000)
+        self._lock = Lock()
+
+    def _record(self, latency: float, retried: bool = False, failed: bool = False) -> None:
+        """Record the latency (seconds) and outcome of a single http call."""
+
+        with self._lock:
+            self.calls += 1
+            self.retries += retried
+            self.failures += failed
+            self.latencies.append(latency)
+
+    def _sleep_time(self, attempt: int, response: Optional[Response]) -> float:
+        """Exponential backoff with full jitter. A numeric Retry-After header from the api takes precedence."""
+
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.max_backoff)
+
+        return uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    def get(self, params: dict, api_key: str) -> dict:
+        """
+        Request the PVWatts api and return its json response.
+        Retries connection errors, timeouts, 429/5xx responses and invalid json up to max_retries times.
+        :raise NRELError if the api rejects the request or every attempt fails.
+        """
+
+        error = None
+        for attempt in range(self.max_retries + 1):
+            response, start = None, perf_counter()
+            try:
+                response = self.session.get(
+                    url=self.url, params=dict(params, api_key=api_key), timeout=self.timeout
+                )
+                if response.status_code in RETRY_STATUSES:
+                    raise NRELError(
+                        f'The nrel api responded with a {response.status_code} status code.',
+                        status_code=response.status_code
+                    )
+                result = response.json()
+            except (RequestsConnectionError, Timeout, NRELError, ValueError) as e:
+                # ValueError covers the JSONDecodeError raised by Response.json() for a truncated/invalid body.
+                error = e
+                retrying = attempt < self.max_retries
+                self._record(latency=perf_counter() - start, retried=retrying, failed=not retrying)
+                LOGGER.warning(f'Attempt {attempt + 1} of the nrel api request failed: {e.__repr__()}')
+                if retrying:
+                    sleep(self._sleep_time(attempt=attempt, response=response))
+                continue
+
+            latency = perf_counter() - start
+            if response.status_code >= 400:
+                # Other 4xx responses (e.g., invalid key or address) will not succeed when retried.
+                self._record(latency=latency, failed=True)
+                LOGGER.error(f'The nrel api rejected the request ({response.status_code}): {result.get("errors")}')
+                raise NRELError(
+                    f"The nrel api rejected the request with a {response.status_code} status code: "
+                    + f"{result.get('errors')}",
+                    status_code=response.status_code
+                )
+            self._record(latency=latency)
+            LOGGER.info(f'The nrel api responded in {round(latency * 1000)}ms')
+            return result
+
+        LOGGER.error(f'The nrel api request still failed after {self.max_retries + 1} attempts')
+        raise NRELError(
+            f'After requesting {self.max_retries + 1} times, the nrel api request still failed due to: '
+            + f'{error.__repr__()}',
+            status_code=getattr(error, 'status_code', None)
+        )
+
+    def metrics(self) -> dict:
+        """Return call counts and latency (ms) statistics over the most recent calls."""
+
+        with self._lock:
+            latencies = [lat * 1000 for lat in self.latencies]
+            result = {'calls': self.calls, 'retries': self.retries, 'failures': self.failures}
+        if len(latencies) > 1:
+            percentiles = quantiles(latencies, n=100)
+            result.update(
+                mean_ms=round(mean(latencies), 2),
+                p50_ms=round(percentiles[49], 2),
+                p95_ms=round(percentiles[94], 2),
+                p99_ms=round(percentiles[98], 2),
+            )
+
+        return result
+
+    def close(self) -> None:
+        """Close the pooled connections of the Session."""
+
+        self.session.close()
+
+
+_CLIENT = None
+_CLIENT_LOCK = Lock()
+
+
+def get_nrel_client() -> NRELClient:
+    """Return the worker's shared NRELClient, creating it on first use."""
+
+    global _CLIENT
+    with _CLIENT_LOCK:
+        # Concurrent first calls (e.g., solar_potential_batch() threads) must share one connection pool
+        if _CLIENT is None:
+            _CLIENT = NRELClient()
+        return _CLIENT
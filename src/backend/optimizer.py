@@ -0,0 +1,90 @@
+# SolarCalculator/src/backend/optimizer.py
+# Finds the array capacity that maximizes savings for a module price, from the cached normalized solar profile.
+import numpy as np
+
+from logging import getLogger
+from math import ceil
+from typing import Sequence
+
+from solar_cache import get_solar_cache
+from solar_potential import _get_params
+
+LOGGER = getLogger(__name__)
+
+LIFETIME_YEARS = 25  # Typical warranted lifetime of a solar module.
+# Largest array considered, as a multiple of the capacity that offsets 100% of consumption.
+MAX_OFFSET = 2
+
+
+class OptimizerError(Exception):
+    """Custom exception for when the normalized solar profile is neither passed nor in the PVWatts cache."""
+
+
+def annual_savings(capacities: np.ndarray, normal_monthly: Sequence[float], consumption_monthly: Sequence[float],
+                   cost_per_kwh: float, surplus_rate: float = 0) -> np.ndarray:
+    """
+    Annual bill savings ($) for each capacity (kW).
+    Production up to each month's consumption is valued at cost_per_kwh, the monthly surplus at surplus_rate.
+    """
+
+    production = np.asarray(capacities, dtype=np.float64)[:, None] * np.asarray(normal_monthly)[None, :]
+    consumption = np.asarray(consumption_monthly, dtype=np.float64)[None, :]
+    offset = np.minimum(production, consumption)
+
+    return (offset * cost_per_kwh + (production - offset) * surplus_rate).sum(axis=1)
+
+
+def optimize_capacity(input_data: dict, mod_price: float, surplus_rate: float = 0, years: int = LIFETIME_YEARS,
+                      normal_monthly: Sequence[float] = None) -> dict:
+    """
+    Scan every whole number of modules up to MAX_OFFSET times the 100% offset capacity in one vectorized pass and
+    return the one with the greatest net savings (lifetime bill savings less the cost of the modules).
+
+    :param input_data: InputData dict (address, mod_kwh, consumption_monthly and cost_per_kwh are used).
+    :param mod_price: Installed price ($) of one module of mod_kwh capacity.
+    :param surplus_rate: Value ($/kWh) of production exceeding a month's consumption (e.g., net metering credit).
+    :param years: Number of years of savings to weigh against the price of the modules.
+    :param normal_monthly: Normalized (1 kW) monthly ac output. Only read from the PVWatts response cache (the same
+        request get_solar_potential() makes) if not passed, so the search never adds an api call.
+    :return dictionary of the chosen capacity_kw, mod_quantity and the resulting savings figures.
+    :raise OptimizerError if normal_monthly is not passed and the address's normalized response is not cached.
+    """
+
+    LOGGER.info(f'Optimizing array capacity for uid: {input_data.get("uid")}')
+
+    if normal_monthly is None:
+        normal_obj = get_solar_cache().get(params=_get_params(capacity=1, address=input_data.get('address')))
+        if normal_obj is None:
+            LOGGER.error(f'No cached normalized solar profile for uid: {input_data.get("uid")}')
+            raise OptimizerError(
+                f'The normalized solar profile of "{input_data.get("address")}" is not cached. Run '
+                f'get_solar_potential() for it first or pass normal_monthly.'
+            )
+        normal_monthly = normal_obj.get('outputs').get('ac_monthly')
+    mod_kwh = input_data.get('mod_kwh')
+    consumption_monthly = input_data.get('consumption_monthly')
+
+    full_offset = sum(consumption_monthly) / sum(normal_monthly)
+    mod_quantities = np.arange(0, ceil(full_offset * MAX_OFFSET / mod_kwh) + 1)
+    capacities = mod_quantities * mod_kwh
+    savings = annual_savings(
+        capacities=capacities,
+        normal_monthly=normal_monthly,
+        consumption_monthly=consumption_monthly,
+        cost_per_kwh=input_data.get('cost_per_kwh'),
+        surplus_rate=surplus_rate
+    )
+    net_savings = savings * years - mod_quantities * mod_price
+    best = int(np.argmax(net_savings))
+
+    result = {
+        'capacity_kw': round(float(capacities[best]), 3),
+        'mod_quantity': int(mod_quantities[best]),
+        'annual_savings': round(float(savings[best]), 2),
+        'net_savings': round(float(net_savings[best]), 2),
+        'payback_years': round(float(mod_quantities[best] * mod_price / savings[best]), 1) if best else None,
+        'full_offset_kw': round(full_offset, 3),
+    }
+
+    LOGGER.info(f'Optimal array capacity found: {result}')
+    return result
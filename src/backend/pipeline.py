@@ -0,0 +1,58 @@
+# SolarCalculator/src/backend/pipeline.py
+# In-process pipeline passing validated models between the input, solar potential and results stages.
+from logging import getLogger
+from datetime import datetime as dt
+
+from utils import Results, Status
+from inputs import get_inputs
+from solar_potential import get_solar_potential
+from results import get_results
+from dynamo_writer import DynamoBatchWriter
+
+LOGGER = getLogger(__name__)
+
+
+def run_pipeline(event: dict, writer: DynamoBatchWriter = None) -> Results:
+    """
+    Run an event through every stage in one process. Each stage hands its model straight to the next, so nothing
+    is serialized to a dict and read back, and InputData is only validated once, at the event boundary.
+    Bulk runs pass a shared DynamoBatchWriter to batch the results' DynamoDB writes (see get_results()).
+    """
+
+    LOGGER.info(f'run_pipeline() called for uid: {event.get("uid")}')
+
+    input_data = get_inputs(input_event=event)
+    solar_data = get_solar_potential(input_data=input_data, validate=False)
+    result = get_results(
+        input_data=input_data, solar_data=solar_data, validate=False, chart_mode=event.get('chart_mode'),
+        writer=writer
+    )
+
+    LOGGER.info(f'run_pipeline() completed for uid: {result.uid}')
+    return result
+
+
+def pipeline_handler(event: dict, context=None, writer: DynamoBatchWriter = None) -> dict:
+    """Handler for calling run_pipeline() and serializing its Results at the Lambda/json boundary."""
+
+    try:
+        results_data = run_pipeline(event=event, writer=writer).dict()
+    except Exception as e:
+        time_stamp = dt.now().__str__()
+        uid = event.get("uid") if event.get("uid") else "NA" + time_stamp
+        results_data = {
+            "uid": uid,
+            "time_stamp": time_stamp,
+            "status": Status(
+                status_code=400,
+                message=f"run_pipeline() called unsuccessfully due to error: {e.__repr__()}"
+            )
+        }
+        LOGGER.error(e, exc_info=True)
+
+    return results_data
+
+
+if __name__ == '__main__':
+    from utils import import_json, SAMPLES
+    print(pipeline_handler(event=import_json(SAMPLES['event_valid_form'])).get("status"))
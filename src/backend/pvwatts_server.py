@@ -0,0 +1,173 @@
+# SolarCalculator/src/backend/pvwatts_server.py
+# Local stand-in for the PVWatts v6 api with configurable latency and error injection for offline benchmarking.
+from argparse import ArgumentParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from json import dumps as j_dumps
+from logging import getLogger
+from math import cos, sin, pi, radians
+from random import Random
+from threading import Thread
+from time import sleep
+from typing import Optional
+from urllib.parse import urlparse, parse_qsl
+from zlib import crc32
+
+from cassette import Cassette
+from solar_cache import normalize_address
+
+LOGGER = getLogger(__name__)
+
+PVWATTS_PATH = '/api/pvwatts/v6.json'
+# Share of a 1 kW array's annual output produced each month, roughly that of a mid-latitude US site.
+_MONTHLY_SHARE = [0.065, 0.069, 0.085, 0.092, 0.098, 0.097, 0.100, 0.099, 0.089, 0.079, 0.066, 0.061]
+_MONTH_DAYS = [31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
+# Share of a day's output produced each hour: a sine curve between 6am and 6pm.
+_DAY_SHAPE = [sin(pi * (hour - 6) / 12) if 6 < hour < 18 else 0 for hour in range(24)]
+_DAY_SHAPE = [share / sum(_DAY_SHAPE) for share in _DAY_SHAPE]
+
+
+def _hourly_ac(ac_monthly: list) -> list:
+    """Spread monthly ac output (kWh) over the 8760 hours of a typical year as hourly ac output (W)."""
+
+    hourly = []
+    for kwh, days in zip(ac_monthly, _MONTH_DAYS):
+        daily_wh = kwh * 1000 / days
+        hourly.extend([daily_wh * share for share in _DAY_SHAPE] * days)
+
+    return hourly
+
+
+def synthetic_response(params: dict) -> dict:
+    """
+    Build a deterministic PVWatts shaped response for params.
+    Output is linear in system_capacity and varies by address, tilt, azimuth and losses like the real api does.
+    timeframe=hourly adds the 8760 point 'ac' series.
+    """
+
+    capacity = float(params.get('system_capacity', 1))
+    tilt, azimuth = float(params.get('tilt', 40)), float(params.get('azimuth', 180))
+    losses = float(params.get('losses', 10))
+    # Each address gets a stable yield between 1300 and 1800 kWh per kW per year.
+    site_yield = 1300 + crc32(normalize_address(params.get('address', '')).encode()) % 500
+    orientation = (1 - 0.5 * ((tilt - 30) / 90) ** 2) * (1 - 0.15 * (1 - cos(radians(azimuth - 180))))
+    ac_annual_1kw = site_yield * orientation * (1 - losses / 100)
+    ac_monthly = [ac_annual_1kw * share * capacity for share in _MONTHLY_SHARE]
+    outputs = {
+        'ac_monthly': ac_monthly,
+        'ac_annual': sum(ac_monthly),
+        'solrad_monthly': [round(share * 12 * site_yield / 365, 3) for share in _MONTHLY_SHARE],
+        'capacity_factor': round(sum(ac_monthly) / (capacity * 8760) * 100, 3),
+    }
+    if params.get('timeframe') == 'hourly':
+        outputs['ac'] = _hourly_ac(ac_monthly=ac_monthly)
+
+    return {
+        'inputs': params,
+        'errors': [],
+        'warnings': [],
+        'version': '1.4.0',
+        'ssc_info': {'version': 0, 'build': 'stand-in'},
+        'station_info': {'location': 'stand-in', 'solar_resource_file': 'stand-in'},
+        'outputs': outputs
+    }
+
+
+class PVWattsServer(ThreadingHTTPServer):
+    """
+    http server mimicking the PVWatts v6 endpoint.
+    :param latency: Seconds added to every response.
+    :param jitter: Up to this many seconds of random latency added on top of latency.
+    :param error_rate: Share of requests answered with a 500 status.
+    :param throttle_rate: Share of requests answered with a 429 status.
+    :param bad_json_rate: Share of requests answered with a truncated json body.
+    :param cassette_dir: Serve recorded cassettes from this directory when they exist.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 8080, latency: float = 0, jitter: float = 0,
+                 error_rate: float = 0, throttle_rate: float = 0, bad_json_rate: float = 0,
+                 cassette_dir: Optional[str] = None, seed: int = None):
+        super().__init__((host, port), _PVWattsHandler)
+        self.latency, self.jitter = latency, jitter
+        self.error_rate, self.throttle_rate, self.bad_json_rate = error_rate, throttle_rate, bad_json_rate
+        self.cassette = Cassette(mode='replay', path=cassette_dir) if cassette_dir else None
+        self.random = Random(seed)
+        self.requests = 0
+
+    @property
+    def url(self) -> str:
+        """Url to set as NREL_URL in config.py to point the pipeline at this server."""
+
+        return f'http://{self.server_address[0]}:{self.server_address[1]}{PVWATTS_PATH}'
+
+    def start(self) -> 'PVWattsServer':
+        """Serve on a background daemon thread."""
+
+        Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and close the socket."""
+
+        self.shutdown()
+        self.server_close()
+
+
+class _PVWattsHandler(BaseHTTPRequestHandler):
+    server: PVWattsServer
+
+    def _send(self, status: int, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = dict(parse_qsl(url.query))
+        server = self.server
+        server.requests += 1
+        sleep(server.latency + server.random.uniform(0, server.jitter))
+
+        if url.path != PVWATTS_PATH:
+            return self._send(404, j_dumps({'errors': [f'Unknown path: {url.path}']}).encode())
+        if not params.pop('api_key', None):
+            return self._send(403, j_dumps({'errors': ['No api_key was supplied.']}).encode())
+        if not params.get('address'):
+            return self._send(422, j_dumps({'errors': ['An address is required.']}).encode())
+
+        roll = server.random.random()
+        if roll < server.error_rate:
+            return self._send(500, j_dumps({'errors': ['Injected server error.']}).encode())
+        if roll < server.error_rate + server.throttle_rate:
+            return self._send(429, j_dumps({'errors': ['OVER_RATE_LIMIT']}).encode())
+        body = j_dumps((server.cassette and server.cassette.play(params=params)) or synthetic_response(params))
+        if roll < server.error_rate + server.throttle_rate + server.bad_json_rate:
+            return self._send(200, body[:len(body) // 2].encode())
+
+        return self._send(200, body.encode())
+
+    def log_message(self, format, *args):
+        LOGGER.info(format % args)
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description='Run a local stand-in for the PVWatts v6 api.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--latency', type=float, default=0, help='Seconds added to every response.')
+    parser.add_argument('--jitter', type=float, default=0, help='Maximum random seconds added to latency.')
+    parser.add_argument('--error-rate', type=float, default=0, help='Share of 500 responses.')
+    parser.add_argument('--throttle-rate', type=float, default=0, help='Share of 429 responses.')
+    parser.add_argument('--bad-json-rate', type=float, default=0, help='Share of truncated json responses.')
+    parser.add_argument('--cassettes', default=None, help='Serve recorded cassettes from this directory.')
+    args = parser.parse_args()
+
+    stand_in = PVWattsServer(
+        host=args.host, port=args.port, latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate, bad_json_rate=args.bad_json_rate, cassette_dir=args.cassettes
+    )
+    print(f'PVWatts stand-in serving at {stand_in.url} (set NREL_URL in config.py to this url)')
+    stand_in.serve_forever()
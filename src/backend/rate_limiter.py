@@ -0,0 +1,152 @@
+# SolarCalculator/src/backend/rate_limiter.py
+# Token bucket rate limiter for the NREL api, shared across processes via SQLite and rotating across api keys.
+from logging import getLogger
+from hashlib import sha256
+from os.path import join
+from tempfile import gettempdir
+from threading import Lock
+from time import time, sleep
+from typing import Optional, Sequence, Tuple
+import sqlite3
+
+LOGGER = getLogger(__name__)
+
+# Every gunicorn worker/Lambda process on a host points at the same file and so draws from the same buckets.
+RATE_LIMIT_PATH = join(gettempdir(), 'nrel_rate_limit.sqlite3')
+RATE_LIMIT_PER_HOUR = 1000  # NREL's default hourly limit per api key.
+
+
+class RateLimitError(Exception):
+    """Custom exception for when no api key has quota left within the time allowed."""
+
+
+def _key_id(api_key: str) -> str:
+    """Identify an api key by a hash so the key itself is never written to disk."""
+
+    return sha256(api_key.encode()).hexdigest()[:16]
+
+
+class RateLimiter:
+    """
+    Token bucket per api key. Buckets hold up to rate_per_hour tokens and refill continuously at rate_per_hour.
+    Each acquire() takes a token from the key with the most tokens left, which rotates requests across keys.
+    """
+
+    def __init__(self, api_keys: Sequence[str], rate_per_hour: float = RATE_LIMIT_PER_HOUR,
+                 path: str = RATE_LIMIT_PATH):
+        self.rate = rate_per_hour / 3600  # Tokens per second
+        self.capacity = rate_per_hour
+        self.path = path
+        self._keys = {}
+        self._lock = Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS buckets ('
+            'key_id TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL, granted INTEGER NOT NULL)'
+        )
+        for api_key in api_keys:
+            self.add_key(api_key=api_key)
+
+    def add_key(self, api_key: str) -> None:
+        """Register an api key with a full bucket unless another process already registered it."""
+
+        with self._lock:
+            self._keys[_key_id(api_key)] = api_key
+            self._conn.execute(
+                'INSERT OR IGNORE INTO buckets (key_id, tokens, updated, granted) VALUES (?, ?, ?, 0)',
+                (_key_id(api_key), self.capacity, time())
+            )
+
+    def _take(self, key_ids: Sequence[str]) -> Tuple[Optional[str], float]:
+        """
+        Atomically refill the buckets for key_ids and take a token from the fullest one.
+        :return the key id granted (or None) and the seconds until the next token is available.
+        """
+
+        now = time()
+        placeholders = ', '.join('?' * len(key_ids))
+        with self._lock:
+            # BEGIN IMMEDIATE takes the database write lock so other processes cannot grant the same token.
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                rows = self._conn.execute(
+                    f'SELECT key_id, tokens, updated FROM buckets WHERE key_id IN ({placeholders})', tuple(key_ids)
+                ).fetchall()
+                refilled = {k: min(self.capacity, tokens + (now - updated) * self.rate) for k, tokens, updated in rows}
+                best = max(refilled, key=refilled.get)
+                if refilled[best] < 1:
+                    self._conn.execute('COMMIT')
+                    return None, (1 - refilled[best]) / self.rate
+                self._conn.execute(
+                    'UPDATE buckets SET tokens = ?, updated = ?, granted = granted + 1 WHERE key_id = ?',
+                    (refilled[best] - 1, now, best)
+                )
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+
+        return best, 0.0
+
+    def acquire(self, api_key: str = None, timeout: float = 60) -> str:
+        """
+        Block until a token is available and return the api key it was taken from.
+        :param api_key: Only draw from this key if passed, else rotate across every registered key.
+        :param timeout: Maximum seconds to wait for a token.
+        :raise RateLimitError if no token became available within timeout.
+        """
+
+        if api_key is not None and _key_id(api_key) not in self._keys:
+            self.add_key(api_key=api_key)
+        key_ids = [_key_id(api_key)] if api_key is not None else list(self._keys)
+
+        deadline = time() + timeout
+        while True:
+            key_id, wait_time = self._take(key_ids=key_ids)
+            if key_id is not None:
+                return self._keys[key_id]
+            if time() + wait_time > deadline:
+                LOGGER.error(f'No nrel api quota available within {timeout} seconds')
+                raise RateLimitError(f'No nrel api quota became available within {timeout} seconds.')
+            LOGGER.info(f'nrel api quota exhausted, waiting {round(wait_time, 2)} seconds for the next token')
+            sleep(min(wait_time, 1))
+
+    def exhaust(self, api_key: str) -> None:
+        """Empty the bucket of an api key the api reported as over its limit so rotation skips it."""
+
+        with self._lock:
+            self._conn.execute(
+                'UPDATE buckets SET tokens = 0, updated = ? WHERE key_id = ?', (time(), _key_id(api_key))
+            )
+        LOGGER.warning(f'nrel api key {_key_id(api_key)} reported over its rate limit')
+
+    def usage(self) -> dict:
+        """Return the tokens left and total requests granted per key (by key id) across all processes."""
+
+        now = time()
+        with self._lock:
+            rows = self._conn.execute('SELECT key_id, tokens, updated, granted FROM buckets').fetchall()
+
+        return {
+            key_id: {
+                'tokens': round(min(self.capacity, tokens + (now - updated) * self.rate), 2),
+                'capacity': self.capacity,
+                'granted': granted
+            } for key_id, tokens, updated, granted in rows if key_id in self._keys
+        }
+
+
+_LIMITER = None
+_LIMITER_LOCK = Lock()
+
+
+def get_rate_limiter(api_keys: Sequence[str]) -> RateLimiter:
+    """Return the process's shared RateLimiter, creating it for api_keys on first use."""
+
+    global _LIMITER
+    with _LIMITER_LOCK:
+        # Concurrent first calls (e.g., solar_potential_batch() threads) must share one limiter connection
+        if _LIMITER is None:
+            _LIMITER = RateLimiter(api_keys=api_keys)
+        return _LIMITER
@@ -1,25 +1,61 @@
 # SolarCalculator/src/backend/results.py
 # Integrates InputData and SolarPotentialData into Results data object and creates outputs
-import matplotlib.pyplot as plt
-from pandas import DataFrame
-from boto3 import resource as boto_resource
-
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from csv import writer as csv_writer
+from functools import partial
+from hashlib import sha256
 from logging import getLogger
-from math import ceil
-from decimal import Decimal
-from json import loads as j_loads, dumps as j_dumps
+from multiprocessing import get_all_start_methods, get_context
+from json import dumps as j_dumps
 from os import PathLike
-from typing import Union, Sequence, Collection, Callable, Literal
-import io
-from datetime import datetime as dt
+from threading import Lock
+from typing import Union, Sequence, Collection, Literal, Callable, Optional
+from datetime import datetime as dt, timedelta, timezone
 
-from utils import Results, MONTHS_MAP, IntListMonthly, FloatListMonthly, Status, check_http_response
+from utils import InputData, SolarPotentialData, Results, MONTHS_MAP, IntListMonthly, FloatListMonthly, Status, \
+    check_http_response, PandasDataFrame, get_aws_resource
 from config import DYNAMODB_TABLE_NAME
+from results_engine import compute_customer_results
+from graphs import GRAPH_FORMAT, warm_template
+from dynamo_writer import DynamoBatchWriter
+from results_codec import encode_results_data
+from results_table import ResultsTable
+
+try:
+    # OPTIONAL: 'png' (default) renders the graphs server side, 'client' leaves them to the browser.
+    from config import CHART_MODE
+except ImportError:
+    CHART_MODE = 'png'
 
 LOGGER = getLogger(__name__)
-S3 = boto_resource('s3')
-DYNAMODB = boto_resource('dynamodb')
+# Created on first use (see _s3() and _dynamodb()) so importing this module does not create AWS resources
+S3 = None
+DYNAMODB = None
+
+# Graphs are rendered in worker processes (matplotlib is CPU bound and holds the GIL) and every upload goes through
+# one shared thread pool. Where processes are unavailable (e.g., Lambda has no /dev/shm) graphs render on the
+# upload threads.
+RENDER_IN_PROCESSES = True
+RENDER_WORKERS = 2
+UPLOAD_WORKERS = 8
+_POOLS = {}
+_POOLS_LOCK = Lock()
+
+# Artifacts are keyed by a hash of what they are rendered from, so identical results share one s3 object that is
+# only rendered and uploaded once. Bump ARTIFACT_VERSION when the graph styling or csv layout changes.
+DEDUPE_ARTIFACTS = True
+ARTIFACT_VERSION = 1
+# delete_expired.py removes objects a week after they were last written, so a shared object older than this is
+# written again (refreshing it) instead of reused.
+ARTIFACT_REUSE_AGE = timedelta(days=3)
+# (bucket name, obj key): last modified, for the objects this process has seen in s3 most recently. Bounded (least
+# recently used first out) for long lived batch workers and warm containers, and shared by the upload threads.
+KNOWN_ARTIFACTS_MAX = 10_000
+_KNOWN_ARTIFACTS = OrderedDict()
+_KNOWN_ARTIFACTS_LOCK = Lock()
+
+ChartMode = Literal['png', 'client']
 
 
 class S3Url:
@@ -37,15 +73,15 @@ def _average(iterable: Union[Sequence, Collection]) -> int:
     return round(sum(iterable) / len(iterable))
 
 
-def get_data_df(
+def get_results_table(
         input_data: dict, solar_potential_monthly: IntListMonthly, potential_cost_monthly: FloatListMonthly,
         potential_value: FloatListMonthly, savings_monthly: FloatListMonthly, cost_reduction_monthly: FloatListMonthly
-    ) -> DataFrame:
-    """Creates a pandas data frame with all the input, solar, and analysis data and their annual sums."""
+    ) -> ResultsTable:
+    """Creates a ResultsTable with all the input, solar, and analysis data and their annual sums."""
 
-    LOGGER.info('Creating DataFrame of core data')
+    LOGGER.info('Creating ResultsTable of core data')
 
-    result = DataFrame(data={  # data type: [list monthly] + [annual total/annual average]
+    result = ResultsTable(data={  # data type: [list monthly] + [annual total/annual average]
         'Month': list(MONTHS_MAP.values()) + ['Annual'],
         'Consumption kWh': input_data.get('consumption_monthly') + [input_data.get('consumption_annual')],
         'Cost $': input_data.get('cost_monthly') + [input_data.get('cost_annual')],
@@ -56,36 +92,121 @@ def get_data_df(
         'Cost Reduction %': cost_reduction_monthly + [_average(cost_reduction_monthly)]
     })
 
-    LOGGER.info(f'DataFrame successfully created: {result.to_dict()}')
+    LOGGER.info(f'ResultsTable successfully created: {result.to_dict()}')
     return result
 
 
-def post_data_csv_to_s3(data_df: DataFrame, obj_key: str, bucket_name='sc-outputs-csv') -> S3Url.path:
-    """Posts a DataFrame  as a csv to s3 bucket"""
+def get_data_df(
+        input_data: dict, solar_potential_monthly: IntListMonthly, potential_cost_monthly: FloatListMonthly,
+        potential_value: FloatListMonthly, savings_monthly: FloatListMonthly, cost_reduction_monthly: FloatListMonthly
+    ) -> PandasDataFrame:
+    """Creates get_results_table()'s table as a pandas data frame (requires pandas), e.g., for analysis."""
+
+    return get_results_table(
+        input_data=input_data, solar_potential_monthly=solar_potential_monthly,
+        potential_cost_monthly=potential_cost_monthly, potential_value=potential_value,
+        savings_monthly=savings_monthly, cost_reduction_monthly=cost_reduction_monthly
+    ).to_dataframe()
+
+
+def _s3():
+    """Return the s3 resource, creating it on first use."""
+
+    global S3
+    if S3 is None:
+        S3 = get_aws_resource('s3')
+    return S3
+
+
+def _dynamodb():
+    """Return the DynamoDB resource, creating it on first use."""
+
+    global DYNAMODB
+    if DYNAMODB is None:
+        DYNAMODB = get_aws_resource('dynamodb')
+    return DYNAMODB
+
+
+def artifact_key(*sources) -> str:
+    """Return the content address of an artifact from the json serializable data it is rendered from."""
+
+    payload = j_dumps([ARTIFACT_VERSION, *sources], sort_keys=True, separators=(',', ':'))
+    return sha256(payload.encode()).hexdigest()
+
+
+def _remember_artifact(bucket_name: str, obj_key: str, last_modified: dt) -> None:
+    """Record when an s3 object was last modified, forgetting the least recently used beyond KNOWN_ARTIFACTS_MAX."""
+
+    with _KNOWN_ARTIFACTS_LOCK:
+        _KNOWN_ARTIFACTS[(bucket_name, obj_key)] = last_modified
+        _KNOWN_ARTIFACTS.move_to_end((bucket_name, obj_key))
+        while len(_KNOWN_ARTIFACTS) > KNOWN_ARTIFACTS_MAX:
+            _KNOWN_ARTIFACTS.popitem(last=False)
+
+
+def s3_obj_exists(bucket_name: str, obj_key: str) -> bool:
+    """Return whether the s3 object exists and is recent enough to reuse (see ARTIFACT_REUSE_AGE)."""
+
+    from botocore.exceptions import ClientError
+
+    with _KNOWN_ARTIFACTS_LOCK:
+        last_modified = _KNOWN_ARTIFACTS.get((bucket_name, obj_key))
+        if last_modified is not None:
+            _KNOWN_ARTIFACTS.move_to_end((bucket_name, obj_key))
+    if last_modified is None:
+        try:
+            last_modified = _s3().Object(bucket_name, obj_key).last_modified
+        except ClientError as e:
+            # Without s3:ListBucket a missing object is a 403, so any failed check just means writing it again
+            if e.response.get('Error', {}).get('Code') not in ('404', 'NoSuchKey', 'NotFound'):
+                LOGGER.warning(f'Could not check for the object "{obj_key}" in s3 bucket - {bucket_name}: {e}')
+            return False
+        _remember_artifact(bucket_name=bucket_name, obj_key=obj_key, last_modified=last_modified)
+
+    return dt.now(timezone.utc) - last_modified < ARTIFACT_REUSE_AGE
+
+
+def _put_artifact(bucket_name: str, obj_key: str, **kwargs) -> None:
+    """Put an object to s3 and remember it was just written."""
+
+    _s3().Bucket(bucket_name).put_object(Key=obj_key, **kwargs)
+    _remember_artifact(bucket_name=bucket_name, obj_key=obj_key, last_modified=dt.now(timezone.utc))
+
+
+def post_data_csv_to_s3(data_table: ResultsTable, obj_key: str, bucket_name='sc-outputs-csv',
+                        skip_existing: bool = False) -> S3Url.path:
+    """
+    Posts a ResultsTable (or DataFrame) as a csv to s3 bucket.
+    With skip_existing, an existing object at obj_key (e.g., a content address) is reused instead of written again.
+    """
 
     obj_key = obj_key + '.csv'
-    # Create io buffer for csv
-    csv_buffer = io.StringIO()
-    data_df.to_csv(csv_buffer)
-    # Post the object to dedicated bucket and return the http response
-    S3.Bucket(bucket_name).put_object(Body=csv_buffer.getvalue(), Key=obj_key)
+    if skip_existing and s3_obj_exists(bucket_name=bucket_name, obj_key=obj_key):
+        LOGGER.info(f'Reusing the csv already in s3 bucket - {bucket_name} - with key "{obj_key}"')
+        return S3Url(bucket_name=bucket_name, obj_key=obj_key).path
+    # Post the csv to dedicated bucket and return the http response
+    _put_artifact(bucket_name=bucket_name, obj_key=obj_key, Body=data_table.to_csv())
     # check_response(response=response['ResponseMetadata']['HTTPStatusCode'])
 
     return S3Url(bucket_name=bucket_name, obj_key=obj_key).path
 
 
-def post_obj_to_s3(bucket_name: str, obj_key: str, content_type: str, obj_format='png') -> S3Url.path:
-    """Posts an object (e.g., image) to s3 bucket."""
+def post_obj_to_s3(body: Union[bytes, Callable[[], bytes]], bucket_name: str, obj_key: str, content_type: str,
+                   obj_format='png', skip_existing: bool = False) -> S3Url.path:
+    """
+    Posts an object (e.g., rendered image bytes) to s3 bucket.
+    body may be a function returning the bytes, so with skip_existing an object already at obj_key (e.g., a content
+    address) is reused without rendering it again.
+    """
 
     obj_key = obj_key + '.' + obj_format
-    # Create stream for the object
-    data = io.BytesIO()
-    plt.savefig(fname=data, format=obj_format, transparent=True)
-    # Set stream position to start of stream
-    data.seek(0)
-    # Get bucket item, post the object, and return response
-    bucket = S3.Bucket(bucket_name)
-    bucket.put_object(Body=data, ContentType=content_type, Key=obj_key)
+    if skip_existing and s3_obj_exists(bucket_name=bucket_name, obj_key=obj_key):
+        LOGGER.info(f'Reusing the object already in s3 bucket - {bucket_name} - with key "{obj_key}"')
+        return S3Url(bucket_name=bucket_name, obj_key=obj_key).path
+    # Post the object and return its url
+    _put_artifact(
+        bucket_name=bucket_name, obj_key=obj_key, Body=body() if callable(body) else body, ContentType=content_type
+    )
 
     return S3Url(bucket_name=bucket_name, obj_key=obj_key).path
 
@@ -99,65 +220,29 @@ def post_item_to_dynamodb(dynamo_table, item: dict) -> int:
 
 
 def create_comparison_graph(
-        title: str, df1: DataFrame, df2: DataFrame, label1: str, label2: str, y_label: str,
+        title: str, df1: Sequence[float], df2: Sequence[float], label1: str, label2: str, y_label: str,
         graph_type: Literal['energy', 'cost'], uid: str) -> S3Url.path:
-    """Creates a graph with 2 overlying plots for comparison."""
+    """Creates a graph with 2 overlying plots for comparison from 2 results columns (with their annual row)."""
 
     LOGGER.info(f'Creating the {graph_type} comparison graph for uid "{uid}"')
 
-    def _plot_bar(df: DataFrame, label: str, color: str, top: bool) -> None:
-        """Plot a bar-plot and set the label."""
-        opacity = 0.5 if top else 1
-        # Plot the bar plot
-        _ax = ax.bar(
-            x=list(MONTHS_MAP.values()),
-            height=df.drop(df.index[-1]),
-            width=1,
-            color=color,
-            label=label,
-            edgecolor='white',
-            capstyle='round',
-            alpha=opacity
-        )
-        # Display the numbers on the bar-plots
-        ax.bar_label(
-            container=_ax,
-            padding=-15,
-            fmt='$%g' if graph_type == 'cost' else '%g'
-        )
-
-    # Define color_map for storing colors based on graph type
-    color_map = {  # key: [df1-color, df2-color]
-        'energy': ['indianred', 'gold'],
-        'cost': ['red', 'green']
-    }
-    # Set fonts as bold
-    plt.title(label=title, weight='bold')
-    plt.text(x=None, y=None, s=None, weight='bold')
-    # Establish subplot figure.axes
-    fig, ax = plt.subplots()
-    ax.set_title(label=title)
-    # Plot both datasets you are comparing as bar-plots
-    _plot_bar(df=df1, label=label1, color=color_map[graph_type][0], top=False)
-    _plot_bar(df=df2, label=label2, color=color_map[graph_type][1], top=True)
-    # Set x and y labels
-    ax.set_xlabel(xlabel='Month')
-    ax.set_ylabel(ylabel=y_label)
-    # Rotate month (x) labels by 45 degrees
-    [item.set_rotation(45) for item in ax.get_xticklabels()]
-    # Set background color
-    ax.set_facecolor('lightseagreen')
-
-    # Set legend
-    legend = ax.legend(fontsize="large", loc='lower center')
-    # legend.get_frame().set_color("xkcd:salmon")
-
-    # Tighten layout
-    plt.tight_layout()
-
-    # Save the figure
+    from graphs import render_comparison_graph
+
+    # Render on this thread's reusable figure template, dropping the annual row
+    graph = render_comparison_graph(
+        title=title,
+        values1=list(df1)[:-1],
+        values2=list(df2)[:-1],
+        label1=label1,
+        label2=label2,
+        y_label=y_label,
+        graph_type=graph_type
+    )
+
+    # Post the graph to its s3 bucket
     bucket_name = f"sc-outputs-graph-{graph_type}"
     url = post_obj_to_s3(
+        body=graph,
         bucket_name=bucket_name,
         obj_key=uid,
         content_type='image/png'
@@ -167,41 +252,135 @@ def create_comparison_graph(
     return url
 
 
-def get_results(input_data: dict, solar_data: dict) -> Results:
-    """Create graphs, calculate savings and mod quantity, and return Results data object."""
+def _get_upload_pool() -> Executor:
+    """Return the process wide thread pool used for S3 and DynamoDB uploads."""
 
-    LOGGER.info(f'Generating ResultsData for uid: {input_data.get("uid")}')
+    with _POOLS_LOCK:
+        if 'upload' not in _POOLS:
+            _POOLS['upload'] = ThreadPoolExecutor(max_workers=UPLOAD_WORKERS, thread_name_prefix='upload')
+        return _POOLS['upload']
 
-    def _helper_calculate(func: Callable, zipped: tuple, arg3=None) -> FloatListMonthly:
-        """Helper to clean up calculations for different monthly and annual figures."""
 
-        out = []
-        for arg1, arg2 in zipped:
-            out.append(func(arg1, arg2, arg3))
+def _get_render_pool() -> Optional[Executor]:
+    """Return the process pool used to render graphs, or None if processes cannot be used here."""
 
-        return out
+    with _POOLS_LOCK:
+        if 'render' not in _POOLS and RENDER_IN_PROCESSES:
+            try:
+                # The pool is first used from upload threads, and forking a threaded process can deadlock the child
+                # on a lock another thread held (logging, boto3, _POOLS_LOCK). Workers start from a clean process
+                # and load matplotlib as they start.
+                start_method = 'forkserver' if 'forkserver' in get_all_start_methods() else 'spawn'
+                _POOLS['render'] = ProcessPoolExecutor(
+                    max_workers=RENDER_WORKERS, mp_context=get_context(start_method), initializer=warm_template
+                )
+            except (OSError, NotImplementedError) as e:
+                LOGGER.warning(f'Graphs will be rendered on threads since a process pool is unavailable: {e}')
+                _POOLS['render'] = None
+        return _POOLS.get('render')
 
-    # Calculate Production Value, Potential Cost, Savings, and Cost Reduction
-    production_value = _helper_calculate(
-        func=lambda a1, a2, a3: round(a1 * a3, 2),
-        zipped=zip(solar_data.get('solar_potential_monthly'), range(12)),
-        arg3=input_data.get("cost_per_kwh")
-    )
-    potential_cost_monthly = _helper_calculate(
-        func=lambda a1, a2, a3: round((a1 - a2) * a3, 2),
-        zipped=zip(input_data.get('consumption_monthly'), solar_data.get('solar_potential_monthly')),
-        arg3=input_data.get('cost_per_kwh')
-    )
-    savings_monthly = _helper_calculate(
-        func=lambda a1, a2, a3: round((a1 - a2), 2),
-        zipped=zip(input_data.get('cost_monthly'), potential_cost_monthly)
-    )
-    cost_reduction_monthly = _helper_calculate(
-        func=lambda a1, a2, a3: round(((a1 / a2) * 100), 2),
-        zipped=zip(savings_monthly, input_data.get('cost_monthly'))
-    )
-    # Create DataFrame with all data for graphing/writing outputs
-    results_df = get_data_df(
+
+def _render_graph(graph: dict) -> bytes:
+    """Render a chart definition (see get_chart_data()) in the render pool, or on this thread without one."""
+
+    from graphs import render_comparison_graph
+
+    renders = _get_render_pool()
+    if renders is None:
+        return render_comparison_graph(**graph)
+    return renders.submit(render_comparison_graph, **graph).result()
+
+
+def get_chart_data(results_table: ResultsTable, energy_units: str) -> dict:
+    """
+    Return the cost and energy comparison graphs as compact chart definitions: the keyword arguments of
+    render_comparison_graph(), which the frontend's drawComparisonChart() (static/js/charts.js) also draws from.
+    """
+
+    return {
+        'cost': dict(
+            title="Reported Cost vs Production Value",
+            values1=[float(round(value)) for value in results_table['Cost $'][:-1]],
+            values2=[float(round(value)) for value in results_table['Potential Value $'][:-1]],
+            label1='Reported Cost',
+            label2='Production Value',
+            y_label='Dollars',
+            graph_type='cost'
+        ),
+        'energy': dict(
+            title="Energy Consumption vs Potential Production",
+            values1=results_table['Consumption kWh'][:-1],
+            values2=results_table['Potential kWh'][:-1],
+            label1='Energy Consumption',
+            label2='Potential Energy Production',
+            y_label=energy_units,
+            graph_type='energy'
+        ),
+    }
+
+
+def create_artifacts(results_table: ResultsTable, uid: str, chart_data: dict, render_graphs: bool = True) -> dict:
+    """
+    Upload the data csv and render and upload both comparison graphs concurrently.
+    Each graph is uploaded as soon as it is rendered, so the stage takes about as long as its slowest artifact.
+    With DEDUPE_ARTIFACTS, artifacts are stored under their content address and ones already in s3 are neither
+    rendered nor uploaded again.
+
+    :param chart_data: Chart definitions of the graphs to render (see get_chart_data()).
+    :param render_graphs: Set False to only upload the csv, e.g., when the browser draws the charts itself.
+    :return dictionary of url_data_csv, url_graph_cost and url_graph_energy (None for graphs not rendered).
+    """
+
+    LOGGER.info(f'Creating the result artifacts for uid "{uid}"')
+
+    uploads = _get_upload_pool()
+    csv_key = artifact_key(results_table.to_json()) if DEDUPE_ARTIFACTS else uid
+    pending = {
+        uploads.submit(
+            post_data_csv_to_s3, data_table=results_table, obj_key=csv_key, skip_existing=DEDUPE_ARTIFACTS
+        ): 'url_data_csv'
+    }
+    if render_graphs:
+        # Each graph renders (in the render pool) from its own upload thread, so both render at the same time
+        for graph_type, graph in chart_data.items():
+            pending[uploads.submit(
+                post_obj_to_s3,
+                body=partial(_render_graph, graph),
+                bucket_name=f"sc-outputs-graph-{graph_type}",
+                obj_key=artifact_key(graph, GRAPH_FORMAT) if DEDUPE_ARTIFACTS else uid,
+                content_type='image/png',
+                obj_format=GRAPH_FORMAT,
+                skip_existing=DEDUPE_ARTIFACTS
+            )] = f'url_graph_{graph_type}'
+
+    urls = {'url_graph_cost': None, 'url_graph_energy': None}
+    urls.update({pending[future]: future.result() for future in as_completed(pending)})
+    LOGGER.info(f'Result artifacts created for uid "{uid}": {urls}')
+    return urls
+
+
+def get_results(input_data: Union[dict, InputData], solar_data: Union[dict, SolarPotentialData],
+                validate: bool = True, chart_mode: ChartMode = None, writer: DynamoBatchWriter = None) -> Results:
+    """
+    Create graphs, calculate savings and mod quantity, and return Results data object.
+    input_data and solar_data may be models or their dicts. The in-process pipeline passes validate=False to skip
+    revalidating the monthly lists already validated in InputData and SolarPotentialData.
+    chart_mode 'png' renders and uploads the graphs, while 'client' only returns their chart_data for the browser
+    to draw. Defaults to CHART_MODE.
+    Bulk runs pass a DynamoBatchWriter for DYNAMODB_TABLE_NAME as writer to buffer the DynamoDB item into batch
+    writes, instead of writing it before returning (write errors are then raised by the writer).
+    """
+
+    LOGGER.info(f'Generating ResultsData for uid: {input_data.get("uid")}')
+
+    # Calculate Production Value, Potential Cost, Savings, Cost Reduction and mod quantity (see results_engine.py)
+    figures = compute_customer_results(input_data=[input_data], solar_data=[solar_data])
+    production_value = figures['production_value'][:, 0].tolist()
+    potential_cost_monthly = figures['potential_cost_monthly'][:, 0].tolist()
+    savings_monthly = figures['savings_monthly'][:, 0].tolist()
+    cost_reduction_monthly = figures['cost_reduction_monthly'][:, 0].tolist()
+    # Create ResultsTable with all data for graphing/writing outputs
+    results_table = get_results_table(
         input_data=input_data,
         solar_potential_monthly=solar_data.get('solar_potential_monthly'),
         potential_cost_monthly=potential_cost_monthly,
@@ -209,35 +388,20 @@ def get_results(input_data: dict, solar_data: dict) -> Results:
         savings_monthly=savings_monthly,
         cost_reduction_monthly=cost_reduction_monthly,
     )
-    # Create data csv and save to s3 bucket
-    url_data_csv = post_data_csv_to_s3(data_df=results_df, obj_key=input_data['uid'])
-    # Create cost comparison graph
-    url_cost_graph = create_comparison_graph(
-        title="Reported Cost vs Production Value",
-        df1=results_df['Cost $'].round(),
-        df2=results_df['Potential Value $'].round(),
-        label1='Reported Cost',
-        label2='Production Value',
-        y_label='Dollars',
-        graph_type='cost',
-        uid=input_data['uid']
+    # Create the data csv (and both comparison graphs when rendered server side) and save them to their s3 buckets
+    chart_data = get_chart_data(results_table=results_table, energy_units=solar_data.get('units_solar_potential'))
+    urls = create_artifacts(
+        results_table=results_table, uid=input_data['uid'], chart_data=chart_data,
+        render_graphs=(chart_mode or CHART_MODE) == 'png'
     )
-    # Create consumption vs production graph
-    url_energy_graph = create_comparison_graph(
-        title="Energy Consumption vs Potential Production",
-        df1=results_df['Consumption kWh'],
-        df2=results_df['Potential kWh'],
-        label1='Energy Consumption',
-        label2='Potential Energy Production',
-        y_label=solar_data.get('units_solar_potential'),
-        graph_type='energy',
-        uid=input_data['uid']
+    url_data_csv, url_cost_graph, url_energy_graph = (
+        urls['url_data_csv'], urls['url_graph_cost'], urls['url_graph_energy']
     )
-    # Calculate amount of mods needed for project
-    mod_quantity = ceil(solar_data.get('needed_kwh') / input_data.get('mod_kwh'))
+    mod_quantity = int(figures['mod_quantity'][0])
 
     # Create the Results data object
-    result = Results(
+    build = Results if validate else Results.construct
+    result = build(
         uid=input_data['uid'],
         name=input_data['name'],
         time_stamp=dt.now().__str__(),
@@ -249,26 +413,37 @@ def get_results(input_data: dict, solar_data: dict) -> Results:
         production_value=production_value,
         potential_cost_monthly=potential_cost_monthly,
         savings_monthly=savings_monthly,
-        cost_reduction_monthly=cost_reduction_monthly,
+        cost_reduction_monthly=[int(percent) for percent in cost_reduction_monthly],
         cost_reduction_average=_average(cost_reduction_monthly),
-        results_data_json=results_df.to_json(),
+        results_data_json=results_table.to_json(),
         mod_quantity=mod_quantity,
         url_data_csv=url_data_csv,
         url_graph_cost=url_cost_graph,
-        url_graph_energy=url_energy_graph
+        url_graph_energy=url_energy_graph,
+        chart_data=chart_data
     )
     LOGGER.info(f'Results data object successfully created and validated: {result}')
 
     # Declare which data will be included in table
     table_item = {
         'uid': result.uid, 'name': result.name, 'address': result.address, 'mod_quantity': mod_quantity,
-        'results_data': j_loads(j_dumps(results_df.to_json()), parse_float=Decimal),
+        'results_data': encode_results_data(table=results_table),
         'data_csv': url_data_csv,
-        'cost_graph': url_cost_graph,
-        'energy_graph': url_energy_graph
     }
+    # Graphs drawn by the browser have no url to store
+    if url_cost_graph:
+        table_item['cost_graph'] = url_cost_graph
+    if url_energy_graph:
+        table_item['energy_graph'] = url_energy_graph
+    if writer is not None:
+        writer.put_item(item=table_item)
+        LOGGER.info(f'Results for uid "{result.uid}" buffered for DynamoDB table "{writer.table_name}"')
+        return result
+
     # Post item to DynamoDB with necessary data and verify a non 200 response is given
-    response_code = post_item_to_dynamodb(dynamo_table=DYNAMODB.Table(DYNAMODB_TABLE_NAME), item=table_item)
+    response_code = _get_upload_pool().submit(
+        post_item_to_dynamodb, dynamo_table=_dynamodb().Table(DYNAMODB_TABLE_NAME), item=table_item
+    ).result()
     if not check_http_response(response_code=response_code):
         note = f"A {response_code} response was returned when writing to DynamoDB table '{DYNAMODB_TABLE_NAME}'."
         LOGGER.error(note)
@@ -280,7 +455,7 @@ def get_results(input_data: dict, solar_data: dict) -> Results:
     return result
 
 
-def results_handler(input_data: dict, solar_data: dict) -> dict:
+def results_handler(input_data: dict, solar_data: dict, chart_mode: ChartMode = None) -> dict:
     """Handler function for getting final results event object."""
 
     LOGGER.info(f'Called handler function for getting input data event for uid: {input_data["uid"]}')
@@ -289,7 +464,8 @@ def results_handler(input_data: dict, solar_data: dict) -> dict:
     try:
         results_data = get_results(
             input_data=input_data,
-            solar_data=solar_data
+            solar_data=solar_data,
+            chart_mode=chart_mode
         ).dict()
         LOGGER.info(f'Lambda Handler for results data successfully executed for uid: {input_data["uid"]}')
     except Exception as e:
@@ -307,7 +483,8 @@ def results_handler(input_data: dict, solar_data: dict) -> dict:
     return results_data
 
 
-def DEPRECATED_create_out_csv(header: dict, data_df: DataFrame, footer: dict, out_path: Union[PathLike, str]) -> None:
+def DEPRECATED_create_out_csv(header: dict, data_df: Union[ResultsTable, PandasDataFrame], footer: dict,
+                              out_path: Union[PathLike, str]) -> None:
     """
     DEPRECATED: Could still be used at some point to allow users to download a csv all data.
     Create the output csv at the path passed.
@@ -339,7 +516,7 @@ def DEPRECATED_create_out_csv(header: dict, data_df: DataFrame, footer: dict, ou
         # Write header data (Name, Address, Cost/kWh)
         _write_dict(to_write=header)
         # Write data (Cost, Actual Cost, Actual Consumption, etc.)
-        data_df.to_csv(out_file, mode='a', index=False)
+        data_df.to_csv(out_file, index=False)
         # Write footer data (Notes & Sources)
         _write_dict(to_write=footer)
 
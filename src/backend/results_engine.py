@@ -0,0 +1,98 @@
+# SolarCalculator/src/backend/results_engine.py
+# Vectorized results math: every monthly and annual metric of get_results() for N customers in one NumPy pass.
+import numpy as np
+
+from logging import getLogger
+from typing import Sequence
+
+LOGGER = getLogger(__name__)
+
+# np.round() scales by 10 ** decimals before rounding, so values within this of a .5 tie after scaling may round
+# differently to python's (correctly rounded) round(). Those few values are rounded by python instead.
+_TIE_TOLERANCE = 1e-6
+
+
+def round_like_python(values: np.ndarray, ndigits: int) -> np.ndarray:
+    """Round an array exactly like python's round(value, ndigits) does for each item."""
+
+    result = np.round(values, ndigits)
+    scaled = values * 10.0 ** ndigits
+    # inf/nan items (e.g., cost reduction for a month with no cost) are never ties
+    with np.errstate(invalid='ignore'):
+        near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < _TIE_TOLERANCE
+    if near_tie.any():
+        result[near_tie] = [round(float(value), ndigits) for value in values[near_tie]]
+
+    return result
+
+
+def sum_months(monthly: np.ndarray) -> np.ndarray:
+    """Sum 12xN monthly values into N annual values in month order, like python's sum() over each customer's list."""
+
+    total = np.zeros(monthly.shape[1:], dtype=np.float64)
+    for month in monthly:
+        total += month
+
+    return total
+
+
+def compute_results(consumption_monthly: np.ndarray, cost_monthly: np.ndarray, solar_potential_monthly: np.ndarray,
+                    cost_per_kwh: Sequence[float], needed_kwh: Sequence[int] = None,
+                    mod_kwh: Sequence[float] = None) -> dict:
+    """
+    Compute the savings figures of get_results() for N customers at once. Every value is identical to the
+    per-customer result, so months with no cost give an inf/nan cost reduction instead of raising.
+
+    :param consumption_monthly: 12xN array of monthly consumption (kWh).
+    :param cost_monthly: 12xN array of monthly cost ($).
+    :param solar_potential_monthly: 12xN array of monthly solar potential (kWh).
+    :param cost_per_kwh: N average costs per kWh.
+    :param needed_kwh: N array capacities (kW), required with mod_kwh for 'mod_quantity'.
+    :param mod_kwh: N module capacities (kW).
+    :return dictionary of 12xN monthly arrays (production_value, potential_cost_monthly, savings_monthly,
+        cost_reduction_monthly) and N annual arrays (the *_annual sums and cost_reduction_average).
+    """
+
+    consumption = np.asarray(consumption_monthly, dtype=np.float64)
+    cost = np.asarray(cost_monthly, dtype=np.float64)
+    solar = np.asarray(solar_potential_monthly, dtype=np.float64)
+    cost_per_kwh = np.asarray(cost_per_kwh, dtype=np.float64)[None, :]
+    LOGGER.info(f'Computing results for {consumption.shape[1]} customers')
+
+    production_value = round_like_python(solar * cost_per_kwh, 2)
+    potential_cost_monthly = round_like_python((consumption - solar) * cost_per_kwh, 2)
+    savings_monthly = round_like_python(cost - potential_cost_monthly, 2)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cost_reduction_monthly = round_like_python(savings_monthly / cost * 100, 2)
+
+    result = {
+        'production_value': production_value,
+        'potential_cost_monthly': potential_cost_monthly,
+        'savings_monthly': savings_monthly,
+        'cost_reduction_monthly': cost_reduction_monthly,
+        'solar_potential_annual': sum_months(solar),
+        'production_value_annual': sum_months(production_value),
+        'potential_cost_annual': sum_months(potential_cost_monthly),
+        'savings_annual': sum_months(savings_monthly),
+        # Same as _average() in results.py: a rounded mean
+        'cost_reduction_average': np.round(sum_months(cost_reduction_monthly) / len(cost_reduction_monthly)),
+    }
+    if needed_kwh is not None and mod_kwh is not None:
+        result['mod_quantity'] = np.ceil(
+            np.asarray(needed_kwh, dtype=np.float64) / np.asarray(mod_kwh, dtype=np.float64)
+        ).astype(int)
+
+    return result
+
+
+def compute_customer_results(input_data: Sequence[dict], solar_data: Sequence[dict]) -> dict:
+    """Stack N InputData and SolarPotentialData (models or dicts) into 12xN arrays and call compute_results()."""
+
+    return compute_results(
+        consumption_monthly=np.array([data.get('consumption_monthly') for data in input_data]).T,
+        cost_monthly=np.array([data.get('cost_monthly') for data in input_data]).T,
+        solar_potential_monthly=np.array([data.get('solar_potential_monthly') for data in solar_data]).T,
+        cost_per_kwh=[data.get('cost_per_kwh') for data in input_data],
+        needed_kwh=[data.get('needed_kwh') for data in solar_data],
+        mod_kwh=[data.get('mod_kwh') for data in input_data],
+    )
@@ -0,0 +1,93 @@
+# SolarCalculator/src/backend/results_table.py
+# Lightweight column-oriented results table serializing to the same csv/json as pandas, without importing pandas.
+from csv import writer as csv_writer
+from io import StringIO
+from json import dumps as j_dumps
+from math import isfinite
+from numbers import Integral
+from typing import Dict, Iterator, List, Optional, Sequence, TextIO
+
+
+def _normalize(values: Sequence) -> list:
+    """Give a column a single type like a DataFrame column's dtype: float if any value is a float, else int."""
+
+    if all(isinstance(value, Integral) for value in values):
+        return [int(value) for value in values]
+    if all(isinstance(value, (Integral, float)) for value in values):
+        return [float(value) for value in values]
+    return list(values)
+
+
+def _json_value(value) -> str:
+    """Format a value like DataFrame.to_json(): floats to at most 10 decimals without exponents."""
+
+    if isinstance(value, float):
+        if not isfinite(value):
+            return 'null'
+        formatted = f'{value:.10f}'.rstrip('0')
+        return formatted + '0' if formatted.endswith('.') else formatted
+    return j_dumps(value)
+
+
+class ResultsTable:
+    """
+    Column-oriented table of the results' 13 rows (12 months and the annual row), e.g., table['Cost $'] is a list.
+    Its to_csv() and to_json() output is identical to the pandas DataFrame of the same data, and to_dataframe()
+    converts to one (pandas is only imported then).
+    """
+
+    __slots__ = '_columns'
+
+    def __init__(self, data: Dict[str, Sequence]):
+        if len({len(values) for values in data.values()}) > 1:
+            raise ValueError('All columns of a ResultsTable must have the same number of rows.')
+        self._columns = {column: _normalize(values) for column, values in data.items()}
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._columns)
+
+    def __len__(self) -> int:
+        return len(next(iter(self._columns.values()), []))
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._columns)
+
+    def __getitem__(self, column: str) -> list:
+        return list(self._columns[column])
+
+    def rows(self) -> Iterator[tuple]:
+        """Yield each row's values in column order."""
+
+        return zip(*self._columns.values())
+
+    def to_dict(self) -> Dict[str, Dict[int, object]]:
+        """Return {column: {row index: value}}, like DataFrame.to_dict()."""
+
+        return {column: dict(enumerate(values)) for column, values in self._columns.items()}
+
+    def to_csv(self, path_or_buf: TextIO = None, index: bool = True) -> Optional[str]:
+        """Write the table as csv to path_or_buf, or return it as a string, like DataFrame.to_csv()."""
+
+        out = StringIO() if path_or_buf is None else path_or_buf
+        writer = csv_writer(out, lineterminator='\n')
+        writer.writerow([''] * index + self.columns)
+        for i, row in enumerate(self.rows()):
+            writer.writerow([i] * index + list(row))
+
+        return out.getvalue() if path_or_buf is None else None
+
+    def to_json(self) -> str:
+        """Return the table as json keyed by column then row index, like DataFrame.to_json()."""
+
+        return '{' + ','.join(
+            f'{j_dumps(column)}:{{' + ','.join(f'"{i}":{_json_value(value)}' for i, value in enumerate(values)) + '}'
+            for column, values in self._columns.items()
+        ) + '}'
+
+    def to_dataframe(self):
+        """Return the table as a pandas DataFrame (optional, e.g., for analysis or exports)."""
+
+        from pandas import DataFrame
+
+        return DataFrame(data=self._columns)
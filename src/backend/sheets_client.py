@@ -0,0 +1,216 @@
+# SolarCalculator/src/backend/sheets_client.py
+# Long lived, thread-safe Google Sheets client that authenticates once per process and reads many sheets concurrently.
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from itertools import islice
+from logging import getLogger
+from os import remove as os_remove
+from os.path import exists as os_exists, join
+from threading import Lock, local
+from time import sleep
+from typing import Iterable, Iterator, List, Tuple, Union
+
+LOGGER = getLogger(__name__)
+
+SHEETS_SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
+CREDS_DIR = './.creds'
+# Consumption (C), cost (D) and user data (name, address, mod kWh) ranges of the input sheet template.
+SHEET_RANGES = ['C2:C13', 'D2:D13', 'C15:C17']
+SHEETS_MAX_WORKERS = 8
+
+
+class SheetsError(Exception):
+    """Custom exception for a sheet that could not be read."""
+
+
+def _authenticate_google_api_token(creds_dir: str = CREDS_DIR):
+    """
+    Load, refresh or create the google api credentials in creds_dir/token.pickle.
+    https://medium.com/analytics-vidhya/how-to-read-and-write-data-to-google-spreadsheet-using-python-ebf54d51a72c
+
+    Will redirect to a google authenticate page if you have not run in a while and ask you to manually authenticate.
+    """
+
+    from google_auth_oauthlib.flow import InstalledAppFlow
+    from google.auth.transport.requests import Request
+    from google.auth.exceptions import RefreshError
+    import pickle
+
+    LOGGER.info('Attempting to authenticate the google sheets api')
+    token_path = join(creds_dir, 'token.pickle')
+
+    # 1. if token.pickle exists, open it and set credentials to it
+    credentials = None
+    if os_exists(token_path):
+        LOGGER.info('token.pickle object found')
+        with open(token_path, 'rb') as token:
+            credentials = pickle.load(token)
+    # 2. if token.pickle did not exist or was invalid do 2.a or 2.b then recreate the token.pickle
+    if not credentials or not credentials.valid:
+        LOGGER.info('Credentials token.pickle not found or invalid, attempting to resolve')
+        # 2.a if you have a credentials object but they're expired and support refreshing \
+        #     try to refresh and if that fails then delete the token and start over
+        if credentials and credentials.expired and credentials.refresh_token:
+            try:
+                credentials.refresh(Request())
+                LOGGER.info('Refreshing the token.pickle successful')
+            except RefreshError:
+                LOGGER.error("Credentials could not be refreshed, deleting token.pickle and trying again")
+                os_remove(token_path)
+                # Recursive call to rerun the process once the token is deleted. Max call stack = 1
+                return _authenticate_google_api_token(creds_dir=creds_dir)
+        # 2.b in all other cases, create a new flow and token.pickle
+        else:
+            flow = InstalledAppFlow.from_client_secrets_file(join(creds_dir, 'credentials.json'), SHEETS_SCOPES)
+            credentials = flow.run_local_server(port=0)
+        # Finally, recreate the token.pickle
+        with open(token_path, 'wb') as token:
+            pickle.dump(credentials, token)
+
+    LOGGER.info('Successfully authenticated the google sheets api')
+    return credentials
+
+
+class GoogleSheetsTransport:
+    """
+    Calls the Sheets v4 api. Credentials are loaded once and shared, while each thread builds its own service
+    because the httplib2 connection underneath a service is not thread-safe.
+    """
+
+    def __init__(self, creds_dir: str = CREDS_DIR, num_retries: int = 3):
+        self.creds_dir = creds_dir
+        self.num_retries = num_retries
+        self._credentials = None
+        self._lock = Lock()
+        self._local = local()
+
+    def _get_credentials(self):
+        """Return the shared credentials, authenticating only the first time or once they are no longer valid."""
+
+        with self._lock:
+            if self._credentials is None or not self._credentials.valid:
+                self._credentials = _authenticate_google_api_token(creds_dir=self.creds_dir)
+            return self._credentials
+
+    def _service(self):
+        """Return this thread's sheets service, building it on first use."""
+
+        service = getattr(self._local, 'service', None)
+        if service is None:
+            from googleapiclient.discovery import build
+
+            service = build('sheets', 'v4', credentials=self._get_credentials(), cache_discovery=False)
+            self._local.service = service
+        return service
+
+    def batch_get(self, sheet_id: str, ranges: List[str]) -> dict:
+        """Return the values.batchGet response for the ranges of a sheet."""
+
+        return self._service().spreadsheets().values().batchGet(
+            spreadsheetId=sheet_id, ranges=ranges
+        ).execute(num_retries=self.num_retries)
+
+
+class StandInSheetsTransport:
+    """
+    In memory stand-in for the Sheets v4 api returning batchGet shaped responses.
+    :param sheets: Dictionary of sheet id to a dictionary of range to rows of values (see stand_in_sheet()).
+    :param latency: Seconds added to every call.
+    """
+
+    def __init__(self, sheets: dict, latency: float = 0):
+        self.sheets = sheets
+        self.latency = latency
+        self.calls = 0
+        self.max_concurrency = 0
+        self._in_flight = 0
+        self._lock = Lock()
+
+    def batch_get(self, sheet_id: str, ranges: List[str]) -> dict:
+        with self._lock:
+            self.calls += 1
+            self._in_flight += 1
+            self.max_concurrency = max(self.max_concurrency, self._in_flight)
+        try:
+            sleep(self.latency)
+            if sheet_id not in self.sheets:
+                raise SheetsError(f'Requested entity was not found: {sheet_id}')
+            values = self.sheets[sheet_id]
+            return {
+                'spreadsheetId': sheet_id,
+                'valueRanges': [
+                    {'range': f'Sheet1!{cells}', 'majorDimension': 'ROWS', 'values': values.get(cells, [])}
+                    for cells in ranges
+                ]
+            }
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+
+def stand_in_sheet(name: str, address: str, mod_kwh: float, consumption: List[float], cost: List[float]) -> dict:
+    """Lay out a customer like the input sheet template for StandInSheetsTransport."""
+
+    return {
+        SHEET_RANGES[0]: [[str(kwh)] for kwh in consumption],
+        SHEET_RANGES[1]: [[str(dollars)] for dollars in cost],
+        SHEET_RANGES[2]: [[name], [address], [str(mod_kwh)]],
+    }
+
+
+class SheetsClient:
+    """
+    Thread-safe Sheets client to keep for the life of the process.
+    :param transport: Object with a batch_get(sheet_id, ranges) method, defaults to the Google Sheets api.
+    :param max_workers: Maximum number of concurrent sheet reads in batch_get_many().
+    """
+
+    def __init__(self, transport=None, max_workers: int = SHEETS_MAX_WORKERS):
+        self.transport = transport or GoogleSheetsTransport()
+        self.max_workers = max_workers
+
+    def batch_get(self, sheet_id: str, ranges: List[str] = None) -> dict:
+        """Return the values.batchGet response for the ranges (defaults to SHEET_RANGES) of a sheet."""
+
+        LOGGER.info(f'Reading the Google Sheet with the following sheet id: {sheet_id}')
+        return self.transport.batch_get(sheet_id=sheet_id, ranges=ranges or SHEET_RANGES)
+
+    def batch_get_many(self, sheet_ids: Iterable[str], ranges: List[str] = None,
+                       max_workers: int = None) -> Iterator[Tuple[str, Union[dict, Exception]]]:
+        """
+        Read many sheets concurrently with bounded parallelism, yielding (sheet id, response) in completion order.
+        A sheet that fails yields its exception as the response instead of stopping the others.
+        """
+
+        max_workers = max_workers or self.max_workers
+        sheet_ids = iter(sheet_ids)
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='sheets') as executor:
+            # Only keep a bounded number of sheets in flight so large/lazy lists are not loaded all at once.
+            pending = {
+                executor.submit(self.batch_get, sheet_id, ranges): sheet_id
+                for sheet_id in islice(sheet_ids, max_workers * 2)
+            }
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    sheet_id = pending.pop(future)
+                    for new_sheet_id in islice(sheet_ids, 1):
+                        pending[executor.submit(self.batch_get, new_sheet_id, ranges)] = new_sheet_id
+                    try:
+                        yield sheet_id, future.result()
+                    except Exception as e:
+                        LOGGER.error(f'The Google Sheet {sheet_id} could not be read: {e}')
+                        yield sheet_id, e
+
+
+_CLIENT = None
+_CLIENT_LOCK = Lock()
+
+
+def get_sheets_client() -> SheetsClient:
+    """Return the process wide SheetsClient, creating it on first use."""
+
+    global _CLIENT
+    with _CLIENT_LOCK:
+        if _CLIENT is None:
+            _CLIENT = SheetsClient()
+        return _CLIENT
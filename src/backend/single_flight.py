@@ -0,0 +1,66 @@
+# SolarCalculator/src/backend/single_flight.py
+# In-process request coalescing: concurrent calls with the same key share one in-flight call and its result.
+from logging import getLogger
+from threading import Event, Lock
+from typing import Any, Callable, Dict
+
+LOGGER = getLogger(__name__)
+
+
+class _Call:
+    __slots__ = 'done', 'result', 'error'
+
+    def __init__(self):
+        """An in-flight call that followers wait on."""
+
+        self.done = Event()
+        self.result, self.error = None, None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls by key. The first caller (leader) runs the function, callers arriving while it is
+    in flight wait and receive the same result (or exception). Nothing is kept once the call completes.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._calls: Dict[str, _Call] = {}
+        self.executed, self.coalesced = 0, 0
+
+    def do(self, key: str, func: Callable, *args, **kwargs) -> Any:
+        """Run func(*args, **kwargs) unless a call for key is already in flight, in which case wait for its result."""
+
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            LOGGER.info(f'Coalescing onto the in-flight call for key: {key}')
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func(*args, **kwargs)
+        except Exception as e:
+            call.error = e
+            raise e
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.result
+
+    def stats(self) -> dict:
+        """Return the number of calls executed and the number of calls coalesced onto them."""
+
+        with self._lock:
+            return {'executed': self.executed, 'coalesced': self.coalesced, 'in_flight': len(self._calls)}
@@ -0,0 +1,171 @@
+# SolarCalculator/src/backend/solar_cache.py
+# Persistent on-disk cache for PVWatts responses, keyed by normalized address and request params.
+from logging import getLogger
+from json import dumps as j_dumps, loads as j_loads
+from hashlib import sha256
+from os.path import join
+from tempfile import gettempdir
+from threading import Lock
+from time import time, sleep
+from typing import Optional
+import sqlite3
+
+LOGGER = getLogger(__name__)
+
+# /tmp is the only writable location on Lambda and survives between warm invocations of a container.
+CACHE_PATH = join(gettempdir(), 'solar_cache.sqlite3')
+CACHE_TTL = 60 * 60 * 24 * 30  # Seconds (30 days). PVWatts data is a 30 year average so it rarely changes.
+CACHE_MAX_ENTRIES = 10_000
+
+
+def normalize_address(address: str) -> str:
+    """Lower-case the address, drop punctuation and collapse whitespace so equivalent addresses share a key."""
+
+    cleaned = ''.join(s if s.isalnum() else ' ' for s in address.lower())
+    return ' '.join(cleaned.split())
+
+
+def cache_key(params: dict) -> str:
+    """Return a stable key for a PVWatts request from its params, using the normalized address."""
+
+    keyed = dict(params, address=normalize_address(str(params.get('address', ''))))
+    return sha256(j_dumps(keyed, sort_keys=True).encode()).hexdigest()
+
+
+class SolarCache:
+    """
+    SQLite backed cache of PVWatts responses with a TTL and size bounded LRU eviction.
+    Safe to share between threads of a worker and between processes pointing at the same file.
+    """
+
+    def __init__(self, path: str = CACHE_PATH, ttl: float = CACHE_TTL, max_entries: int = CACHE_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            'key TEXT PRIMARY KEY, response TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)')
+        self._conn.execute('CREATE TABLE IF NOT EXISTS inflight (key TEXT PRIMARY KEY, expires REAL NOT NULL)')
+
+    def _lookup(self, key: str, now: float) -> Optional[str]:
+        """Return the json of a live entry and mark it as accessed, or None. Must be called holding the lock."""
+
+        row = self._conn.execute('SELECT response, created FROM responses WHERE key = ?', (key,)).fetchone()
+        if row is None or now - row[1] > self.ttl:
+            if row is not None:
+                self._conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+            return None
+        self._conn.execute('UPDATE responses SET accessed = ? WHERE key = ?', (now, key))
+
+        return row[0]
+
+    def get(self, params: dict) -> Optional[dict]:
+        """Return the cached response for params or None if it is missing or expired."""
+
+        with self._lock:
+            response = self._lookup(key=cache_key(params), now=time())
+            if response is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        return j_loads(response)
+
+    def set(self, params: dict, response: dict) -> None:
+        """Store a response for params, then evict the least recently used entries over max_entries."""
+
+        now = time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses (key, response, created, accessed) VALUES (?, ?, ?, ?)',
+                (cache_key(params), j_dumps(response), now, now)
+            )
+            self._conn.execute(
+                'DELETE FROM responses WHERE key IN ('
+                'SELECT key FROM responses ORDER BY accessed DESC LIMIT -1 OFFSET ?)',
+                (self.max_entries,)
+            )
+
+    def claim(self, params: dict, lease: float = 30) -> bool:
+        """
+        Claim the cross-process in-flight lease for params.
+        :return False if another process holds a live lease (it is already requesting the same params).
+        """
+
+        key, now = cache_key(params), time()
+        with self._lock:
+            self._conn.execute('DELETE FROM inflight WHERE key = ? AND expires < ?', (key, now))
+            claimed = self._conn.execute(
+                'INSERT OR IGNORE INTO inflight (key, expires) VALUES (?, ?)', (key, now + lease)
+            ).rowcount
+
+        return bool(claimed)
+
+    def release(self, params: dict) -> None:
+        """Release the in-flight lease for params."""
+
+        with self._lock:
+            self._conn.execute('DELETE FROM inflight WHERE key = ?', (cache_key(params),))
+
+    def wait_for(self, params: dict, timeout: float = 30, interval: float = 0.05) -> Optional[dict]:
+        """Poll for the response another process is requesting until it is stored, its lease ends or timeout."""
+
+        key, deadline = cache_key(params), time() + timeout
+        while time() < deadline:
+            with self._lock:
+                response = self._lookup(key=key, now=time())
+                leased = self._conn.execute(
+                    'SELECT 1 FROM inflight WHERE key = ? AND expires >= ?', (key, time())
+                ).fetchone()
+                if response is not None:
+                    self.hits += 1
+                    return j_loads(response)
+            if not leased:
+                break
+            sleep(interval)
+
+        return None
+
+    def clear(self) -> None:
+        """Remove every entry and reset the hit/miss counters."""
+
+        with self._lock:
+            self._conn.execute('DELETE FROM responses')
+            self.hits, self.misses = 0, 0
+
+    def stats(self) -> dict:
+        """Return the hit/miss counters, hit rate and current number of entries."""
+
+        with self._lock:
+            entries = self._conn.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+        lookups = self.hits + self.misses
+
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            'entries': entries,
+        }
+
+
+_CACHE = None
+_CACHE_LOCK = Lock()
+
+
+def get_solar_cache() -> SolarCache:
+    """Return the worker's shared SolarCache, opening it on first use."""
+
+    global _CACHE
+    with _CACHE_LOCK:
+        # Concurrent first calls (e.g., solar_potential_batch() threads) must share one connection
+        if _CACHE is None:
+            LOGGER.info(f'Opening the PVWatts response cache at: {CACHE_PATH}')
+            _CACHE = SolarCache()
+        return _CACHE
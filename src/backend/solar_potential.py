@@ -1,16 +1,49 @@
 # SolarCalculator/src/backend/solar_potential.py
 # This module gets the solar iridescence data for a given address.
-from requests import get as r_get
-
 from logging import getLogger
-from json import JSONDecodeError
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime as dt
+from typing import Literal, Iterable, Iterator, Union
+from urllib.parse import urlparse
 
 from config import NREL_API_KEY
-from utils import SolarPotentialData, Status
+from utils import InputData, SolarPotentialData, Status
+from solar_cache import get_solar_cache, cache_key
+from single_flight import SingleFlight
+from nrel_client import get_nrel_client, NRELError
+from rate_limiter import get_rate_limiter
+from cassette import Cassette, CassetteError
+
+try:
+    # OPTIONAL: Additional keys to rotate across when NREL_API_KEY's hourly quota is used up.
+    from config import NREL_API_KEYS
+except ImportError:
+    NREL_API_KEYS = [NREL_API_KEY]
+try:
+    # OPTIONAL: 'live' (default), 'record' live responses to cassettes or 'replay' them without calling the api.
+    from config import PVWATTS_MODE
+except ImportError:
+    PVWATTS_MODE = 'live'
+try:
+    # OPTIONAL: Whether requests take a token from the host wide NREL rate limiter. None (default) only limits
+    # requests to NREL's own api, so runs against another NREL_URL (e.g., the stand-in) neither wait on nor use up
+    # the real keys' quota.
+    from config import NREL_RATE_LIMITED
+except ImportError:
+    NREL_RATE_LIMITED = None
 
 
 LOGGER = getLogger(__name__)
+# 'analytic' scales the 1 kW (normalized) response by the needed capacity, 'api' requests the capacity from PVWatts.
+SCALING_MODE = 'analytic'
+# Matches the connection pool size of the shared NRELClient so batch workers never wait on a socket.
+BATCH_MAX_WORKERS = 10
+# Concurrent identical PVWatts lookups in this process always share one call. Set True to also wait on the
+# same lookup in other processes sharing the cache file (requires use_cache) instead of requesting it again.
+COALESCE_ACROSS_PROCESSES = False
+_SINGLE_FLIGHT = SingleFlight()
+_CASSETTE = Cassette(mode=PVWATTS_MODE) if PVWATTS_MODE in ('record', 'replay') else None
+NREL_API_HOST = 'developer.nrel.gov'
 
 
 def _get_params(capacity: int, address: str,
@@ -34,41 +67,130 @@ def _get_params(capacity: int, address: str,
     }
 
 
-def _get_iridescence_obj(params: dict, nrel_token: str) -> dict:
-    """Use requests lib to get iridescence object via the nrel token passed."""
+def _is_rate_limited(url: str) -> bool:
+    """Return whether requests to url take a token from the NREL rate limiter (see NREL_RATE_LIMITED)."""
 
-    LOGGER.info(f'Requesting the nrel api to retrieve solar potential data using token: {nrel_token}')
+    if NREL_RATE_LIMITED is not None:
+        return NREL_RATE_LIMITED
+    return urlparse(url).hostname == NREL_API_HOST
 
-    request, i = None, 0
-    while i < 3:
-        try:
-            # Try the get request with the nrel api.
-            request = r_get(
-                url=f'https://developer.nrel.gov/api/pvwatts/v6.json?api_key={nrel_token}',
-                params=params
-            )
-        except JSONDecodeError:
-            # This is a rare error that is typically alleviated by recalling the get request.
-            # If encountered, recall the get function a max of 3 times.
-            LOGGER.error('JSONDecodeError encountered. Attempting the call again', exc_info=True)
-            i += 1
-            continue
-        except Exception as e:
-            # Log and raise the appropriate exception if encountered.
-            LOGGER.error(e, exc_info=True)
-            raise e
-        else:
-            # Return the requested data if request successful.
-            LOGGER.info(f'Request successful for solar potential data: {request.json()}')
-            return request.json()
-
-    # If the loop exits then it is because the JSONDecodeError was raised 3 times in a row.
-    # Log the issue and raise an Exception.
-    LOGGER.error('The nrel API get request still failed due to a JSONDecodeError after 3 requests')
-    raise Exception('After requesting 3 times, the nrel API get request still failed due to a JSONDecodeError.')
-
-
-def get_solar_potential(input_data: dict) -> SolarPotentialData:
+
+def _get_iridescence_obj(params: dict, nrel_token: str = None, use_cache: bool = True) -> dict:
+    """
+    Get iridescence object from the PVWatts api via the shared NRELClient. Served from the cache when possible.
+    :param params: Params for the request (see _get_params()).
+    :param nrel_token: Api key to use. Rotates across NREL_API_KEYS through the shared rate limiter if None.
+    :param use_cache: Look the response up in (and store it to) the PVWatts response cache.
+    :return: dictionary of the PVWatts response.
+    """
+
+    cache = get_solar_cache() if use_cache else None
+    if cache is not None:
+        cached = cache.get(params=params)
+        if cached is not None:
+            # Only the in-memory counters: stats() counts the table's entries, too slow for every hit
+            LOGGER.info(f'Solar potential data served from the PVWatts cache ({cache.hits} hits)')
+            return cached
+
+    # Identical lookups already in flight in this worker share that call instead of requesting the api again.
+    return _SINGLE_FLIGHT.do(cache_key(params), _request_iridescence_obj, params, nrel_token, cache)
+
+
+def _request_iridescence_obj(params: dict, nrel_token: str = None, cache=None) -> dict:
+    """Request the PVWatts api for params (see _get_iridescence_obj()) and store a complete response to cache."""
+
+    if _CASSETTE is not None and _CASSETTE.mode == 'replay':
+        recorded = _CASSETTE.play(params=params)
+        if recorded is None:
+            LOGGER.error(f'No cassette has been recorded for the params: {params}')
+            raise CassetteError(f'No cassette has been recorded for the params: {params}')
+        return recorded
+
+    claimed = cache is not None and COALESCE_ACROSS_PROCESSES and cache.claim(params=params)
+    if cache is not None and COALESCE_ACROSS_PROCESSES and not claimed:
+        # Another process is requesting the same params, use its response once it lands in the shared cache.
+        cached = cache.wait_for(params=params)
+        if cached is not None:
+            LOGGER.info('Solar potential data received from a request in flight in another process')
+            return cached
+        # Its lease ended or the wait timed out without a response, so request it here (leading later waiters if
+        # the lease is free). Never release a lease another process still holds.
+        claimed = cache.claim(params=params)
+
+    try:
+        LOGGER.info('Requesting the nrel api to retrieve solar potential data')
+
+        # Every request to NREL's api takes a token from the limiter shared by all processes on the host. Passing
+        # nrel_token pins the request to that key, else the limiter rotates across NREL_API_KEYS. The shared client
+        # handles connection reuse, timeouts and retries (429/5xx, invalid json).
+        client = get_nrel_client()
+        limiter = get_rate_limiter(api_keys=NREL_API_KEYS) if _is_rate_limited(url=client.url) else None
+        rotate = limiter is not None and not nrel_token
+        for attempt in range(len(NREL_API_KEYS) if rotate else 1):
+            api_key = limiter.acquire(api_key=nrel_token) if limiter is not None else nrel_token or NREL_API_KEYS[0]
+            try:
+                result = client.get(params=params, api_key=api_key)
+            except NRELError as e:
+                if e.status_code == 429 and attempt < len(NREL_API_KEYS) - 1 and rotate:
+                    # The key is over its limit upstream (e.g., used outside this host), rotate to the next key.
+                    limiter.exhaust(api_key=api_key)
+                    continue
+                LOGGER.error(e, exc_info=True)
+                raise e
+            except Exception as e:
+                # Log and raise the appropriate exception if encountered.
+                LOGGER.error(e, exc_info=True)
+                raise e
+            break
+
+        LOGGER.info(f'Request successful for solar potential data: {result}')
+        # Only cache/record complete responses so errors are retried on the next call.
+        if result.get('outputs') and not result.get('errors'):
+            if cache is not None:
+                cache.set(params=params, response=result)
+            if _CASSETTE is not None:
+                _CASSETTE.record(params=params, response=result)
+        return result
+    finally:
+        if claimed:
+            cache.release(params=params)
+
+
+def _scale_outputs(normal_outputs: dict, capacity: int) -> dict:
+    """Scale the monthly and annual ac output of a normalized (1 kW) PVWatts response to the capacity passed."""
+
+    return {
+        'ac_monthly': [elem * capacity for elem in normal_outputs.get('ac_monthly')],
+        'ac_annual': normal_outputs.get('ac_annual') * capacity
+    }
+
+
+def scaling_error(normal_obj: dict, actual_obj: dict, capacity: int) -> dict:
+    """
+    Measure the error of the analytic scaling against a PVWatts response requested at the actual capacity.
+    :param normal_obj: PVWatts response requested with system_capacity == 1.
+    :param actual_obj: PVWatts response requested with system_capacity == capacity.
+    :param capacity: The capacity the actual_obj was requested with.
+    :return dictionary of the largest monthly error and the annual error, both absolute kWh and percentages.
+    """
+
+    scaled = _scale_outputs(normal_outputs=normal_obj.get('outputs'), capacity=capacity)
+    actual_outputs = actual_obj.get('outputs')
+    monthly_errors = [abs(s - a) for s, a in zip(scaled['ac_monthly'], actual_outputs.get('ac_monthly'))]
+    monthly_pct = [err / a * 100 for err, a in zip(monthly_errors, actual_outputs.get('ac_monthly')) if a]
+    annual_error = abs(scaled['ac_annual'] - actual_outputs.get('ac_annual'))
+
+    return {
+        'capacity': capacity,
+        'max_monthly_error_kwh': round(max(monthly_errors), 2),
+        'max_monthly_error_pct': round(max(monthly_pct, default=0), 4),
+        'annual_error_kwh': round(annual_error, 2),
+        'annual_error_pct': round(annual_error / actual_outputs.get('ac_annual') * 100, 4),
+    }
+
+
+def get_solar_potential(input_data: Union[dict, InputData], scaling: Literal['analytic', 'api'] = None,
+                        hourly: bool = False, validate: bool = True) -> SolarPotentialData:
     """
     Runs through steps to get solar potential data for the address provided:
     1. Get normalized data:
@@ -77,13 +199,24 @@ def get_solar_potential(input_data: dict) -> SolarPotentialData:
     2. Calculate needed kWh:
         - Divide actual annual consumption by normalized annual consumption
     3. Get solar potential data:
-        - Get params with capacity == needed kWh (actual)
+        - 'analytic' scaling: Multiply the normalized outputs by needed kWh (no 2nd api call)
+        - 'api' scaling: Get params with capacity == needed kWh (actual) and get iridescence data for them
     4. Validate actual data into SolarPotentialData model.
 
-    :param input_data: Dict (json) object passed to this function containing address and consumption_annual attributes.
+    :param input_data: InputData model or its dict (json) containing address and consumption_annual attributes.
+    :param scaling: 'analytic' or 'api'. Defaults to SCALING_MODE.
+    :param hourly: Get the normalized data as an hourly (8760 point) profile and include the scaled profile as
+        solar_potential_hourly. Monthly figures are derived from it and scaling is always 'analytic'.
+    :param validate: Validate the SolarPotentialData model. The in-process pipeline passes False since every value is
+        already of its field's type and input_data was validated by get_inputs().
     :return SolarPotentialData model
     """
 
+    scaling = scaling or SCALING_MODE
+    if scaling not in ('analytic', 'api'):
+        LOGGER.error(f'The scaling mode passed is invalid: {scaling}')
+        raise ValueError(f"The scaling mode '{scaling}' is invalid. Must be one of: ('analytic', 'api')")
+
     LOGGER.info(f'solar_potential_handler() called for given event: {input_data}')
 
     # if not input_data.get('uid') or not input_data.get('address') or not input_data.get('consumption_annual'):
@@ -96,27 +229,43 @@ def get_solar_potential(input_data: dict) -> SolarPotentialData:
     LOGGER.info(f'Attempting to retrieve the solar potential data for the following address: {address}')
 
     # 1. Get normalized data:
-    normal_params = _get_params(capacity=1, address=address)
-    normal_outputs = _get_iridescence_obj(params=normal_params, nrel_token=NREL_API_KEY).get('outputs')
+    hourly_normal = None
+    if hourly:
+        from hourly import get_hourly_profile, monthly_totals
+        hourly_normal = get_hourly_profile(address=address)
+        normal_outputs = {
+            'ac_monthly': monthly_totals(hourly_normal).tolist(),
+            'ac_annual': float(hourly_normal.sum(dtype='float64'))
+        }
+    else:
+        normal_params = _get_params(capacity=1, address=address)
+        normal_outputs = _get_iridescence_obj(params=normal_params).get('outputs')
     normal_annual = round(normal_outputs.get('ac_annual'))
     # 2. Calculate needed kWh:
     needed_kwh = round(annual_consumption / normal_annual)
+    if needed_kwh < 1:
+        LOGGER.error(f'The needed kWh for address {address} is less than 1: {needed_kwh}')
+        raise ValueError(f"The annual consumption ({annual_consumption} kWh) needs less than 1 kW of solar.")
     # 3. Get solar potential data:
-    actual_params = _get_params(capacity=needed_kwh, address=address)
-    actual_obj = _get_iridescence_obj(params=actual_params, nrel_token=NREL_API_KEY)
-    actual_outputs = actual_obj.get('outputs')
+    if scaling == 'analytic' or hourly:
+        actual_outputs = _scale_outputs(normal_outputs=normal_outputs, capacity=needed_kwh)
+    else:
+        actual_params = _get_params(capacity=needed_kwh, address=address)
+        actual_obj = _get_iridescence_obj(params=actual_params)
+        actual_outputs = actual_obj.get('outputs')
     actual_monthly = actual_outputs.get('ac_monthly')
     # 4. Validate actual data into SolarPotentialData model.
-    result = SolarPotentialData(
+    build = SolarPotentialData if validate else SolarPotentialData.construct
+    result = build(
         uid=input_data.get('uid'),
         name=input_data.get("name"),
         time_stamp=dt.now().__str__(),
         status=Status(status_code=200, message="get_solar_potential() called successfully."),
         address=address,
         solar_potential_monthly=[round(elem) for elem in actual_monthly],
-        solar_potential_annual=round(float(actual_outputs.get('ac_annual')), 2),
+        solar_potential_annual=int(round(float(actual_outputs.get('ac_annual')), 2)),
         needed_kwh=needed_kwh,
-        input_data=input_data
+        solar_potential_hourly=hourly_normal * needed_kwh if hourly else None
     )
 
     LOGGER.info(f'Solar data retrieved and validated: {result}')
@@ -148,6 +297,51 @@ def solar_potential_handler(event: dict) -> dict:
     return solar_data
 
 
+def solar_potential_batch(events: Iterable[dict], max_workers: int = BATCH_MAX_WORKERS,
+                          ordered: bool = False, max_buffered: int = None) -> Iterator[dict]:
+    """
+    Run solar_potential_handler() over many input events on a bounded thread pool.
+    Each item is isolated by the handler, so a failed address yields a 400 Status instead of stopping the batch.
+
+    :param events: Iterable (may be a lazy generator) of InputData dicts.
+    :param max_workers: Maximum number of concurrent lookups.
+    :param ordered: Yield results in the order of events if True, else as soon as each one completes.
+    :param max_buffered: With ordered, the most completed results held back behind a slower earlier event before no
+        new events are started, defaults to 4 per worker.
+    :return Iterator of the handler's output dicts.
+    """
+
+    LOGGER.info(f'Running solar potential batch with {max_workers} workers (ordered={ordered})')
+
+    max_buffered = max_buffered or max_workers * 4
+    events = enumerate(events)
+    buffer, next_index = {}, 0
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='solar_batch') as executor:
+        # Only keep a bounded number of events in flight (and, when ordered, waiting to be yielded) so large/lazy
+        # batches are not loaded all at once. The buffer's next result is always in flight, so this never stalls.
+        pending = {}
+        while True:
+            while len(pending) < max_workers * 2 and len(buffer) < max_buffered:
+                event = next(events, None)
+                if event is None:
+                    break
+                pending[executor.submit(solar_potential_handler, event[1])] = event[0]
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = pending.pop(future)
+                if not ordered:
+                    yield future.result()
+                    continue
+                buffer[index] = future.result()
+                while next_index in buffer:
+                    yield buffer.pop(next_index)
+                    next_index += 1
+
+    LOGGER.info('Solar potential batch complete')
+
+
 if __name__ == '__main__':
     from utils import SAMPLES, import_json
     print(solar_potential_handler(event=import_json(SAMPLES['event_ready_for_solar'])).get("status"))
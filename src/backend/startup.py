@@ -0,0 +1,93 @@
+# SolarCalculator/src/backend/startup.py
+# Import time (cold start) profiling of the Lambda entry points, with a budget that fails when it regresses.
+from argparse import ArgumentParser
+from json import loads as j_loads
+from logging import getLogger
+from os import environ
+from os.path import dirname, abspath
+from statistics import median
+from subprocess import run
+from sys import executable
+from typing import Dict, List
+
+LOGGER = getLogger(__name__)
+
+BACKEND_DIR = dirname(abspath(__file__))
+# Milliseconds each module may take to import in a fresh interpreter (about twice the current time, for noisy hosts)
+IMPORT_BUDGET_MS = {
+    'main': 500,
+    'pipeline': 500,
+    'inputs': 200,
+    'solar_potential': 350,
+    'results': 400,
+}
+# Modules only loaded once they are used (first AWS call, png graph or pandas export), never at import
+DEFERRED_MODULES = ('boto3', 'botocore', 'matplotlib', 'pandas', 'openpyxl', 'googleapiclient')
+
+
+def profile_import(module: str, runs: int = 3, top: int = 10) -> dict:
+    """
+    Import module in fresh interpreters with -X importtime and summarize the runs.
+    :return dictionary of the median import time (ms), each run's time, the slowest imports by self time (ms) and
+        the DEFERRED_MODULES that were imported.
+    """
+
+    code = f'import sys, json; import {module}; print(json.dumps(sorted(sys.modules)))'
+    env = {**environ, 'PYTHONPATH': BACKEND_DIR}
+    times, slowest, loaded = [], {}, []
+    for _ in range(runs):
+        process = run([executable, '-X', 'importtime', '-c', code], cwd=BACKEND_DIR, env=env, capture_output=True,
+                      text=True, check=True)
+        for line in process.stderr.splitlines():
+            if not line.startswith('import time:') or 'self [us]' in line:
+                continue
+            self_us, cumulative_us, name = line[len('import time:'):].split('|')
+            if name.rstrip() == f' {module}':  # The top level (unindented) import of the module
+                times.append(int(cumulative_us) / 1000)
+            slowest[name.strip()] = max(slowest.get(name.strip(), 0), int(self_us) / 1000)
+        loaded = [name for name in DEFERRED_MODULES if name in j_loads(process.stdout)]
+
+    return {
+        'module': module,
+        'ms': round(median(times), 1),
+        'runs_ms': [round(ms, 1) for ms in times],
+        'slowest': sorted(slowest.items(), key=lambda item: item[1], reverse=True)[:top],
+        'deferred_loaded': loaded,
+    }
+
+
+def check_startup_budget(budgets: Dict[str, float] = None, runs: int = 3) -> List[str]:
+    """Profile the import of every budgeted module and return a message for each that is over budget."""
+
+    failures = []
+    for module, budget in (budgets or IMPORT_BUDGET_MS).items():
+        profile = profile_import(module=module, runs=runs)
+        LOGGER.info(f'Importing {module} took {profile["ms"]} ms (budget {budget} ms)')
+        if profile['ms'] > budget:
+            failures.append(f'Importing {module} took {profile["ms"]} ms, over its {budget} ms budget')
+        if profile['deferred_loaded']:
+            failures.append(f'Importing {module} loaded deferred modules: {profile["deferred_loaded"]}')
+
+    return failures
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description='Report import times of the Lambda entry points and check their budget.')
+    parser.add_argument('modules', nargs='*', default=list(IMPORT_BUDGET_MS))
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--top', type=int, default=10, help='Number of slowest imports to list per module.')
+    args = parser.parse_args()
+
+    for name in args.modules:
+        result = profile_import(module=name, runs=args.runs, top=args.top)
+        budget = IMPORT_BUDGET_MS.get(name)
+        print(f"{name}: {result['ms']} ms (runs {result['runs_ms']}, budget {budget} ms)")
+        if result['deferred_loaded']:
+            print(f"  loads deferred modules: {result['deferred_loaded']}")
+        for slow_name, self_ms in result['slowest']:
+            print(f'  {self_ms:8.1f} ms  {slow_name}')
+
+    problems = check_startup_budget(budgets={name: IMPORT_BUDGET_MS[name] for name in args.modules
+                                             if name in IMPORT_BUDGET_MS}, runs=args.runs)
+    print('\n'.join(problems) or 'All imports are within budget.')
+    raise SystemExit(1 if problems else 0)
@@ -0,0 +1,91 @@
+# SolarCalculator/src/backend/sweep.py
+# Sweeps a grid of array orientations (tilt/azimuth) and losses for an address and picks the best configuration.
+import numpy as np
+
+from logging import getLogger
+from concurrent.futures import ThreadPoolExecutor
+from itertools import product
+from typing import Sequence
+
+from solar_potential import _get_params, _get_iridescence_obj, BATCH_MAX_WORKERS
+
+LOGGER = getLogger(__name__)
+
+DEFAULT_TILTS = (0, 10, 20, 30, 40, 50)
+DEFAULT_AZIMUTHS = (90, 135, 180, 225, 270)
+DEFAULT_LOSSES = (10, 14, 18)
+# With exact_losses=False, profiles are only fetched at this value and other loss values are a linear derate of
+# it. PVWatts applies losses before the inverter, whose efficiency curve and clipping make the AC output not quite
+# linear in losses, so the derated entries are approximate (see 'derated_losses' in the result).
+REFERENCE_LOSSES = 10
+
+
+def _fetch_monthly(address: str, tilt: float, azimuth: float, losses: float) -> list:
+    """Get the normalized (1 kW) monthly ac output for an orientation, through the PVWatts response cache."""
+
+    params = _get_params(capacity=1, address=address, azimuth=str(azimuth), tilt=str(tilt), losses=str(losses))
+    return _get_iridescence_obj(params=params).get('outputs').get('ac_monthly')
+
+
+def sweep_orientations(address: str, tilts: Sequence[float] = DEFAULT_TILTS,
+                       azimuths: Sequence[float] = DEFAULT_AZIMUTHS, losses: Sequence[float] = DEFAULT_LOSSES,
+                       annual_consumption: int = None, exact_losses: bool = True,
+                       max_workers: int = BATCH_MAX_WORKERS) -> dict:
+    """
+    Evaluate every tilt/azimuth/losses combination for an address and return the best one and the full surface.
+
+    :param address: String of the address you are analyzing.
+    :param tilts: Tilt angles (degrees) to evaluate.
+    :param azimuths: Azimuth angles (degrees) to evaluate.
+    :param losses: System losses (%) to evaluate.
+    :param annual_consumption: If passed, the capacity (kW) needed to offset it is reported for every candidate.
+    :param exact_losses: Fetch a profile per loss value (through the PVWatts response cache). If False, only the
+        REFERENCE_LOSSES profiles are fetched and the other loss values are approximated by derating them.
+    :param max_workers: Maximum number of concurrent profile fetches.
+    :return dictionary of the 'best' configuration, the grid axes and the 'ac_monthly'
+        (tilt x azimuth x losses x 12) and 'ac_annual' (tilt x azimuth x losses) kWh per kW surfaces. The
+        'derated_losses' are the loss values whose entries are approximated rather than returned by the api.
+    """
+
+    LOGGER.info(f'Sweeping {len(tilts) * len(azimuths) * len(losses)} configurations for address: {address}')
+
+    # 1. Fetch each distinct normalized profile once, concurrently.
+    fetch_losses = list(losses) if exact_losses else [REFERENCE_LOSSES]
+    grid = list(product(tilts, azimuths, fetch_losses))
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='sweep') as executor:
+        profiles = list(executor.map(lambda args: _fetch_monthly(address, *args), grid))
+    profiles = np.asarray(profiles, dtype=np.float64).reshape(len(tilts), len(azimuths), len(fetch_losses), 12)
+
+    # 2. Score every candidate in one vectorized pass.
+    if exact_losses:
+        ac_monthly = profiles
+    else:
+        derate = (1 - np.asarray(losses, dtype=np.float64) / 100) / (1 - REFERENCE_LOSSES / 100)
+        ac_monthly = profiles * derate[None, None, :, None]
+    ac_annual = ac_monthly.sum(axis=-1)
+    i_tilt, i_azimuth, i_losses = np.unravel_index(np.argmax(ac_annual), ac_annual.shape)
+
+    best = {
+        'tilt': tilts[i_tilt],
+        'azimuth': azimuths[i_azimuth],
+        'losses': losses[i_losses],
+        'ac_monthly': ac_monthly[i_tilt, i_azimuth, i_losses].tolist(),
+        'ac_annual': float(ac_annual[i_tilt, i_azimuth, i_losses]),
+    }
+    result = {
+        'best': best,
+        'tilts': list(tilts),
+        'azimuths': list(azimuths),
+        'losses': list(losses),
+        'ac_monthly': ac_monthly,
+        'ac_annual': ac_annual,
+        'profiles_fetched': len(grid),
+        'derated_losses': [] if exact_losses else [value for value in losses if value != REFERENCE_LOSSES],
+    }
+    if annual_consumption:
+        needed_kwh = np.maximum(np.round(annual_consumption / ac_annual), 1).astype(int)
+        result['needed_kwh'] = needed_kwh
+        best['needed_kwh'] = int(needed_kwh[i_tilt, i_azimuth, i_losses])
+
+    LOGGER.info(f'Best configuration for address {address}: {best}')
+    return result
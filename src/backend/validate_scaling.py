@@ -0,0 +1,85 @@
+# SolarCalculator/src/backend/validate_scaling.py
+# Validation harness comparing the 'analytic' scaling in solar_potential.py against the 2 call 'api' path.
+from argparse import ArgumentParser
+from logging import getLogger
+from json import dump as j_dump
+from os import listdir, makedirs
+from os.path import isdir, join
+
+from utils import import_json, clean_name, ROOT
+from solar_potential import _get_params, _get_iridescence_obj, scaling_error
+
+LOGGER = getLogger(__name__)
+
+# Ships with pairs recorded from the stand-in (pvwatts_server.py), add live ones with --record ADDRESS CAPACITY.
+SAMPLES_DIR = join(ROOT, 'samples/pvwatts')
+# Largest monthly or annual error (%) of the analytic scaling accepted against the 'api' path.
+MAX_SCALING_ERROR_PCT = 1.0
+
+
+def record_scaling_sample(address: str, capacity: int, out_dir: str = SAMPLES_DIR) -> str:
+    """Request the 1 kW and the capacity kW responses for an address and record them as a json sample."""
+
+    makedirs(out_dir, exist_ok=True)
+    sample = {
+        'address': address,
+        'capacity': capacity,
+        'normal': _get_iridescence_obj(params=_get_params(capacity=1, address=address)),
+        'actual': _get_iridescence_obj(params=_get_params(capacity=capacity, address=address))
+    }
+    out_path = join(out_dir, f'{clean_name(address)}-{capacity}kw.json')
+    with open(out_path, 'w') as out:
+        j_dump(sample, out)
+
+    LOGGER.info(f'Scaling sample recorded: {out_path}')
+    return out_path
+
+
+def validate_scaling(sample_dir: str = SAMPLES_DIR) -> dict:
+    """
+    Compute the scaling error for every recorded sample in sample_dir and summarize the worst case.
+    :raise FileNotFoundError if sample_dir does not exist.
+    """
+
+    if not isdir(sample_dir):
+        LOGGER.error(f'The scaling samples directory does not exist: {sample_dir}')
+        raise FileNotFoundError(
+            f'No scaling samples at "{sample_dir}". Record one with --record ADDRESS CAPACITY or pass --samples.'
+        )
+
+    errors = []
+    for file_name in sorted(listdir(sample_dir)):
+        if not file_name.endswith('.json'):
+            continue
+        sample = import_json(join(sample_dir, file_name))
+        error = scaling_error(normal_obj=sample['normal'], actual_obj=sample['actual'], capacity=sample['capacity'])
+        errors.append(dict(error, sample=file_name))
+
+    max_monthly = max((e['max_monthly_error_pct'] for e in errors), default=0)
+    max_annual = max((e['annual_error_pct'] for e in errors), default=0)
+    return {
+        'samples': len(errors),
+        'max_monthly_error_pct': max_monthly,
+        'max_annual_error_pct': max_annual,
+        'within_bound': max(max_monthly, max_annual) <= MAX_SCALING_ERROR_PCT,
+        'errors': errors
+    }
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description='Measure analytic scaling error against recorded PVWatts responses.')
+    parser.add_argument('--record', nargs=2, metavar=('ADDRESS', 'CAPACITY'), help='Record a new sample first.')
+    parser.add_argument('--samples', default=SAMPLES_DIR, help='Directory of recorded samples.')
+    args = parser.parse_args()
+
+    if args.record:
+        record_scaling_sample(address=args.record[0], capacity=int(args.record[1]), out_dir=args.samples)
+    try:
+        summary = validate_scaling(sample_dir=args.samples)
+    except FileNotFoundError as e:
+        raise SystemExit(str(e))
+    for err in summary['errors']:
+        print(err)
+    print(f"{summary['samples']} samples | max monthly error: {summary['max_monthly_error_pct']}% "
+          f"| max annual error: {summary['max_annual_error_pct']}% (bound {MAX_SCALING_ERROR_PCT}%)")
+    raise SystemExit(0 if summary['within_bound'] else 1)
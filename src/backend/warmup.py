@@ -0,0 +1,111 @@
+# SolarCalculator/src/backend/warmup.py
+# Warmup events (e.g., an EventBridge schedule) that pay a container's first request costs without running the pipeline.
+from logging import getLogger
+from time import perf_counter
+from typing import Callable, Dict, Iterable, List
+
+from utils import Status
+
+try:
+    # OPTIONAL: Addresses whose PVWatts responses are loaded into the solar cache by warmup events.
+    from config import WARMUP_ADDRESSES
+except ImportError:
+    WARMUP_ADDRESSES = []
+
+LOGGER = getLogger(__name__)
+
+
+def is_warmup_event(event: dict) -> bool:
+    """Return True for a warmup event: {"warmup": true, ...} or a scheduled EventBridge (CloudWatch) event."""
+
+    return bool(event.get('warmup')) or event.get('detail-type') == 'Scheduled Event'
+
+
+def warm_graphs() -> None:
+    """
+    Start the upload pool and every render worker, each of which loads matplotlib, the Agg backend and its font
+    cache as it starts. Where the render pool is unavailable, graphs render on this process's threads, so its
+    template is warmed instead.
+    """
+
+    from concurrent.futures import wait
+    from graphs import warm_template
+    from results import _get_render_pool, _get_upload_pool, RENDER_WORKERS
+
+    _get_upload_pool()
+    renders = _get_render_pool()
+    if renders is None:
+        warm_template()
+        return
+    # The pool starts a worker for each job submitted while none is idle, so submitting a job per worker before any
+    # finishes starts them all. Each worker warms its own template as it starts (the pool's initializer), so the
+    # jobs themselves are no-ops: int() returns 0.
+    wait([renders.submit(int) for _ in range(RENDER_WORKERS)])
+
+
+def warm_aws() -> None:
+    """Create the S3 and DynamoDB resources, resolving boto3's endpoints and credentials."""
+
+    from utils import get_aws_resource
+
+    for service_name in ('s3', 'dynamodb'):
+        get_aws_resource(service_name)
+
+
+def warm_solar_cache(addresses: Iterable[str] = None) -> None:
+    """Load the normalized (1 kW) PVWatts response of each address into the solar cache, requesting any missing."""
+
+    from solar_potential import _get_iridescence_obj, _get_params
+
+    for address in WARMUP_ADDRESSES if addresses is None else addresses:
+        try:
+            _get_iridescence_obj(params=_get_params(capacity=1, address=address))
+        except Exception as e:
+            # One bad address should not keep the others (or the other steps) from warming.
+            LOGGER.warning(f'Solar cache warmup failed for address {address}: {e.__repr__()}')
+
+
+WARMUP_STEPS: Dict[str, Callable[..., None]] = {
+    'graphs': warm_graphs,
+    'aws': warm_aws,
+    'solar_cache': warm_solar_cache,
+}
+
+
+def warmup_handler(event: dict) -> dict:
+    """
+    Run the warmup steps named in event['steps'] (default: all WARMUP_STEPS) and return how long each took.
+    event['addresses'] overrides WARMUP_ADDRESSES for the solar_cache step.
+
+    :return dictionary of the status, each step's duration in milliseconds and the total.
+    """
+
+    LOGGER.info(f'warmup_handler() called for given event: {event}')
+
+    steps: List[str] = event.get('steps') or list(WARMUP_STEPS)
+    timings, failed = {}, []
+    start = perf_counter()
+    for step in steps:
+        step_start = perf_counter()
+        try:
+            if step not in WARMUP_STEPS:
+                raise KeyError(f"Unknown warmup step '{step}'. Must be one of: {tuple(WARMUP_STEPS)}")
+            if step == 'solar_cache':
+                warm_solar_cache(addresses=event.get('addresses'))
+            else:
+                WARMUP_STEPS[step]()
+        except Exception as e:
+            failed.append(f'{step}: {e.__repr__()}')
+            LOGGER.error(e, exc_info=True)
+        timings[step] = round((perf_counter() - step_start) * 1000, 1)
+
+    LOGGER.info(f'Warmup steps took (ms): {timings}')
+    return {
+        'status': Status(
+            status_code=400 if failed else 200,
+            message=f"warmup_handler() called unsuccessfully for: {failed}" if failed
+            else "warmup_handler() called successfully."
+        ).dict(),
+        'warmup_ms': timings,
+        'total_ms': round((perf_counter() - start) * 1000, 1),
+    }
@@ -0,0 +1 @@
+../utils/results_codec.py
\ No newline at end of file
@@ -0,0 +1,86 @@
+function drawComparisonChart(containerId, chart) {
+    // Draw 2 overlying monthly bar-plots for comparison as an svg (the browser side of graphs.py)
+
+    const container = document.getElementById(containerId);
+    if (!container || !chart) {
+        return;
+    }
+    // Define colors based on graph type: [values1 color, values2 color]
+    const colorMap = {
+        energy: ["indianred", "gold"],
+        cost: ["red", "green"]
+    };
+    const colors = colorMap[chart.graph_type];
+    const prefix = chart.graph_type === "cost" ? "$" : "";
+    const months = [
+        "January", "February", "March", "April", "May", "June", "July",
+        "August", "September", "October", "November", "December"
+    ];
+    // Chart dimensions (viewBox units, the svg scales to its container)
+    const width = 640, height = 480;
+    const margin = {top: 40, right: 16, bottom: 90, left: 64};
+    const plotWidth = width - margin.left - margin.right;
+    const plotHeight = height - margin.top - margin.bottom;
+    const maxValue = Math.max(...chart.values1, ...chart.values2, 1);
+    const barWidth = plotWidth / months.length;
+    const y = value => margin.top + plotHeight - (Math.max(value, 0) / maxValue) * plotHeight;
+
+    const ns = "http://www.w3.org/2000/svg";
+    const element = (name, attributes, text) => {
+        const node = document.createElementNS(ns, name);
+        Object.entries(attributes).forEach(([key, value]) => node.setAttribute(key, value));
+        if (text !== undefined) {
+            node.textContent = text;
+        }
+        return node;
+    };
+
+    const svg = element("svg", {viewBox: `0 0 ${width} ${height}`, width: "100%", role: "img"});
+    svg.appendChild(element("title", {}, chart.title));
+    // Background and title
+    svg.appendChild(element("rect", {
+        x: margin.left, y: margin.top, width: plotWidth, height: plotHeight, fill: "lightseagreen"
+    }));
+    svg.appendChild(element("text", {
+        x: width / 2, y: margin.top - 14, "text-anchor": "middle", "font-weight": "bold", fill: "white"
+    }, chart.title));
+    // Bars with their values, the 2nd dataset drawn over the 1st at half opacity
+    [[chart.values1, colors[0], 1], [chart.values2, colors[1], 0.5]].forEach(([values, color, opacity]) => {
+        values.forEach((value, i) => {
+            const top = y(value);
+            svg.appendChild(element("rect", {
+                x: margin.left + i * barWidth, y: top, width: barWidth, height: margin.top + plotHeight - top,
+                fill: color, "fill-opacity": opacity, stroke: "white"
+            }));
+            svg.appendChild(element("text", {
+                x: margin.left + (i + 0.5) * barWidth, y: top + 14, "text-anchor": "middle", "font-size": 10
+            }, `${prefix}${value}`));
+        });
+    });
+    // Month (x) labels rotated by 45 degrees and the axis labels
+    months.forEach((month, i) => {
+        const x = margin.left + (i + 0.5) * barWidth, labelY = margin.top + plotHeight + 12;
+        svg.appendChild(element("text", {
+            x: x, y: labelY, "text-anchor": "end", "font-size": 11, fill: "white",
+            transform: `rotate(-45 ${x} ${labelY})`
+        }, month));
+    });
+    svg.appendChild(element("text", {
+        x: margin.left + plotWidth / 2, y: height - 8, "text-anchor": "middle", fill: "white"
+    }, "Month"));
+    svg.appendChild(element("text", {
+        x: 16, y: margin.top + plotHeight / 2, "text-anchor": "middle", fill: "white",
+        transform: `rotate(-90 16 ${margin.top + plotHeight / 2})`
+    }, chart.y_label));
+    // Legend
+    [[chart.label1, colors[0], 1], [chart.label2, colors[1], 0.5]].forEach(([label, color, opacity], i) => {
+        const legendY = margin.top + plotHeight - 44 + i * 20;
+        svg.appendChild(element("rect", {
+            x: margin.left + plotWidth / 2 - 90, y: legendY - 11, width: 14, height: 14, fill: color,
+            "fill-opacity": opacity
+        }));
+        svg.appendChild(element("text", {x: margin.left + plotWidth / 2 - 70, y: legendY}, label));
+    });
+
+    container.replaceChildren(svg);
+}
@@ -77,6 +77,8 @@ def run_tool():
     # Call main function to run the tool
     input_item = {
         "type": "form",
+        # The output page draws the graphs from the results' chart_data, so skip rendering them as pngs
+        "chart_mode": "client",
         "form": {
             "uid": uid,
             "name": username,
@@ -0,0 +1,12 @@
+# tests.conftest.py
+from pytest import fixture
+from backend.pvwatts_server import PVWattsServer
+
+
+@fixture
+def pvwatts_stand_in() -> PVWattsServer:
+    """Serve the local PVWatts stand-in on a free port for the duration of a test."""
+
+    server = PVWattsServer(port=0).start()
+    yield server
+    server.stop()
@@ -0,0 +1,99 @@
+# tests.test_batch.py
+from backend.batch import run_batch, load_checkpoint, DynamoBatchWriter, DYNAMODB_ITEMS_KEY
+from json import dumps as j_dumps, loads as j_loads
+
+
+def _pipeline(event: dict) -> dict:
+    """Stand-in for run_event(): fails the events without an address."""
+
+    if not event.get('address'):
+        raise ValueError('An address is required.')
+    return {'uid': event['uid'], 'status': {'status_code': 200, 'message': 'ok'}}
+
+
+def _pipeline_with_items(event: dict) -> dict:
+    """Stand-in for run_event() returning the event's results item to write to DynamoDB."""
+
+    return {'uid': event['uid'], 'status': {'status_code': 200, 'message': 'ok'}, DYNAMODB_ITEMS_KEY: [event]}
+
+
+class _StandInDynamoDB:
+    """Writes every batch_write_item request except the put of failing_uid, which is always left unprocessed."""
+
+    def __init__(self, failing_uid: str):
+        self.items = {}
+        self.failing_uid = failing_uid
+
+    def batch_write_item(self, RequestItems):
+        (table_name, requests), = RequestItems.items()
+        unprocessed = [request for request in requests if request['PutRequest']['Item']['uid'] == self.failing_uid]
+        for request in requests:
+            if request not in unprocessed:
+                self.items[request['PutRequest']['Item']['uid']] = request['PutRequest']['Item']
+        return {'UnprocessedItems': {table_name: unprocessed} if unprocessed else {}}
+
+
+def _write_events(path, count: int) -> None:
+    with open(path, 'w') as file:
+        for i in range(count):
+            file.write(j_dumps({'uid': f'uid{i}', 'address': '' if i == 3 else f'{i} Main Street'}) + '\n')
+
+
+def test_run_batch(tmp_path):
+    """
+    GIVEN A JSONL file of events, one of which fails
+    WHEN run_batch() is called on a process pool
+    THEN Every event is written to the results JSONL with its line number and the failure is isolated
+    """
+    in_path, out_path = tmp_path / 'events.jsonl', tmp_path / 'results.jsonl'
+    _write_events(in_path, count=10)
+
+    summary = run_batch(in_path=str(in_path), out_path=str(out_path), max_workers=2, pipeline=_pipeline)
+    assert (summary['processed'], summary['failed'], summary['skipped']) == (10, 1, 0)
+    results = {line['line']: line for line in map(j_loads, out_path.read_text().splitlines())}
+    assert sorted(results) == list(range(1, 11))
+    assert results[1]['uid'] == 'uid0'
+    assert results[4]['status']['status_code'] == 400
+
+
+def test_run_batch_resume(tmp_path):
+    """
+    GIVEN A results JSONL left by an interrupted run, ending in a partially written line
+    WHEN run_batch() is called again with the same files
+    THEN Only the missing events are processed and the results file holds each event exactly once
+    """
+    in_path, out_path = tmp_path / 'events.jsonl', tmp_path / 'results.jsonl'
+    _write_events(in_path, count=6)
+    run_batch(in_path=str(in_path), out_path=str(out_path), max_workers=2, pipeline=_pipeline)
+    lines = out_path.read_text().splitlines(keepends=True)
+    out_path.write_text(''.join(lines[:2]) + lines[2][:10])
+
+    assert len(load_checkpoint(out_path=str(out_path))) == 2
+    summary = run_batch(in_path=str(in_path), out_path=str(out_path), max_workers=2, pipeline=_pipeline)
+    assert (summary['processed'], summary['skipped']) == (4, 2)
+    assert sorted(j_loads(line)['line'] for line in out_path.read_text().splitlines()) == list(range(1, 7))
+
+
+def test_run_batch_checkpoints_written_items(tmp_path):
+    """
+    GIVEN A JSONL file of events whose results are written to DynamoDB, one of which cannot be written
+    WHEN run_batch() is called
+    THEN The items are batch written and only the lines whose items were written are checkpointed
+    """
+    in_path, out_path = tmp_path / 'events.jsonl', tmp_path / 'results.jsonl'
+    _write_events(in_path, count=30)
+    dynamodb = _StandInDynamoDB(failing_uid='uid7')
+    writer = DynamoBatchWriter(table_name='test', dynamodb=dynamodb, key_names=['uid'], flush_interval=0,
+                               max_retries=1, backoff=0)
+
+    summary = run_batch(in_path=str(in_path), out_path=str(out_path), max_workers=2, pipeline=_pipeline_with_items,
+                        writer=writer)
+    assert (summary['processed'], summary['failed']) == (30, 1)
+    assert len(dynamodb.items) == 29 and 'uid7' not in dynamodb.items
+    assert writer.batches < 30
+    assert load_checkpoint(out_path=str(out_path)) == set(range(1, 31)) - {8}
+    assert all(DYNAMODB_ITEMS_KEY not in j_loads(line) for line in out_path.read_text().splitlines())
+
+
+if __name__ == '__main__':
+    pass
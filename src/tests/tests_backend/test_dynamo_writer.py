@@ -0,0 +1,132 @@
+# tests.test_dynamo_writer.py
+from backend.dynamo_writer import DynamoBatchWriter, DynamoWriteError
+from botocore.exceptions import ClientError
+from pytest import raises as p_raises
+from threading import Lock
+from time import sleep
+
+
+class _StandInDynamoDB:
+    """Records batch_write_item calls, leaving the first unprocessed_calls batches' last request unprocessed."""
+
+    def __init__(self, unprocessed_calls: int = 0):
+        self.calls = []
+        self.items = {}
+        self.unprocessed_calls = unprocessed_calls
+        self._lock = Lock()
+
+    def batch_write_item(self, RequestItems):
+        (table_name, requests), = RequestItems.items()
+        with self._lock:
+            self.calls.append(len(requests))
+            unprocessed = requests[-1:] if self.unprocessed_calls else []
+            self.unprocessed_calls = max(self.unprocessed_calls - 1, 0)
+            for request in requests[:len(requests) - len(unprocessed)]:
+                if 'PutRequest' in request:
+                    self.items[request['PutRequest']['Item']['uid']] = request['PutRequest']['Item']
+                else:
+                    self.items.pop(request['DeleteRequest']['Key']['uid'], None)
+        return {'UnprocessedItems': {table_name: unprocessed} if unprocessed else {}}
+
+
+def test_dynamo_batch_writer():
+    """
+    GIVEN A DynamoBatchWriter used as a context manager
+    WHEN More items than fit in one batch are put and some deleted
+    THEN They are written in batches of up to 25 and the remainder is written on exit
+    """
+    dynamodb = _StandInDynamoDB()
+    with DynamoBatchWriter(table_name='test', dynamodb=dynamodb, flush_interval=None) as writer:
+        for i in range(60):
+            writer.put_item(item={'uid': f'uid{i}', 'mod_quantity': i})
+        assert dynamodb.calls == [25, 25]
+        writer.delete_item(key={'uid': 'uid0'})
+    assert dynamodb.calls == [25, 25, 11]
+    assert len(dynamodb.items) == 59 and 'uid0' not in dynamodb.items
+    assert writer.written == 61
+
+
+def test_dynamo_batch_writer_keys_and_retries():
+    """
+    GIVEN A DynamoBatchWriter with key names on a table that leaves items unprocessed
+    WHEN An item is put twice and the batch is written
+    THEN Only the last put for the key is sent and unprocessed items are retried until written
+    """
+    dynamodb = _StandInDynamoDB(unprocessed_calls=2)
+    with DynamoBatchWriter(table_name='test', dynamodb=dynamodb, key_names=['uid'], flush_interval=None,
+                           backoff=0.001) as writer:
+        writer.put_item(item={'uid': 'a', 'mod_quantity': 1})
+        writer.put_item(item={'uid': 'b', 'mod_quantity': 1})
+        writer.put_item(item={'uid': 'a', 'mod_quantity': 2})
+    assert dynamodb.calls == [2, 1, 1]
+    assert dynamodb.items['a']['mod_quantity'] == 2 and 'b' in dynamodb.items
+    assert writer.retries == 2
+
+    dynamodb = _StandInDynamoDB(unprocessed_calls=10)
+    writer = DynamoBatchWriter(table_name='test', dynamodb=dynamodb, flush_interval=None, max_retries=2, backoff=0)
+    writer.put_item(item={'uid': 'a'})
+    with p_raises(DynamoWriteError) as error:
+        writer.close()
+    assert error.value.requests == [{'PutRequest': {'Item': {'uid': 'a'}}}]
+
+
+def test_dynamo_batch_writer_client_error():
+    """
+    GIVEN A table whose batch_write_item calls are rejected by DynamoDB (e.g., throttled)
+    WHEN A full batch is put
+    THEN A DynamoWriteError carrying every request of the batch is raised
+    """
+    class _RejectingDynamoDB:
+        @staticmethod
+        def batch_write_item(RequestItems):
+            raise ClientError({'Error': {'Code': 'ProvisionedThroughputExceededException'}}, 'BatchWriteItem')
+
+    writer = DynamoBatchWriter(table_name='test', dynamodb=_RejectingDynamoDB(), flush_interval=None, batch_size=2)
+    writer.put_item(item={'uid': 'a'})
+    with p_raises(DynamoWriteError) as error:
+        writer.put_item(item={'uid': 'b'})
+    assert [request['PutRequest']['Item']['uid'] for request in error.value.requests] == ['a', 'b']
+
+
+def test_dynamo_batch_writer_flush_interval():
+    """
+    GIVEN A DynamoBatchWriter with a short flush interval
+    WHEN Fewer items than a batch are put
+    THEN The background thread writes them once they have waited the interval
+    """
+    dynamodb = _StandInDynamoDB()
+    writer = DynamoBatchWriter(table_name='test', dynamodb=dynamodb, flush_interval=0.05)
+    writer.put_item(item={'uid': 'a'})
+    writer.put_item(item={'uid': 'b'})
+    for _ in range(100):
+        if dynamodb.calls:
+            break
+        sleep(0.01)
+    assert dynamodb.calls == [2]
+    writer.close()
+    with p_raises(DynamoWriteError):
+        writer.put_item(item={'uid': 'c'})
+
+
+def test_dynamo_batch_writer_flush_error():
+    """
+    GIVEN A DynamoBatchWriter whose background flush of an item failed
+    WHEN The next item is put
+    THEN The error reports only the failed item and the new item is still written
+    """
+    dynamodb = _StandInDynamoDB(unprocessed_calls=1)
+    writer = DynamoBatchWriter(table_name='test', dynamodb=dynamodb, flush_interval=0.05, max_retries=0)
+    writer.put_item(item={'uid': 'a'})
+    for _ in range(100):
+        if writer._error is not None:  # The flush failed
+            break
+        sleep(0.01)
+    with p_raises(DynamoWriteError) as error:
+        writer.put_item(item={'uid': 'b'})
+    assert error.value.requests == [{'PutRequest': {'Item': {'uid': 'a'}}}]
+    writer.close()
+    assert list(dynamodb.items) == ['b']
+
+
+if __name__ == '__main__':
+    pass
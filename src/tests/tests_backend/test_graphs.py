@@ -0,0 +1,50 @@
+# tests.test_graphs.py
+from backend.graphs import render_comparison_graph, get_template, release_template
+from concurrent.futures import ThreadPoolExecutor
+import matplotlib.pyplot as plt
+
+
+_CONSUMPTION = [820, 780, 760, 740, 740, 710, 705, 715, 710, 702, 750, 780]
+_PRODUCTION = [600, 680, 820, 900, 980, 990, 1000, 990, 890, 790, 660, 610]
+
+
+def _render(graph_type: str = 'energy') -> bytes:
+    return render_comparison_graph(
+        title='Energy Consumption vs Potential Production', values1=_CONSUMPTION, values2=_PRODUCTION,
+        label1='Energy Consumption', label2='Potential Energy Production', y_label='kiloWattHours',
+        graph_type=graph_type
+    )
+
+
+def test_render_comparison_graph():
+    """
+    GIVEN 2 sets of monthly values
+    WHEN render_comparison_graph() is called repeatedly
+    THEN png bytes are returned, the thread's template is reused and cleared, and no pyplot figure is created
+    """
+    graph = _render()
+    assert graph.startswith(b'\x89PNG')
+    template = get_template()
+    for _ in range(5):
+        assert _render(graph_type='cost').startswith(b'\x89PNG')
+    assert get_template() is template
+    assert not template.ax.patches and not template.ax.texts
+    assert plt.get_fignums() == []
+    release_template()
+    assert get_template() is not template
+
+
+def test_render_comparison_graph_threads():
+    """
+    GIVEN Several threads rendering at once
+    WHEN render_comparison_graph() is called from each
+    THEN Each thread renders on its own template and every graph matches the single threaded render
+    """
+    expected = _render()
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        graphs = list(executor.map(lambda _: _render(), range(16)))
+    assert all(graph == expected for graph in graphs)
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,83 @@
+# tests.test_hourly.py
+from backend import hourly
+from backend.hourly import get_hourly_profile, monthly_totals, self_consumption_monthly, HOURS_PER_YEAR
+from backend.pvwatts_server import synthetic_response
+from os import listdir, utime
+from time import time
+import numpy as np
+
+
+_ADDRESS = '3940 State Street, 93105'
+
+
+def test_monthly_totals():
+    """
+    GIVEN An hourly series of 1 kWh every hour and a stack of 2 such series
+    WHEN monthly_totals() is called on them
+    THEN The totals equal 24 kWh times the days in each month, per series
+    """
+    days = [31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
+    ones = np.ones(HOURS_PER_YEAR, dtype=np.float32)
+
+    assert monthly_totals(ones).tolist() == [24 * d for d in days]
+    assert monthly_totals(np.stack([ones, ones * 2])).shape == (2, 12)
+    assert self_consumption_monthly(ones * 2, ones).tolist() == [24 * d for d in days]
+
+
+def test_get_hourly_profile(tmp_path, monkeypatch):
+    """
+    GIVEN A PVWatts api serving hourly output
+    WHEN get_hourly_profile() is called twice for the same address
+    THEN A float32 kWh profile matching the monthly output is returned and the 2nd call is served from disk
+    """
+    requests = []
+
+    def _fake_get_iridescence_obj(params: dict, nrel_token=None, use_cache=True) -> dict:
+        requests.append(params)
+        return synthetic_response(params)
+
+    monkeypatch.setattr(hourly, 'HOURLY_CACHE_DIR', str(tmp_path))
+    monkeypatch.setattr(hourly, '_get_iridescence_obj', _fake_get_iridescence_obj)
+
+    profile = get_hourly_profile(address=_ADDRESS)
+    assert profile.dtype == np.float32 and profile.shape == (HOURS_PER_YEAR,)
+    expected = synthetic_response(requests[0])['outputs']['ac_monthly']
+    assert np.allclose(monthly_totals(profile), expected, rtol=1e-4)
+
+    assert isinstance(get_hourly_profile(address=_ADDRESS), np.memmap)
+    assert len(requests) == 1
+
+
+def test_get_hourly_profile_eviction(tmp_path, monkeypatch):
+    """
+    GIVEN An hourly profile cache holding at most 2 profiles
+    WHEN Profiles for 3 addresses are requested (the 1st used again before the 3rd) and the 1st then expires
+    THEN The least recently used profile is evicted and the expired one is requested again
+    """
+    requests = []
+
+    def _fake_get_iridescence_obj(params: dict, nrel_token=None, use_cache=True) -> dict:
+        requests.append(params['address'])
+        return synthetic_response(params)
+
+    monkeypatch.setattr(hourly, 'HOURLY_CACHE_DIR', str(tmp_path))
+    monkeypatch.setattr(hourly, 'HOURLY_CACHE_MAX_ENTRIES', 2)
+    monkeypatch.setattr(hourly, '_get_iridescence_obj', _fake_get_iridescence_obj)
+
+    get_hourly_profile(address='1 Main Street, 93105')
+    (first_file,) = listdir(tmp_path)
+    # Written an hour ago, then used again after the 2nd profile
+    utime(tmp_path / first_file, (time() - 3600, time() - 3600))
+    get_hourly_profile(address='2 Main Street, 93105')
+    get_hourly_profile(address='1 Main Street, 93105')
+    get_hourly_profile(address='3 Main Street, 93105')
+    assert len(listdir(tmp_path)) == 2 and first_file in listdir(tmp_path)
+    get_hourly_profile(address='1 Main Street, 93105')
+    assert requests == ['1 Main Street, 93105', '2 Main Street, 93105', '3 Main Street, 93105']
+
+    monkeypatch.setattr(hourly, 'HOURLY_CACHE_TTL', 1800)
+    get_hourly_profile(address='1 Main Street, 93105')
+    assert requests[-1] == '1 Main Street, 93105' and len(requests) == 4
+
+if __name__ == '__main__':
+    pass
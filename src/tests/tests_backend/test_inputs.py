@@ -1,9 +1,12 @@
 # tests.test_inputs.py
 from pytest import raises as p_raises
+from csv import DictReader, DictWriter
 from utils import import_json, SAMPLES
-from backend import input_csv, input_xlsx, input_sheets, \
-    get_inputs, InputData, InputError
-from backend.inputs import _validate_mod_kwh, _calculate_cost_per_kwh
+from utils import InputData
+from backend import inputs as inputs_module
+from backend.inputs import input_csv, input_xlsx, input_sheets, get_inputs, InputError, _validate_mod_kwh, \
+    _calculate_cost_per_kwh, input_csv_bulk, input_xlsx_bulk, input_sheets_bulk
+from backend.sheets_client import SheetsClient, StandInSheetsTransport, stand_in_sheet
 
 
 _INPUT_VALID = import_json(SAMPLES['input_valid'])
@@ -19,9 +22,9 @@ def test_validate():
     THEN The appropriate exception should be thrown
     """
     with p_raises(FileNotFoundError):
-        input_csv(file_path=r'./fail/fail.csv')
+        input_csv(file_path=r'./fail/fail.csv', time_stamp='test')
     with p_raises(ValueError):
-        input_csv(file_path=SAMPLES['csv_invalid'])
+        input_csv(file_path=SAMPLES['csv_invalid'], time_stamp='test')
 
 
 def test__validate_mod_kwh():
@@ -66,7 +69,7 @@ def test_input_csv():
     WHEN The input_csv() function is called
     THEN input_csv() returns a InputData object with valid values
     """
-    test_output = input_csv(file_path=SAMPLES['csv_valid'])
+    test_output = input_csv(file_path=SAMPLES['csv_valid'], time_stamp='test')
     # Assert the correct object is returned. This validates data types/structures.
     assert isinstance(test_output, InputData)
     # Assert valid values are reported/calculated
@@ -77,13 +80,58 @@ def test_input_csv():
     assert test_output.cost_per_kwh == _INPUT_VALID['cost_per_kwh']
 
 
+def test_input_csv_bulk():
+    """
+    GIVEN A bulk csv with two valid customers and one invalid customer
+    WHEN input_csv_bulk() is iterated with and without an errors list
+    THEN Valid customers are yielded lazily as InputData objects and the invalid row is reported or raised
+    """
+    errors = []
+    customers = input_csv_bulk(file_path=SAMPLES['csv_bulk'], time_stamp='test', errors=errors)
+    # Nothing is read until the generator is iterated
+    assert not errors
+    customers = list(customers)
+    assert [customer.name for customer in customers] == ['Ryan', 'JaneDoe']
+    assert customers[0].uid.startswith('Ryantest')
+    assert customers[0].consumption_monthly == _INPUT_VALID['consumption_monthly']
+    assert customers[0].cost_monthly == _INPUT_VALID['cost_monthly']
+    assert customers[0].cost_per_kwh == _INPUT_VALID['cost_per_kwh']
+    assert len(errors) == 1 and errors[0]['row'] == 4 and errors[0]['name'] == 'Invalid'
+    with p_raises(ValueError):
+        list(input_csv_bulk(file_path=SAMPLES['csv_bulk'], time_stamp='test'))
+
+
+def test_input_csv_bulk_row_errors_and_uids(tmp_path):
+    """
+    GIVEN A bulk csv with customers of the same name, one with a 0 kWh month and one missing a value
+    WHEN input_csv_bulk() is iterated with an errors list
+    THEN Both invalid rows are reported instead of ending the stream and same name customers get distinct uids
+    """
+    with open(SAMPLES['csv_bulk'], 'r', newline='') as file:
+        csv = DictReader(file)
+        fieldnames, row = csv.fieldnames, next(csv)
+    path = tmp_path / 'bulk.csv'
+    with open(path, 'w', newline='') as file:
+        writer = DictWriter(file, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows([row, {**row, 'March kWh': '0'}, row, {**row, 'May $': ''}])
+
+    errors = []
+    customers = list(input_csv_bulk(file_path=str(path), time_stamp='test', errors=errors))
+    assert len(customers) == 2 and customers[0].uid != customers[1].uid
+    assert [error['row'] for error in errors] == [3, 5]
+    # uids only depend on the time_stamp and row, so rereading the csv gives the same ones
+    assert [customer.uid for customer in input_csv_bulk(file_path=str(path), time_stamp='test', errors=[])] == \
+        [customer.uid for customer in customers]
+
+
 def test_input_xlsx():
     """
     GIVEN A valid relative path to valid a .xlsx file
     WHEN The input_xlsx() function is called
     THEN input_xlsx() returns a InputData object with valid values
     """
-    test_output = input_xlsx(file_path=SAMPLES['xlsx_valid'])
+    test_output = input_xlsx(file_path=SAMPLES['xlsx_valid'], time_stamp='test')
     # Assert the correct object is returned. This validates data types/structures.
     assert isinstance(test_output, InputData)
     # Assert valid values are reported/calculated
@@ -94,13 +142,46 @@ def test_input_xlsx():
     assert test_output.cost_per_kwh == _INPUT_VALID['cost_per_kwh']
 
 
-def test_input_sheets():
+def test_input_xlsx_bulk():
     """
-    GIVEN A valid relative path to valid a .sheet file
+    GIVEN A bulk xlsx with customer sheets (one holding an invalid customer and a blank row) and a notes sheet
+    WHEN input_xlsx_bulk() is iterated with and without an errors list
+    THEN Valid customers are yielded in workbook order and invalid rows and sheets are reported or raised
+    """
+    errors = []
+    customers = list(input_xlsx_bulk(file_path=SAMPLES['xlsx_bulk'], time_stamp='test', errors=errors))
+    assert [customer.name for customer in customers] == ['Ryan', 'JaneDoe', 'RyanTwo']
+    assert customers[0].consumption_monthly == _INPUT_VALID['consumption_monthly']
+    assert customers[0].cost_per_kwh == _INPUT_VALID['cost_per_kwh']
+    assert [(error['sheet'], error['row']) for error in errors] == [('Commercial', 3), ('Notes', 1)]
+    # Only the sheets asked for are read
+    residential = input_xlsx_bulk(file_path=SAMPLES['xlsx_bulk'], time_stamp='test', sheet_names=['Residential'])
+    assert len(list(residential)) == 2
+    with p_raises(ValueError):
+        list(input_xlsx_bulk(file_path=SAMPLES['xlsx_bulk'], time_stamp='test'))
+
+
+def _stand_in_client() -> SheetsClient:
+    """Sheets client serving the valid input sample as the sheet 'valid' (and with mod_kwh 1.8 as 'invalid')."""
+
+    sheets = {
+        sheet_id: stand_in_sheet(
+            name='Ryan', address='3940 State Street, 93105', mod_kwh=value,
+            consumption=_INPUT_VALID['consumption_monthly'], cost=_INPUT_VALID['cost_monthly']
+        )
+        for sheet_id, value in (('valid', 0.4), ('invalid', 1.8))
+    }
+    return SheetsClient(transport=StandInSheetsTransport(sheets=sheets))
+
+
+def test_input_sheets(monkeypatch):
+    """
+    GIVEN A Google Sheet (served by a stand-in Sheets transport) with valid input data
     WHEN The input_sheets() function is called
     THEN input_sheets() returns a InputData object with valid values
     """
-    test_output = input_sheets(sheet_id=SAMPLES['sheet'])
+    monkeypatch.setattr(inputs_module, 'get_sheets_client', _stand_in_client)
+    test_output = input_sheets(sheet_id='valid', time_stamp='test')
     # Assert the correct object is returned. This validates data types/structures.
     assert isinstance(test_output, InputData)
     # Assert valid values are reported/calculated
@@ -111,19 +192,37 @@ def test_input_sheets():
     assert test_output.cost_per_kwh == _INPUT_VALID['cost_per_kwh']
 
 
-def test_input_handler():
+def test_input_sheets_bulk():
     """
-    GIVEN A correct keyword argument and input source for input_handler().
-    WHEN The handler function is executed with correct inputs.
-    THEN Calls the correct corresponding function and returns a InputData object
+    GIVEN A stand-in Sheets transport with a valid and an invalid customer sheet
+    WHEN input_sheets_bulk() is iterated for those sheets and one that does not exist
+    THEN The valid customer is yielded as InputData and the others are reported or raised
     """
+    client = _stand_in_client()
+    errors = []
+    customers = list(input_sheets_bulk(
+        sheet_ids=['valid', 'invalid', 'missing'], time_stamp='test', errors=errors, client=client
+    ))
+    assert len(customers) == 1 and customers[0].uid.startswith('Ryantest')
+    assert customers[0].cost_per_kwh == _INPUT_VALID['cost_per_kwh']
+    assert sorted(error['sheet_id'] for error in errors) == ['invalid', 'missing']
+    with p_raises(ValueError):
+        list(input_sheets_bulk(sheet_ids=['invalid'], time_stamp='test', client=client))
+
+
+def test_get_inputs(monkeypatch):
+    """
+    GIVEN Input events of each type and one of an invalid type
+    WHEN get_inputs() is called with them
+    THEN Calls the correct corresponding function and returns a InputData object, or raises an InputError
+    """
+    monkeypatch.setattr(inputs_module, 'get_sheets_client', _stand_in_client)
     # Assert that when passed valid inputs, the handler returns a InputData object
-    assert isinstance(get_inputs(input_type='csv', input_source=SAMPLES['csv_valid']), InputData)
-    assert isinstance(get_inputs(input_type='xlsx', input_source=SAMPLES['xlsx_valid']), InputData)
-    assert isinstance(get_inputs(input_type='sheet', input_source=SAMPLES['sheet']), InputData)
+    assert isinstance(get_inputs(input_event={'type': 'csv', 'csv_source': SAMPLES['csv_valid']}), InputData)
+    assert isinstance(get_inputs(input_event={'type': 'xlsx', 'xlsx_source': SAMPLES['xlsx_valid']}), InputData)
+    assert isinstance(get_inputs(input_event={'type': 'sheet', 'sheet_id': 'valid'}), InputData)
     # Assert that the accepted input types are recognized
-    assert ['csv', 'xlsx', 'sheet'] == InputError.valid_input_types
+    assert ['csv', 'xlsx', 'sheet', 'form'] == InputError.valid_input_types
     # Assert that InputError is passed when an invalid kw arg for input_type is passed.
     with p_raises(InputError):
-        get_inputs(input_type='fail', input_source=SAMPLES['csv_valid'])
-
+        get_inputs(input_event={'type': 'fail', 'csv_source': SAMPLES['csv_valid']})
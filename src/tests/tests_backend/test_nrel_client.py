@@ -0,0 +1,70 @@
+# tests.test_nrel_client.py
+from pytest import raises as p_raises
+from backend.nrel_client import NRELClient, NRELError
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from threading import Thread
+
+
+_OK_BODY = b'{"outputs": {"ac_annual": 1564.8, "ac_monthly": [130.4, 130.4, 130.4, 130.4, 130.4, 130.4, ' \
+           b'130.4, 130.4, 130.4, 130.4, 130.4, 130.4]}, "errors": []}'
+
+
+def _serve(responses: list) -> HTTPServer:
+    """Serve the (status, body) responses passed in order, one per request, on a free local port."""
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            status, body = responses.pop(0)
+            self.send_response(status)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(('127.0.0.1', 0), _Handler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_nrel_client_retries():
+    """
+    GIVEN An api that responds with a 503 and then invalid json before a valid response
+    WHEN NRELClient.get() is called
+    THEN The client retries both failures, returns the valid response and records 3 calls
+    """
+    server = _serve([(503, b'{}'), (200, b'{"outputs": '), (200, _OK_BODY)])
+    client = NRELClient(url=f'http://127.0.0.1:{server.server_port}/', backoff=0)
+
+    assert client.get(params={'address': 'test'}, api_key='test').get('outputs').get('ac_annual') == 1564.8
+    metrics = client.metrics()
+    assert (metrics['calls'], metrics['retries'], metrics['failures']) == (3, 2, 0)
+    assert 'p99_ms' in metrics
+    client.close()
+    server.shutdown()
+    server.server_close()
+
+
+def test_nrel_client_errors():
+    """
+    GIVEN An api that rejects the request (422) or keeps failing (500)
+    WHEN NRELClient.get() is called
+    THEN An NRELError is raised without retrying the 422 and after max_retries for the 500s
+    """
+    server = _serve([(422, b'{"errors": ["bad address"]}')] + [(500, b'{}')] * 3)
+    client = NRELClient(url=f'http://127.0.0.1:{server.server_port}/', backoff=0, max_retries=2)
+
+    with p_raises(NRELError):
+        client.get(params={'address': 'test'}, api_key='test')
+    assert client.calls == 1
+    with p_raises(NRELError):
+        client.get(params={'address': 'test'}, api_key='test')
+    assert client.calls == 4
+    client.close()
+    server.shutdown()
+    server.server_close()
+
+
+if __name__ == '__main__':
+    pass
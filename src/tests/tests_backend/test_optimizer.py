@@ -0,0 +1,57 @@
+# tests.test_optimizer.py
+from backend import optimizer
+from backend.optimizer import optimize_capacity, annual_savings, OptimizerError
+from backend.solar_cache import SolarCache
+from backend.solar_potential import _get_params
+from pytest import raises as p_raises
+import numpy as np
+
+
+_NORMAL_MONTHLY = [100.0] * 6 + [200.0] * 6
+_INPUT_DATA = {
+    'uid': 'test',
+    'address': '3940 State Street, 93105',
+    'mod_kwh': 0.5,
+    'consumption_monthly': [600] * 12,
+    'cost_per_kwh': 0.2,
+}
+
+
+def test_annual_savings():
+    """
+    GIVEN A normalized profile, monthly consumption and a cost per kWh
+    WHEN annual_savings() is called for several capacities with and without a surplus rate
+    THEN Production above each month's consumption is only worth the surplus rate
+    """
+    savings = annual_savings(np.array([0, 3, 6]), _NORMAL_MONTHLY, [600] * 12, cost_per_kwh=0.2)
+    assert savings.tolist() == [0, (300 * 6 + 600 * 6) * 0.2, 600 * 12 * 0.2]
+    with_surplus = annual_savings(np.array([6]), _NORMAL_MONTHLY, [600] * 12, cost_per_kwh=0.2, surplus_rate=0.05)
+    assert with_surplus.tolist() == [600 * 12 * 0.2 + 600 * 6 * 0.05]
+
+
+def test_optimize_capacity(monkeypatch, tmp_path):
+    """
+    GIVEN Bill data and a module price
+    WHEN optimize_capacity() is called
+    THEN The capacity with the greatest net savings is chosen from the cached profile with no extra api call
+    """
+    cache = SolarCache(path=str(tmp_path / 'cache.sqlite3'))
+    monkeypatch.setattr(optimizer, 'get_solar_cache', lambda: cache)
+    # Nothing cached for the address yet, and the api is never requested
+    with p_raises(OptimizerError):
+        optimize_capacity(input_data=_INPUT_DATA, mod_price=1000)
+    cache.set(params=_get_params(capacity=1, address=_INPUT_DATA['address']),
+              response={'outputs': {'ac_monthly': _NORMAL_MONTHLY}})
+    # Months with 100 kWh/kW are fully offset at 6 kW, months with 200 kWh/kW at 3 kW. With no surplus value,
+    # capacity past 3 kW only pays in 6 of 12 months: 0.5 kW earns 0.2 * 50 * 6 * 25 = $1500 over 25 years.
+    assert optimize_capacity(input_data=_INPUT_DATA, mod_price=1000)['capacity_kw'] == 6
+    assert optimize_capacity(input_data=_INPUT_DATA, mod_price=2000)['capacity_kw'] == 3
+    # A very high price means no array is worth installing
+    assert optimize_capacity(input_data=_INPUT_DATA, mod_price=100000, normal_monthly=_NORMAL_MONTHLY) == {
+        'capacity_kw': 0, 'mod_quantity': 0, 'annual_savings': 0, 'net_savings': 0, 'payback_years': None,
+        'full_offset_kw': 4.0
+    }
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,62 @@
+# tests.test_pvwatts_server.py
+from backend.pvwatts_server import PVWattsServer, synthetic_response
+from backend.nrel_client import NRELClient
+from backend.cassette import Cassette
+from tempfile import TemporaryDirectory
+
+
+_PARAMS = {
+    "system_capacity": "1",
+    "azimuth": "180",
+    "tilt": "40",
+    "array_type": "1",
+    "module_type": "1",
+    "losses": "10",
+    "address": "3940 State Street, 93105"
+}
+
+
+def test_synthetic_response():
+    """
+    GIVEN PVWatts params for 1 kW and 5 kW at the same address
+    WHEN synthetic_response() is called for each
+    THEN A PVWatts shaped response is returned whose output is linear in capacity
+    """
+    normal = synthetic_response(_PARAMS)
+    actual = synthetic_response(dict(_PARAMS, system_capacity='5'))
+
+    assert len(normal) == 7
+    assert len(normal['outputs']['ac_monthly']) == 12
+    assert round(actual['outputs']['ac_annual'], 6) == round(normal['outputs']['ac_annual'] * 5, 6)
+
+
+def test_pvwatts_stand_in(pvwatts_stand_in):
+    """
+    GIVEN The local PVWatts stand-in
+    WHEN The NRELClient requests it
+    THEN The synthetic response is returned
+    """
+    client = NRELClient(url=pvwatts_stand_in.url)
+    assert client.get(params=_PARAMS, api_key='test') == synthetic_response(_PARAMS)
+    client.close()
+
+
+def test_pvwatts_stand_in_errors():
+    """
+    GIVEN A stand-in injecting errors and a cassette recorded for the params
+    WHEN The NRELClient requests it
+    THEN The client retries through the injected errors and receives the recorded response
+    """
+    with TemporaryDirectory() as tmp_dir:
+        Cassette(mode='record', path=tmp_dir).record(params=_PARAMS, response={'outputs': {'ac_annual': 1}})
+        server = PVWattsServer(port=0, error_rate=0.3, bad_json_rate=0.3, cassette_dir=tmp_dir, seed=2).start()
+        client = NRELClient(url=server.url, backoff=0, max_retries=10)
+
+        assert client.get(params=_PARAMS, api_key='test') == {'outputs': {'ac_annual': 1}}
+        assert client.retries == server.requests - 1
+        client.close()
+        server.stop()
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,43 @@
+# tests.test_rate_limiter.py
+from pytest import raises as p_raises
+from backend.rate_limiter import RateLimiter, RateLimitError
+from os.path import join as os_join
+from tempfile import TemporaryDirectory
+
+
+def test_rate_limiter_rotation():
+    """
+    GIVEN A RateLimiter with 2 api keys and a quota of 3 requests per hour each
+    WHEN Tokens are acquired until the quota is used up
+    THEN Requests rotate across both keys and a RateLimitError is raised once every bucket is empty
+    """
+    with TemporaryDirectory() as tmp_dir:
+        limiter = RateLimiter(api_keys=['key1', 'key2'], rate_per_hour=3, path=os_join(tmp_dir, 'limit.sqlite3'))
+        granted = [limiter.acquire(timeout=0) for _ in range(6)]
+        assert granted.count('key1') == 3 and granted.count('key2') == 3
+        with p_raises(RateLimitError):
+            limiter.acquire(timeout=0)
+        assert sorted(usage['granted'] for usage in limiter.usage().values()) == [3, 3]
+
+
+def test_rate_limiter_shared():
+    """
+    GIVEN 2 RateLimiter instances (e.g., 2 worker processes) sharing the same file
+    WHEN One instance uses up a key's quota or a key is exhausted
+    THEN The other instance sees the same buckets
+    """
+    with TemporaryDirectory() as tmp_dir:
+        path = os_join(tmp_dir, 'limit.sqlite3')
+        worker1 = RateLimiter(api_keys=['key1', 'key2'], rate_per_hour=2, path=path)
+        worker2 = RateLimiter(api_keys=['key1', 'key2'], rate_per_hour=2, path=path)
+        worker1.acquire(api_key='key1', timeout=0)
+        worker1.acquire(api_key='key1', timeout=0)
+        with p_raises(RateLimitError):
+            worker2.acquire(api_key='key1', timeout=0)
+        worker2.exhaust(api_key='key2')
+        with p_raises(RateLimitError):
+            worker1.acquire(timeout=0)
+
+
+if __name__ == '__main__':
+    pass
@@ -1,9 +1,13 @@
 # tests.test_results.py
 from utils import import_json, SAMPLES
-from backend import get_inputs, get_solar_potential, get_data_df, create_comparison_graph, create_out_csv, \
-    get_results, Results
-from backend.results import _average
+from backend.inputs import get_inputs
+from backend import results as results_module
+from backend.results import _average, create_artifacts, get_chart_data, get_results_table, get_data_df, \
+    create_comparison_graph, DEPRECATED_create_out_csv, get_results, Results
 from pandas import DataFrame
+from collections import OrderedDict
+from botocore.exceptions import ClientError
+from datetime import datetime, timezone
 from os.path import isfile, join as os_join
 from tempfile import TemporaryDirectory
 
@@ -12,13 +16,25 @@ _INPUT_INVALID = import_json(SAMPLES['input_invalid_value'])
 _SOLAR_POTENTIAL_VALID = import_json(SAMPLES['solar_potential_valid'])
 _RESULT_VALID = import_json(SAMPLES['results_valid'])
 
-_MODEL_INPUT = get_inputs(input_type='csv', input_source=SAMPLES['csv_valid'])
-_MODEL_SOLAR = get_solar_potential(address=_INPUT_VALID['address'], annual_consumption=_INPUT_VALID['consumption_annual'])
+_MODEL_INPUT = get_inputs(input_event={'type': 'csv', 'csv_source': SAMPLES['csv_valid']})
+# The results sample predates production_value: the value of the potential production at the customer's cost/kWh
+_PRODUCTION_VALUE = [
+    round(kwh * _MODEL_INPUT.cost_per_kwh, 2) for kwh in _SOLAR_POTENTIAL_VALID['solar_potential_monthly']
+]
 
 _TEST_DF = get_data_df(
     input_data=_MODEL_INPUT,
     solar_potential_monthly=_SOLAR_POTENTIAL_VALID['solar_potential_monthly'],
     potential_cost_monthly=_RESULT_VALID['potential_cost_monthly'],
+    potential_value=_PRODUCTION_VALUE,
+    savings_monthly=_RESULT_VALID['savings_monthly'],
+    cost_reduction_monthly=_RESULT_VALID['cost_reduction_monthly']
+)
+_TEST_TABLE = get_results_table(
+    input_data=_MODEL_INPUT,
+    solar_potential_monthly=_SOLAR_POTENTIAL_VALID['solar_potential_monthly'],
+    potential_cost_monthly=_RESULT_VALID['potential_cost_monthly'],
+    potential_value=_PRODUCTION_VALUE,
     savings_monthly=_RESULT_VALID['savings_monthly'],
     cost_reduction_monthly=_RESULT_VALID['cost_reduction_monthly']
 )
@@ -48,43 +64,167 @@ def test_get_data_df():
     assert _TEST_DF.loc[12, 'Cost Reduction %'] == _average(_RESULT_VALID['cost_reduction_monthly'])
 
 
-def test_create_comparison_graph():
+def test_create_comparison_graph(monkeypatch):
     """
-    GIVEN The appropriate inputs to create a comparison graph
+    GIVEN The appropriate inputs to create a comparison graph and an s3 stand-in that records its uploads
     WHEN The create_comparison_graph() is called given valid inputs
-    THEN A comparison graph is created at designated location and saved as a .png file
+    THEN A png comparison graph is uploaded to its bucket and its url is returned
     """
-    # Create a temp dir and write a temp output graph to that dir, assert that the temp file is created
-    with TemporaryDirectory() as tmp_dir:
-        tmp_file_path = os_join(tmp_dir, 'TEST.png')
-        create_comparison_graph(
-            title='TEST',
-            df1=_TEST_DF['Consumption kWh'],
-            df2=_TEST_DF['Potential kWh'],
-            label1='test',
-            label2='test',
-            y_label='test',
-            out_path=tmp_file_path,
-            graph_type='energy'
-        )
-        assert isfile(tmp_file_path)
+    s3 = _StandInS3()
+    monkeypatch.setattr(results_module, 'S3', s3)
+    monkeypatch.setattr(results_module, '_KNOWN_ARTIFACTS', OrderedDict())
+    url = create_comparison_graph(
+        title='TEST',
+        df1=_TEST_TABLE['Consumption kWh'],
+        df2=_TEST_TABLE['Potential kWh'],
+        label1='test',
+        label2='test',
+        y_label='test',
+        graph_type='energy',
+        uid='test'
+    )
+
+    assert url.startswith('https://sc-outputs-graph-energy.s3.us-west-1.amazonaws.com/')
+    (bucket, _), body = s3.objects.popitem()
+    assert bucket == 'sc-outputs-graph-energy' and body.startswith(b'\x89PNG') and not s3.objects
+
+
+class _StandInDynamoDB:
+    """Records the items put to its tables like the boto3 DynamoDB resource."""
+
+    def __init__(self):
+        self.items = {}
+
+    def Table(self, table_name):
+        class _Table:
+            @staticmethod
+            def put_item(Item):
+                self.items[(table_name, Item['uid'])] = Item
+                return {'ResponseMetadata': {'HTTPStatusCode': 200}}
+        return _Table()
+
+
+class _StandInS3:
+    """Records the objects put to its buckets and answers existence checks like the boto3 s3 resource."""
+
+    def __init__(self):
+        self.objects = {}
+
+    def Bucket(self, bucket_name):
+        class _Bucket:
+            @staticmethod
+            def put_object(Body, Key, **kwargs):
+                self.objects[(bucket_name, Key)] = Body
+        return _Bucket()
+
+    def Object(self, bucket_name, obj_key):
+        class _Object:
+            @property
+            def last_modified(_):
+                if (bucket_name, obj_key) not in self.objects:
+                    raise ClientError({'Error': {'Code': '404'}}, 'HeadObject')
+                return datetime.now(timezone.utc)
+        return _Object()
+
+
+def test_create_artifacts(monkeypatch):
+    """
+    GIVEN A results DataFrame and an s3 stand-in that records its uploads
+    WHEN create_artifacts() is called
+    THEN The data csv and both rendered graphs are uploaded and their urls are returned
+    """
+    s3 = _StandInS3()
+    monkeypatch.setattr(results_module, 'S3', s3)
+    monkeypatch.setattr(results_module, '_KNOWN_ARTIFACTS', OrderedDict())
+    urls = create_artifacts(
+        results_table=_TEST_TABLE, uid='test:uid',
+        chart_data=get_chart_data(results_table=_TEST_TABLE, energy_units='kWh')
+    )
+
+    assert urls['url_data_csv'].startswith('https://sc-outputs-csv.s3.us-west-1.amazonaws.com/')
+    assert urls['url_graph_cost'].startswith('https://sc-outputs-graph-cost.s3.us-west-1.amazonaws.com/')
+    assert urls['url_graph_energy'].startswith('https://sc-outputs-graph-energy.s3.us-west-1.amazonaws.com/')
+    assert sorted(bucket for bucket, _ in s3.objects) == ['sc-outputs-csv', 'sc-outputs-graph-cost',
+                                                          'sc-outputs-graph-energy']
+    # Both graphs are uploaded as rendered png bytes
+    assert all(body.startswith(b'\x89PNG') for (bucket, _), body in s3.objects.items() if bucket != 'sc-outputs-csv')
+
+
+def _fail_render(graph):
+    raise AssertionError(f'The {graph["graph_type"]} graph was rendered again')
+
+
+def test_create_artifacts_dedupe(monkeypatch):
+    """
+    GIVEN Artifacts that were already created for the same results
+    WHEN create_artifacts() is called again for another uid
+    THEN Nothing is rendered or uploaded and the urls point at the shared objects
+    """
+    s3 = _StandInS3()
+    monkeypatch.setattr(results_module, 'S3', s3)
+    monkeypatch.setattr(results_module, '_KNOWN_ARTIFACTS', OrderedDict())
+    chart_data = get_chart_data(results_table=_TEST_TABLE, energy_units='kWh')
+    first = create_artifacts(results_table=_TEST_TABLE, uid='first', chart_data=chart_data)
+    # Forget what this process uploaded so the second call asks s3
+    monkeypatch.setattr(results_module, '_KNOWN_ARTIFACTS', OrderedDict())
+    monkeypatch.setattr(results_module, '_render_graph', _fail_render)
+
+    assert create_artifacts(results_table=_TEST_TABLE, uid='second', chart_data=chart_data) == first
+    assert len(s3.objects) == 3
+
+
+def test_known_artifacts_bounded(monkeypatch):
+    """
+    GIVEN More artifacts than KNOWN_ARTIFACTS_MAX, one of which is looked up again
+    WHEN They are remembered one after another
+    THEN Only the KNOWN_ARTIFACTS_MAX most recently used are kept
+    """
+    s3 = _StandInS3()
+    monkeypatch.setattr(results_module, 'S3', s3)
+    monkeypatch.setattr(results_module, '_KNOWN_ARTIFACTS', OrderedDict())
+    monkeypatch.setattr(results_module, 'KNOWN_ARTIFACTS_MAX', 3)
+    for key in ('a', 'b', 'c'):
+        results_module._put_artifact(bucket_name='bucket', obj_key=key, Body=b'')
+    assert results_module.s3_obj_exists(bucket_name='bucket', obj_key='a')  # Now the most recently used
+    results_module._put_artifact(bucket_name='bucket', obj_key='d', Body=b'')
+
+    assert list(results_module._KNOWN_ARTIFACTS) == [('bucket', 'c'), ('bucket', 'a'), ('bucket', 'd')]
+
+
+def test_create_artifacts_client_charts(monkeypatch):
+    """
+    GIVEN A results DataFrame whose graphs are drawn by the browser
+    WHEN create_artifacts() is called with render_graphs=False
+    THEN Only the data csv is uploaded and no graph urls are returned
+    """
+    s3 = _StandInS3()
+    monkeypatch.setattr(results_module, 'S3', s3)
+    monkeypatch.setattr(results_module, '_KNOWN_ARTIFACTS', OrderedDict())
+    chart_data = get_chart_data(results_table=_TEST_TABLE, energy_units='kWh')
+    urls = create_artifacts(results_table=_TEST_TABLE, uid='test', chart_data=chart_data, render_graphs=False)
+
+    assert [bucket for bucket, _ in s3.objects] == ['sc-outputs-csv']
+    assert urls['url_graph_cost'] is None and urls['url_graph_energy'] is None
+    # The chart data holds the 12 monthly values of each dataset
+    assert set(chart_data) == {'cost', 'energy'}
+    assert all(len(chart['values1']) == len(chart['values2']) == 12 for chart in chart_data.values())
 
 
 def test_create_out_csv():
     """
     GIVEN Valid data objects header, data_df, and footer
-    WHEN create_out_csv() is called
+    WHEN DEPRECATED_create_out_csv() is called
     THEN An output csv is created at out_relative_path
     """
     # Create a temp dir and write a temp output graph to that dir, assert that the temp file is created
     with TemporaryDirectory() as tmp_dir:
         tmp_file_path = os_join(tmp_dir, 'TEST.csv')
-        create_out_csv(
+        DEPRECATED_create_out_csv(
             header={'Name': 'TEST',
                     'Address': 'test_address',
                     'Cost/kWh': 'test_cost/kWh',
                     '': ''},  # Blank Row
-            data_df=_TEST_DF,
+            data_df=_TEST_TABLE,
             footer={'': '',  # Blank Row
                     'Note:': 'test_note',
                     'Potential kWh Source:': 'test_source'},
@@ -93,12 +233,17 @@ def test_create_out_csv():
         assert isfile(tmp_file_path)
 
 
-def test_get_results():
+def test_get_results(monkeypatch):
     """
-    GIVEN Valid InputData and SolarPotentialData objects
+    GIVEN Valid InputData and SolarPotentialData objects, with s3 and DynamoDB stand-ins
     WHEN get_results() is called on those valid data objects
-    THEN Return a valid ResultsData object
+    THEN Return a valid ResultsData object and write its item to DynamoDB
     """
-    test_results = get_results(input_data=_MODEL_INPUT, solar_data=_MODEL_SOLAR)
+    s3, dynamodb = _StandInS3(), _StandInDynamoDB()
+    monkeypatch.setattr(results_module, 'S3', s3)
+    monkeypatch.setattr(results_module, 'DYNAMODB', dynamodb)
+    monkeypatch.setattr(results_module, '_KNOWN_ARTIFACTS', OrderedDict())
+    test_results = get_results(input_data=_MODEL_INPUT, solar_data=_SOLAR_POTENTIAL_VALID, chart_mode='png')
 
+    assert [uid for _, uid in dynamodb.items] == [test_results.uid]
     assert isinstance(test_results, Results)
@@ -0,0 +1,55 @@
+# tests.test_results_codec.py
+from backend.results_codec import encode_results_data, decode_results_data, ResultsDataError, RESULTS_DATA_COLUMNS, \
+    MONTHS
+from json import dumps as j_dumps
+from pytest import raises as p_raises
+
+_CONSUMPTION = [820, 780, 679, 740, 720, 730, 705, 715, 710, 702, 662, 780]
+_COST = [155.8, 148.2, 128.4, 140.6, 140.6, 121.0, 133.95, 135.85, 134.9, 133.38, 149.5, 148.2]
+_TABLE = {
+    'Month': list(MONTHS) + ['Annual'],
+    'Consumption kWh': _CONSUMPTION + [sum(_CONSUMPTION)],
+    'Cost $': _COST + [round(sum(_COST), 2)],
+    'Potential kWh': [600, 680, 820, 900, 980, 990, 1000, 990, 890, 790, 660, 610] + [9910],
+    'Potential Value $': [114.0, 129.2, 155.8, 171.0, 186.2, 188.1, 190.0, 188.1, 169.1, 150.1, 125.4, 115.9, 1882.9],
+    'Potential Cost $': [41.8, 19.0, -26.79, -30.4, -49.4, -49.4, -56.05, -52.25, -34.2, -16.72, 0.38, 32.3, -221.73],
+    'Savings $': [114.0, 129.2, 155.19, 171.0, 190.0, 170.4, 190.0, 188.1, 169.1, 150.1, 149.12, 115.9, 1892.11],
+    'Cost Reduction %': [73.17, 87.18, 120.86, 121.62, 135.14, 140.83, 141.84, 138.46, 125.35, 112.54, 99.75, 78.21,
+                         115],
+}
+
+
+def test_encode_results_data():
+    """
+    GIVEN A results table with 13 rows per column
+    WHEN It is encoded then decoded
+    THEN The same table is returned from a much smaller, compressed encoding
+    """
+    data = encode_results_data(table=_TABLE)
+
+    assert isinstance(data, bytes)
+    assert data[:2] == b'\x01\x01'  # version 1, zlib compressed
+    assert len(data) < len(encode_results_data(table=_TABLE, compress=False)) < len(j_dumps(_TABLE)) / 2
+    assert decode_results_data(data=data) == _TABLE
+    assert decode_results_data(data=encode_results_data(table=_TABLE, compress=False)) == _TABLE
+    assert list(decode_results_data(data=data)) == ['Month'] + [column for column, _ in RESULTS_DATA_COLUMNS]
+
+
+def test_decode_results_data_legacy_and_invalid():
+    """
+    GIVEN A legacy DataFrame.to_json() results_data string and malformed/unknown results_data bytes
+    WHEN decode_results_data() is called on them
+    THEN The legacy table is decoded by column and the others raise a ResultsDataError
+    """
+    legacy = j_dumps({column: {str(i): value for i, value in enumerate(values)} for column, values in _TABLE.items()})
+    assert decode_results_data(data=legacy) == _TABLE
+
+    data = encode_results_data(table=_TABLE)
+    with p_raises(ResultsDataError):
+        decode_results_data(data=b'\x02' + data[1:])
+    with p_raises(ResultsDataError):
+        decode_results_data(data=data[:40])
+
+
+if __name__ == '__main__':
+    pass
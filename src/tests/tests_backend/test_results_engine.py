@@ -0,0 +1,64 @@
+# tests.test_results_engine.py
+from backend.results_engine import compute_results, round_like_python
+from math import ceil
+from random import Random
+import numpy as np
+
+
+def _per_customer(consumption: list, cost: list, solar: list, cost_per_kwh: float) -> dict:
+    """The per-customer math get_results() used before the vectorized engine."""
+
+    production_value = [round(kwh * cost_per_kwh, 2) for kwh in solar]
+    potential_cost = [round((used - made) * cost_per_kwh, 2) for used, made in zip(consumption, solar)]
+    savings = [round(paid - potential, 2) for paid, potential in zip(cost, potential_cost)]
+    cost_reduction = [round(saved / paid * 100, 2) for saved, paid in zip(savings, cost)]
+    return {
+        'production_value': production_value,
+        'potential_cost_monthly': potential_cost,
+        'savings_monthly': savings,
+        'cost_reduction_monthly': cost_reduction,
+        'savings_annual': sum(savings),
+        'cost_reduction_average': round(sum(cost_reduction) / len(cost_reduction)),
+    }
+
+
+def test_round_like_python():
+    """
+    GIVEN Values whose scaled float representation lands on or next to a .5 tie
+    WHEN round_like_python() is called
+    THEN Every value is rounded exactly like python's round()
+    """
+    values = np.array([2.675, 1.005, 0.125, 0.375, 1234.565, -2.675, 1e-9, 0.0])
+    assert round_like_python(values, 2).tolist() == [round(value, 2) for value in values.tolist()]
+
+
+def test_compute_results():
+    """
+    GIVEN 12xN arrays for 500 random customers
+    WHEN compute_results() is called
+    THEN Every monthly and annual figure is identical to the per-customer path
+    """
+    rand = Random(0)
+    n = 500
+    consumption = [[rand.randint(200, 2000) for _ in range(12)] for _ in range(n)]
+    cost_per_kwh = [round(rand.uniform(0.08, 0.45), 2) for _ in range(n)]
+    cost = [[round(kwh * rate + rand.uniform(-5, 5), 2) for kwh in row] for row, rate in zip(consumption, cost_per_kwh)]
+    solar = [[rand.randint(100, 2500) for _ in range(12)] for _ in range(n)]
+    needed_kwh = [rand.randint(1, 20) for _ in range(n)]
+    mod_kwh = [rand.choice([0.3, 0.35, 0.4, 0.45]) for _ in range(n)]
+
+    figures = compute_results(
+        consumption_monthly=np.array(consumption).T, cost_monthly=np.array(cost).T,
+        solar_potential_monthly=np.array(solar).T, cost_per_kwh=cost_per_kwh, needed_kwh=needed_kwh, mod_kwh=mod_kwh
+    )
+    for i in range(n):
+        expected = _per_customer(consumption[i], cost[i], solar[i], cost_per_kwh[i])
+        for key in ('production_value', 'potential_cost_monthly', 'savings_monthly', 'cost_reduction_monthly'):
+            assert figures[key][:, i].tolist() == expected[key]
+        assert figures['savings_annual'][i] == expected['savings_annual']
+        assert figures['cost_reduction_average'][i] == expected['cost_reduction_average']
+        assert figures['mod_quantity'][i] == ceil(needed_kwh[i] / mod_kwh[i])
+
+
+if __name__ == '__main__':
+    pass
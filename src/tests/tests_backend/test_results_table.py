@@ -0,0 +1,52 @@
+# tests.test_results_table.py
+from backend.results_table import ResultsTable
+from pytest import importorskip, raises as p_raises
+from io import StringIO
+
+_DATA = {
+    'Month': ['January', 'February', 'Annual'],
+    'Consumption kWh': [820, 780, 1600],
+    'Cost $': [155.8, 121.0, 276.8],
+    'Potential Value $': [114.00000000000001, 129.2, 243.20000000000002],
+    'Potential Cost $': [41.8, -26.79, 15.009999999999998],
+    'Cost Reduction %': [73.17, 120.86, 97],
+}
+
+
+def test_results_table():
+    """
+    GIVEN Columns of values for a ResultsTable
+    WHEN The table is created
+    THEN Each column has a single type and is returned as a list
+    """
+    table = ResultsTable(data=_DATA)
+
+    assert len(table) == 3 and table.columns == list(_DATA)
+    assert table['Consumption kWh'] == [820, 780, 1600]
+    # Like a DataFrame's float64 column, an int in a float column becomes a float
+    assert table['Cost Reduction %'] == [73.17, 120.86, 97.0]
+    assert next(table.rows()) == ('January', 820, 155.8, 114.00000000000001, 41.8, 73.17)
+    with p_raises(ValueError):
+        ResultsTable(data={'a': [1], 'b': [1, 2]})
+
+
+def test_results_table_matches_pandas():
+    """
+    GIVEN A ResultsTable and a pandas DataFrame of the same data
+    WHEN Both are serialized to csv and json
+    THEN The output is identical
+    """
+    DataFrame = importorskip('pandas').DataFrame
+    table, data_frame = ResultsTable(data=_DATA), DataFrame(data=_DATA)
+
+    assert table.to_csv() == data_frame.to_csv()
+    assert table.to_csv(index=False) == data_frame.to_csv(index=False)
+    assert table.to_json() == data_frame.to_json()
+    buffer = StringIO()
+    table.to_csv(buffer)
+    assert buffer.getvalue() == data_frame.to_csv()
+    assert table.to_dataframe().equals(data_frame)
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,44 @@
+# tests.test_sheets_client.py
+from backend.sheets_client import SheetsClient, StandInSheetsTransport, SheetsError, stand_in_sheet, SHEET_RANGES
+from pytest import raises as p_raises
+
+
+_SHEETS = {
+    f'sheet{i}': stand_in_sheet(
+        name=f'Customer {i}', address=f'{i} Main Street', mod_kwh=0.4, consumption=[800] * 12, cost=[152.0] * 12
+    )
+    for i in range(20)
+}
+
+
+def test_batch_get():
+    """
+    GIVEN A SheetsClient on a stand-in transport
+    WHEN batch_get() is called for a sheet that exists and one that does not
+    THEN A batchGet shaped response with the template ranges is returned or the transport's error is raised
+    """
+    client = SheetsClient(transport=StandInSheetsTransport(sheets=_SHEETS))
+    response = client.batch_get(sheet_id='sheet1')
+    assert [value_range['range'] for value_range in response['valueRanges']] == [f'Sheet1!{r}' for r in SHEET_RANGES]
+    assert response['valueRanges'][2]['values'] == [['Customer 1'], ['1 Main Street'], ['0.4']]
+    with p_raises(SheetsError):
+        client.batch_get(sheet_id='missing')
+
+
+def test_batch_get_many():
+    """
+    GIVEN A SheetsClient on a slow stand-in transport
+    WHEN batch_get_many() is called for many sheets, one of which does not exist
+    THEN Every sheet is read once, concurrently but never more than max_workers at a time, and the failure is isolated
+    """
+    transport = StandInSheetsTransport(sheets=_SHEETS, latency=0.02)
+    client = SheetsClient(transport=transport, max_workers=4)
+    results = dict(client.batch_get_many(sheet_ids=iter(list(_SHEETS) + ['missing'])))
+    assert len(results) == 21 and transport.calls == 21
+    assert 1 < transport.max_concurrency <= 4
+    assert isinstance(results['missing'], SheetsError)
+    assert results['sheet7']['spreadsheetId'] == 'sheet7'
+
+
+if __name__ == '__main__':
+    pass
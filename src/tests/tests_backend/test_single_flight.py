@@ -0,0 +1,49 @@
+# tests.test_single_flight.py
+from pytest import raises as p_raises
+from backend.single_flight import SingleFlight
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+
+
+def test_single_flight_coalesces():
+    """
+    GIVEN 8 concurrent calls for the same key while the first one is in flight
+    WHEN SingleFlight.do() is called for each of them
+    THEN The function runs once and every caller receives its result
+    """
+    single_flight, release, calls = SingleFlight(), Event(), []
+
+    def _lookup(address: str) -> str:
+        calls.append(address)
+        release.wait()
+        return address.upper()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [executor.submit(single_flight.do, 'key', _lookup, 'test') for _ in range(8)]
+        while single_flight.stats()['coalesced'] < 7:
+            pass
+        release.set()
+        assert [future.result() for future in futures] == ['TEST'] * 8
+
+    assert calls == ['test']
+    assert single_flight.stats() == {'executed': 1, 'coalesced': 7, 'in_flight': 0}
+
+
+def test_single_flight_errors():
+    """
+    GIVEN A call that raises an exception
+    WHEN SingleFlight.do() is called for it and again afterwards
+    THEN The exception is raised to the caller and the key is not kept, so the next call runs again
+    """
+    single_flight = SingleFlight()
+
+    def _fail():
+        raise ValueError('Invalid address')
+
+    with p_raises(ValueError):
+        single_flight.do('key', _fail)
+    assert single_flight.do('key', lambda: 'retried') == 'retried'
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,91 @@
+# tests.test_solar_cache.py
+from backend.solar_cache import SolarCache, normalize_address, cache_key
+from os.path import join as os_join
+from tempfile import TemporaryDirectory
+from time import sleep
+
+
+_PARAMS = {
+    "system_capacity": "1",
+    "azimuth": "180",
+    "tilt": "40",
+    "array_type": "1",
+    "module_type": "1",
+    "losses": "10",
+    "address": "3940 State Street, 93105"
+}
+_RESPONSE = {"outputs": {"ac_annual": 1780.5, "ac_monthly": [130.1] * 12}}
+
+
+def test_normalize_address():
+    """
+    GIVEN Two spellings of the same address differing in case, punctuation and whitespace
+    WHEN normalize_address() and cache_key() are called on them
+    THEN Both spellings produce the same normalized address and cache key
+    """
+    assert normalize_address('3940  State Street, 93105') == '3940 state street 93105'
+    assert cache_key(dict(_PARAMS, address='3940 STATE street 93105 ')) == cache_key(_PARAMS)
+    assert cache_key(dict(_PARAMS, system_capacity='5')) != cache_key(_PARAMS)
+
+
+def test_solar_cache_hit_miss():
+    """
+    GIVEN An empty SolarCache
+    WHEN A response is looked up before and after it is stored
+    THEN The first lookup misses, the second hits and the counters reflect both
+    """
+    with TemporaryDirectory() as tmp_dir:
+        cache = SolarCache(path=os_join(tmp_dir, 'cache.sqlite3'))
+        assert cache.get(params=_PARAMS) is None
+        cache.set(params=_PARAMS, response=_RESPONSE)
+        assert cache.get(params=_PARAMS) == _RESPONSE
+        # The cache is persistent so a new instance on the same file sees the entry
+        assert SolarCache(path=cache.path).get(params=_PARAMS) == _RESPONSE
+        assert cache.stats() == {'hits': 1, 'misses': 1, 'hit_rate': 0.5, 'entries': 1}
+
+
+def test_solar_cache_ttl_and_eviction():
+    """
+    GIVEN A SolarCache with a short TTL and a max of 2 entries
+    WHEN Entries expire or a 3rd entry is stored
+    THEN Expired entries miss and the least recently used entry is evicted
+    """
+    with TemporaryDirectory() as tmp_dir:
+        cache = SolarCache(path=os_join(tmp_dir, 'cache.sqlite3'), ttl=0.05)
+        cache.set(params=_PARAMS, response=_RESPONSE)
+        sleep(0.1)
+        assert cache.get(params=_PARAMS) is None
+
+        cache = SolarCache(path=os_join(tmp_dir, 'lru.sqlite3'), max_entries=2)
+        params = [dict(_PARAMS, system_capacity=str(i)) for i in range(3)]
+        cache.set(params=params[0], response=_RESPONSE)
+        sleep(0.01)
+        cache.set(params=params[1], response=_RESPONSE)
+        sleep(0.01)
+        cache.get(params=params[0])
+        sleep(0.01)
+        cache.set(params=params[2], response=_RESPONSE)
+        assert cache.get(params=params[1]) is None
+        assert cache.get(params=params[0]) == _RESPONSE
+        assert cache.stats()['entries'] == 2
+
+
+def test_solar_cache_claim():
+    """
+    GIVEN 2 SolarCache instances (e.g., 2 worker processes) sharing the same file
+    WHEN Both claim the in-flight lease for the same params
+    THEN Only the first claim succeeds and the second receives the response once it is stored
+    """
+    with TemporaryDirectory() as tmp_dir:
+        worker1 = SolarCache(path=os_join(tmp_dir, 'cache.sqlite3'))
+        worker2 = SolarCache(path=worker1.path)
+        assert worker1.claim(params=_PARAMS)
+        assert not worker2.claim(params=_PARAMS)
+        worker1.set(params=_PARAMS, response=_RESPONSE)
+        worker1.release(params=_PARAMS)
+        assert worker2.wait_for(params=_PARAMS, timeout=1) == _RESPONSE
+        assert worker2.claim(params=_PARAMS)
+
+
+if __name__ == '__main__':
+    pass
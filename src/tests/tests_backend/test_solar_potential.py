@@ -1,13 +1,30 @@
 # tests.test_solar_potential.py
-from utils import import_json, SAMPLES
+from utils import import_json, SAMPLES, InputData
 from config import nrel_api_key
-from backend.solar_potential import _get_params, _get_iridescence_obj, \
-    get_solar_potential, SolarPotentialData
+from backend import solar_potential
+from backend.nrel_client import NRELClient
+from backend.rate_limiter import RateLimiter
+from backend.solar_cache import SolarCache
+from backend.solar_potential import _get_params, _get_iridescence_obj, _request_iridescence_obj, _scale_outputs, \
+    scaling_error, get_solar_potential, solar_potential_batch, SolarPotentialData
+from pytest import fixture
+from threading import Event, Thread
+from time import sleep
 
 
 _INPUT_VALID = import_json(SAMPLES['input_valid'])
 
 
+@fixture
+def isolated_solar_state(monkeypatch, tmp_path) -> None:
+    """Give solar_potential a throwaway response cache and rate limiter, leaving the shared ones in /tmp untouched."""
+
+    cache = SolarCache(path=str(tmp_path / 'cache.sqlite3'))
+    limiter = RateLimiter(api_keys=[nrel_api_key], path=str(tmp_path / 'rate_limit.sqlite3'))
+    monkeypatch.setattr(solar_potential, 'get_solar_cache', lambda: cache)
+    monkeypatch.setattr(solar_potential, 'get_rate_limiter', lambda api_keys: limiter)
+
+
 def test__get_params():
     """
     GIVEN The appropriate arguments to create a params object.
@@ -23,33 +40,173 @@ def test__get_params():
         assert isinstance(val, str)
 
 
-def test__get_iridescence_object():
+def test__get_iridescence_object(pvwatts_stand_in, isolated_solar_state, monkeypatch):
     """
-    GIVEN Valid parameters and token for PVWatts api.
+    GIVEN Valid parameters and token for PVWatts api (served by the local stand-in).
     WHEN Calling the api via the requests library.
     THEN Get a dictionary containing the response.
     """
+    client = NRELClient(url=pvwatts_stand_in.url)
+    monkeypatch.setattr(solar_potential, 'get_nrel_client', lambda: client)
     test_params = _get_params(capacity=1, address=_INPUT_VALID['address'])
-    test_irid_obj = _get_iridescence_obj(params=test_params, nrel_token=nrel_api_key)
+    test_irid_obj = _get_iridescence_obj(params=test_params, nrel_token=nrel_api_key, use_cache=False)
 
     assert isinstance(test_irid_obj, dict)
     assert test_irid_obj.get('outputs') is not None
     assert len(test_irid_obj) == 7
 
 
-def test_get_solar_potential():
+def test_get_solar_potential(pvwatts_stand_in, isolated_solar_state, monkeypatch):
     """
-    GIVEN Valid parameters for creating an instance of the SolarPotentialData object.
+    GIVEN Valid input data for creating an instance of the SolarPotentialData object (api served by the stand-in,
+        with a throwaway cache and rate limiter).
     WHEN Calling the get_solar_potential() function.
     THEN Get a valid SolarPotentialData object.
     """
-    assert isinstance(
-        get_solar_potential(
-            address=_INPUT_VALID['address'],
-            annual_consumption=_INPUT_VALID['consumption_annual']
-        ),
-        SolarPotentialData
-    )
+    client = NRELClient(url=pvwatts_stand_in.url)
+    monkeypatch.setattr(solar_potential, 'get_nrel_client', lambda: client)
+    assert isinstance(get_solar_potential(input_data=_INPUT_VALID), SolarPotentialData)
+
+
+def test_get_solar_potential_unvalidated(pvwatts_stand_in, isolated_solar_state, monkeypatch):
+    """
+    GIVEN A validated InputData model and its dict, with the api served by the local stand-in (throwaway cache
+        and rate limiter).
+    WHEN get_solar_potential() is called with and without validating its model.
+    THEN The model is read directly and both SolarPotentialData objects hold the same values.
+    """
+    client = NRELClient(url=pvwatts_stand_in.url)
+    monkeypatch.setattr(solar_potential, 'get_nrel_client', lambda: client)
+    input_data = InputData(**_INPUT_VALID, time_stamp='test', status={'status_code': 200, 'message': 'test'})
+
+    validated = get_solar_potential(input_data=input_data.dict()).dict(exclude={'time_stamp'})
+    unvalidated = get_solar_potential(input_data=input_data, validate=False)
+    assert isinstance(unvalidated, SolarPotentialData)
+    assert unvalidated.dict(exclude={'time_stamp'}) == validated
+    assert isinstance(unvalidated.solar_potential_annual, int)
+
+
+def test__request_iridescence_obj_rate_limited(pvwatts_stand_in, isolated_solar_state, monkeypatch):
+    """
+    GIVEN The api served by the local stand-in
+    WHEN _request_iridescence_obj() is called by default and with NREL_RATE_LIMITED set
+    THEN Only the request with NREL_RATE_LIMITED set takes a token from the rate limiter
+    """
+    client = NRELClient(url=pvwatts_stand_in.url)
+    monkeypatch.setattr(solar_potential, 'get_nrel_client', lambda: client)
+    limiter = solar_potential.get_rate_limiter(api_keys=[nrel_api_key])
+    params = _get_params(capacity=1, address=_INPUT_VALID['address'])
+
+    assert _request_iridescence_obj(params=params).get('outputs')
+    assert all(usage['granted'] == 0 for usage in limiter.usage().values())
+    monkeypatch.setattr(solar_potential, 'NREL_RATE_LIMITED', True)
+    assert _request_iridescence_obj(params=params).get('outputs')
+    assert sum(usage['granted'] for usage in limiter.usage().values()) == 1
+
+
+def test__request_iridescence_obj_keeps_others_lease(pvwatts_stand_in, monkeypatch, tmp_path):
+    """
+    GIVEN Another process holding the in-flight lease for params whose response never lands in the shared cache
+    WHEN _request_iridescence_obj() stops waiting on it and requests the api itself
+    THEN The response is returned and the other process's lease is left in place
+    """
+    client = NRELClient(url=pvwatts_stand_in.url)
+    monkeypatch.setattr(solar_potential, 'get_nrel_client', lambda: client)
+    monkeypatch.setattr(solar_potential, 'COALESCE_ACROSS_PROCESSES', True)
+    other, cache = SolarCache(path=str(tmp_path / 'cache.sqlite3')), SolarCache(path=str(tmp_path / 'cache.sqlite3'))
+    params = _get_params(capacity=1, address=_INPUT_VALID['address'])
+    assert other.claim(params=params)
+    monkeypatch.setattr(cache, 'wait_for', lambda params: None)  # The wait times out
+
+    assert _request_iridescence_obj(params=params, cache=cache).get('outputs')
+    assert not cache.claim(params=params)
+
+
+def test__scale_outputs():
+    """
+    GIVEN The outputs of a normalized (1 kW) PVWatts response.
+    WHEN _scale_outputs() is called with a capacity.
+    THEN The monthly and annual ac outputs are multiplied by the capacity.
+    """
+    normal_outputs = {'ac_monthly': [100.5] * 12, 'ac_annual': 1206.0}
+    scaled = _scale_outputs(normal_outputs=normal_outputs, capacity=5)
+
+    assert scaled['ac_monthly'] == [502.5] * 12
+    assert scaled['ac_annual'] == 6030.0
+
+
+def test_scaling_error():
+    """
+    GIVEN A normalized response and a response requested at 5 kW that differs slightly from linear.
+    WHEN scaling_error() is called.
+    THEN The largest monthly and the annual errors are reported in kWh and percent.
+    """
+    normal_obj = {'outputs': {'ac_monthly': [100.0] * 12, 'ac_annual': 1200.0}}
+    actual_obj = {'outputs': {'ac_monthly': [500.0] * 11 + [490.0], 'ac_annual': 5990.0}}
+    error = scaling_error(normal_obj=normal_obj, actual_obj=actual_obj, capacity=5)
+
+    assert error['max_monthly_error_kwh'] == 10.0
+    assert error['max_monthly_error_pct'] == round(10 / 490 * 100, 4)
+    assert error['annual_error_kwh'] == 10.0
+
+
+def test_solar_potential_batch(monkeypatch):
+    """
+    GIVEN A batch of input events where every 5th address fails.
+    WHEN solar_potential_batch() is called ordered and unordered.
+    THEN Every event yields a result, failures get a 400 Status and ordered results keep the input order.
+    """
+    def _fake_get_solar_potential(input_data: dict, scaling=None) -> SolarPotentialData:
+        sleep((20 - input_data['index'] % 20) / 1000)
+        if input_data['index'] % 5 == 0:
+            raise ValueError('Invalid address')
+        return SolarPotentialData(
+            uid=input_data['uid'], name='test', time_stamp='test', status={'status_code': 200, 'message': 'test'},
+            address='test', solar_potential_monthly=[1] * 12, solar_potential_annual=12, needed_kwh=1
+        )
+
+    monkeypatch.setattr(solar_potential, 'get_solar_potential', _fake_get_solar_potential)
+    events = [{'uid': str(i), 'index': i} for i in range(40)]
+
+    ordered = list(solar_potential_batch(events=events, max_workers=4, ordered=True))
+    assert [result['uid'] for result in ordered] == [event['uid'] for event in events]
+    # Failed items carry the handler's 400 Status model, successful items the dict of their model
+    failed = [result['uid'] for result in ordered if not isinstance(result['status'], dict)]
+    assert failed == [str(i) for i in range(0, 40, 5)]
+    unordered = list(solar_potential_batch(events=iter(events), max_workers=4))
+    assert sorted(result['uid'] for result in unordered) == sorted(event['uid'] for event in events)
+
+
+def test_solar_potential_batch_bounded_buffer(monkeypatch):
+    """
+    GIVEN An ordered batch whose first event is held up while the others complete right away
+    WHEN solar_potential_batch() is run with max_buffered results
+    THEN No more events are started than can be buffered behind the first, until it completes
+    """
+    first_done, started = Event(), []
+
+    def _fake_get_solar_potential(input_data: dict, scaling=None) -> SolarPotentialData:
+        started.append(input_data['index'])
+        if input_data['index'] == 0:
+            first_done.wait(timeout=5)
+        return SolarPotentialData(
+            uid=input_data['uid'], name='test', time_stamp='test', status={'status_code': 200, 'message': 'test'},
+            address='test', solar_potential_monthly=[1] * 12, solar_potential_annual=12, needed_kwh=1
+        )
+
+    monkeypatch.setattr(solar_potential, 'get_solar_potential', _fake_get_solar_potential)
+    events = ({'uid': str(i), 'index': i} for i in range(100))
+    results = []
+    consumer = Thread(target=lambda: results.extend(
+        solar_potential_batch(events=events, max_workers=2, ordered=True, max_buffered=5)
+    ))
+    consumer.start()
+    sleep(0.2)
+    # Only the first event, the 5 buffered behind it and the 2 * max_workers in flight were started
+    assert 6 <= len(started) <= 1 + 5 + 4
+    first_done.set()
+    consumer.join(timeout=5)
+    assert [result['uid'] for result in results] == [str(i) for i in range(100)]
 
 
 if __name__ == '__main__':
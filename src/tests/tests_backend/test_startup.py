@@ -0,0 +1,27 @@
+# tests.test_startup.py
+from backend.startup import check_startup_budget, profile_import, IMPORT_BUDGET_MS
+
+
+def test_deferred_imports():
+    """
+    GIVEN The Lambda entry point module
+    WHEN It is imported in a fresh interpreter
+    THEN No AWS SDK, matplotlib or pandas module is loaded
+    """
+    profile = profile_import(module='main', runs=1)
+
+    assert profile['deferred_loaded'] == []
+    assert profile['ms'] > 0 and profile['slowest']
+
+
+def test_startup_budget():
+    """
+    GIVEN The import time budget of the Lambda entry points
+    WHEN Their import time is profiled
+    THEN None is over budget
+    """
+    assert check_startup_budget(budgets={name: IMPORT_BUDGET_MS[name] for name in ('main', 'pipeline')}) == []
+
+
+if __name__ == '__main__':
+    pass
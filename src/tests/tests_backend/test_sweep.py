@@ -0,0 +1,44 @@
+# tests.test_sweep.py
+from backend import sweep
+from backend.sweep import sweep_orientations
+from backend.pvwatts_server import synthetic_response
+import numpy as np
+
+
+_ADDRESS = '3940 State Street, 93105'
+
+
+def test_sweep_orientations(monkeypatch):
+    """
+    GIVEN A PVWatts api whose output peaks at a south facing (180) array tilted 30 degrees
+    WHEN sweep_orientations() is called over a grid of tilts, azimuths and losses
+    THEN Each configuration is fetched once and the best one and the full surface are returned, with the loss values
+        derated from the reference profile (if asked to) marked as such
+    """
+    requests = []
+
+    def _fake_get_iridescence_obj(params: dict, nrel_token=None, use_cache=True) -> dict:
+        requests.append(params)
+        return synthetic_response(params)
+
+    monkeypatch.setattr(sweep, '_get_iridescence_obj', _fake_get_iridescence_obj)
+    result = sweep_orientations(
+        address=_ADDRESS, tilts=(10, 30, 50), azimuths=(90, 180, 270), losses=(10, 14), annual_consumption=8892
+    )
+
+    assert len(requests) == result['profiles_fetched'] == 18 and not result['derated_losses']
+    assert (result['best']['tilt'], result['best']['azimuth'], result['best']['losses']) == (30, 180, 10)
+    assert result['ac_annual'].shape == (3, 3, 2)
+    assert result['ac_monthly'].shape == (3, 3, 2, 12)
+    assert result['best']['needed_kwh'] == round(8892 / result['best']['ac_annual'])
+
+    requests.clear()
+    derated = sweep_orientations(address=_ADDRESS, tilts=(10, 30, 50), azimuths=(90, 180, 270), losses=(10, 14),
+                                 exact_losses=False)
+    assert len(requests) == derated['profiles_fetched'] == 9 and derated['derated_losses'] == [14]
+    # The stand-in's output is linear in losses, so here the derate matches the fetched profile
+    assert np.allclose(derated['ac_annual'], result['ac_annual'])
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,21 @@
+# tests.test_validate_scaling.py
+from backend.validate_scaling import validate_scaling, MAX_SCALING_ERROR_PCT
+from pytest import raises as p_raises
+
+
+def test_validate_scaling(tmp_path):
+    """
+    GIVEN The recorded 1 kW / N kW PVWatts response pairs shipped in samples/pvwatts
+    WHEN validate_scaling() is called on them and on a directory that does not exist
+    THEN Every sample's analytic scaling error is within MAX_SCALING_ERROR_PCT, the missing directory is reported
+    """
+    summary = validate_scaling()
+    assert summary['samples'] == 3 and summary['within_bound']
+    assert summary['max_monthly_error_pct'] <= MAX_SCALING_ERROR_PCT
+    assert summary['max_annual_error_pct'] <= MAX_SCALING_ERROR_PCT
+    with p_raises(FileNotFoundError):
+        validate_scaling(sample_dir=str(tmp_path / 'missing'))
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,47 @@
+# tests.test_warmup.py
+from backend.warmup import is_warmup_event, warmup_handler, WARMUP_STEPS
+import results  # warmup.py uses the flat (as deployed) results module
+
+
+def test_warmup_handler(monkeypatch):
+    """
+    GIVEN A warmup event with addresses to load into the solar cache
+    WHEN warmup_handler() is called
+    THEN Every step runs, each address is requested at 1 kW and the step timings are returned
+    """
+    requested, resources = [], []
+    monkeypatch.setattr('solar_potential._get_iridescence_obj', lambda params: requested.append(params))
+    # No real boto3 resources (they need an AWS region and credentials)
+    monkeypatch.setattr('utils.get_aws_resource', resources.append)
+    event = {'warmup': True, 'addresses': ['1 Main St, 94103', '2 Main St, 94103']}
+
+    assert is_warmup_event(event=event) and is_warmup_event(event={'detail-type': 'Scheduled Event'})
+    assert not is_warmup_event(event={'uid': 'test', 'address': '1 Main St, 94103'})
+    result = warmup_handler(event=event)
+
+    assert result['status']['status_code'] == 200
+    assert list(result['warmup_ms']) == list(WARMUP_STEPS)
+    assert all(ms >= 0 for ms in result['warmup_ms'].values()) and result['total_ms'] >= 0
+    assert [(params['address'], params['system_capacity']) for params in requested] == \
+        [('1 Main St, 94103', '1'), ('2 Main St, 94103', '1')]
+    assert resources == ['s3', 'dynamodb']
+    # Every render worker was started (and warmed its template as it started)
+    assert len(results._get_render_pool()._processes) == results.RENDER_WORKERS
+
+
+def test_warmup_handler_unknown_step(monkeypatch):
+    """
+    GIVEN A warmup event naming an unknown step
+    WHEN warmup_handler() is called
+    THEN The other steps still run and a 400 status is returned
+    """
+    resources = []
+    monkeypatch.setattr('utils.get_aws_resource', resources.append)
+    result = warmup_handler(event={'warmup': True, 'steps': ['aws', 'fonts']})
+
+    assert result['status']['status_code'] == 400 and 'fonts' in result['status']['message']
+    assert list(result['warmup_ms']) == ['aws', 'fonts'] and resources == ['s3', 'dynamodb']
+
+
+if __name__ == '__main__':
+    pass
@@ -9,6 +9,21 @@
 # This is for getting the solar potential data from PVWATTS
 #     https://developer.nrel.gov/signup/
 NREL_API_KEY = ''
+# OPTIONAL: Every key listed here is rotated across (and rate limited separately) to raise the hourly quota.
+NREL_API_KEYS = [NREL_API_KEY]
+# OPTIONAL: For offline/reproducible runs. Point NREL_URL at the stand-in (python src/backend/pvwatts_server.py)
+# and/or set PVWATTS_MODE to 'record' to save live responses as cassettes or 'replay' to only use cassettes.
+NREL_URL = 'https://developer.nrel.gov/api/pvwatts/v6.json'
+PVWATTS_MODE = 'live'
+# OPTIONAL: Whether requests take a token from the host wide NREL rate limiter. None only limits requests to NREL's
+# own api, so runs against the stand-in or another NREL_URL do not wait on (or use up) the real keys' hourly quota.
+NREL_RATE_LIMITED = None
+# OPTIONAL: 'png' renders the result graphs server side and uploads them to s3. 'client' skips that and returns only
+# their chart data for the browser to draw (the png graphs remain available by requesting chart_mode 'png').
+CHART_MODE = 'png'
+# OPTIONAL: Addresses whose solar data warmup events ({"warmup": true} or a scheduled EventBridge event) load into
+# the solar cache, so the first requests for them in a new container skip the PVWatts api.
+WARMUP_ADDRESSES = []
 
 # REQUIRED: AWS Access and Secret Keys along with the region and table name you are using
 DYNAMODB_TABLE_NAME = ''
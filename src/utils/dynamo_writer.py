@@ -0,0 +1,184 @@
+# SolarCalculator/src/utils/dynamo_writer.py
+# Buffered, thread-safe DynamoDB writer grouping puts and deletes into batch_write_item calls.
+from logging import getLogger
+from random import random
+from threading import Event, Lock, Thread
+from time import monotonic, sleep
+from typing import Any, Dict, List, Sequence
+
+LOGGER = getLogger(__name__)
+
+BATCH_SIZE = 25  # The most requests DynamoDB accepts in one batch_write_item call.
+FLUSH_INTERVAL = 1.0  # Seconds an item may wait in the buffer before it is written.
+MAX_RETRIES = 8
+BACKOFF = 0.05  # Seconds, doubled on every retry of unprocessed items up to MAX_BACKOFF.
+MAX_BACKOFF = 5.0
+
+
+class DynamoWriteError(Exception):
+    """Custom exception for items that could not be written after every retry or that DynamoDB rejected."""
+
+    def __init__(self, message: str, requests: List[dict] = None):
+        super().__init__(message)
+        self.requests = requests or []
+
+
+class DynamoBatchWriter:
+    """
+    Buffers puts and deletes for a table and writes them in batch_write_item calls of up to batch_size requests,
+    retrying unprocessed items with exponential backoff. A batch is written as soon as it is full, and a background
+    thread writes whatever has waited flush_interval seconds. Use as a context manager (or call close()) so the last
+    items are written. Safe to share between threads.
+
+    :param table_name: Name of the DynamoDB table to write to.
+    :param dynamodb: boto3 DynamoDB service resource (or a stand-in with batch_write_item), created if None.
+    :param key_names: Key attribute names. A buffered request for the same key is replaced instead of sent twice,
+        since DynamoDB rejects batches with duplicate keys.
+    :param flush_interval: Seconds between time based flushes, 0/None to only flush on size and close().
+    """
+
+    def __init__(self, table_name: str, dynamodb=None, key_names: Sequence[str] = None, batch_size: int = BATCH_SIZE,
+                 flush_interval: float = FLUSH_INTERVAL, max_retries: int = MAX_RETRIES, backoff: float = BACKOFF):
+        if dynamodb is None:
+            from boto3 import resource as boto_resource
+            dynamodb = boto_resource('dynamodb')
+        self.table_name = table_name
+        self.dynamodb = dynamodb
+        self.key_names = tuple(key_names or ())
+        self.batch_size = min(batch_size, BATCH_SIZE)
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.backoff = backoff
+        # Counts of the requests written, batch_write_item calls made and retries of unprocessed items
+        self.written = 0
+        self.batches = 0
+        self.retries = 0
+        self._buffer: Dict[Any, dict] = {}
+        self._oldest = None  # monotonic() when the oldest buffered request was added
+        self._sequence = 0
+        self._error = None
+        self._lock = Lock()
+        self._closed = Event()
+        self._flusher = None
+        if flush_interval:
+            self._flusher = Thread(target=self._flush_periodically, name=f'dynamo-{table_name}', daemon=True)
+            self._flusher.start()
+
+    def __enter__(self) -> 'DynamoBatchWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def put_item(self, item: dict) -> None:
+        """Buffer an item to put, writing a batch if the buffer is full."""
+
+        self._add(request={'PutRequest': {'Item': item}}, attributes=item)
+
+    def delete_item(self, key: dict) -> None:
+        """Buffer the key of an item to delete, writing a batch if the buffer is full."""
+
+        self._add(request={'DeleteRequest': {'Key': key}}, attributes=key)
+
+    def _add(self, request: dict, attributes: dict) -> None:
+        with self._lock:
+            if self._closed.is_set():
+                raise DynamoWriteError(f'The writer for DynamoDB table "{self.table_name}" is closed.')
+            if self.key_names:
+                key = tuple(attributes.get(name) for name in self.key_names)
+            else:
+                key, self._sequence = self._sequence, self._sequence + 1
+            self._buffer[key] = request
+            self._oldest = self._oldest or monotonic()
+            batch = self._take(force=False)
+        if batch:
+            self._write(batch)
+        # A failed background flush is only raised once this request is buffered (or written), so the error's
+        # requests are exactly the ones that were not written.
+        self._raise_error()
+
+    def _take(self, force: bool) -> List[dict]:
+        """Remove and return a full batch (or, with force, whatever is buffered up to a batch). Requires the lock."""
+
+        if not self._buffer or (not force and len(self._buffer) < self.batch_size):
+            return []
+        keys = list(self._buffer)[:self.batch_size]
+        batch = [self._buffer.pop(key) for key in keys]
+        self._oldest = monotonic() if self._buffer else None
+        return batch
+
+    def _write(self, batch: List[dict]) -> None:
+        """Write a batch, retrying its unprocessed requests with backoff and jitter."""
+
+        from botocore.exceptions import BotoCoreError, ClientError
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self.dynamodb.batch_write_item(RequestItems={self.table_name: batch})
+            except (BotoCoreError, ClientError) as e:
+                # e.g., throttled past botocore's own retries or a validation error, so none of the batch was written
+                LOGGER.error(f'Writing {len(batch)} items to DynamoDB table "{self.table_name}" failed: {e}')
+                raise DynamoWriteError(
+                    f'{len(batch)} items could not be written to DynamoDB table "{self.table_name}": {e}',
+                    requests=batch
+                ) from e
+            unprocessed = response.get('UnprocessedItems', {}).get(self.table_name, [])
+            with self._lock:
+                self.batches += 1
+                self.written += len(batch) - len(unprocessed)
+                self.retries += bool(unprocessed)
+            if not unprocessed:
+                return
+            batch = unprocessed
+            if attempt < self.max_retries:
+                LOGGER.warning(f'Retrying {len(batch)} unprocessed items for DynamoDB table "{self.table_name}"')
+                sleep(min(MAX_BACKOFF, self.backoff * 2 ** attempt) * random())
+
+        raise DynamoWriteError(
+            f'{len(batch)} items could not be written to DynamoDB table "{self.table_name}" after '
+            f'{self.max_retries} retries.', requests=batch
+        )
+
+    def flush(self) -> None:
+        """Write every buffered request."""
+
+        while True:
+            with self._lock:
+                batch = self._take(force=True)
+            if not batch:
+                break
+            self._write(batch)
+        self._raise_error()
+
+    def _flush_periodically(self) -> None:
+        """Background thread writing requests that have been buffered for flush_interval seconds."""
+
+        while not self._closed.wait(self.flush_interval / 2):
+            with self._lock:
+                due = self._oldest is not None and monotonic() - self._oldest >= self.flush_interval
+            if due:
+                try:
+                    self.flush()
+                except Exception as e:
+                    # Raised to the thread using the writer on its next call
+                    LOGGER.error(f'Flushing DynamoDB table "{self.table_name}" failed: {e}')
+                    with self._lock:
+                        if isinstance(self._error, DynamoWriteError) and isinstance(e, DynamoWriteError):
+                            # Keep reporting every request that failed since the error was last raised
+                            self._error.requests.extend(e.requests)
+                        else:
+                            self._error = self._error or e
+
+    def _raise_error(self) -> None:
+        with self._lock:
+            error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def close(self) -> None:
+        """Stop the background flushes and write every buffered request."""
+
+        self._closed.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        self.flush()
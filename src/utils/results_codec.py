@@ -0,0 +1,90 @@
+# SolarCalculator/src/utils/results_codec.py
+# Compact, versioned columnar encoding of the results table stored in DynamoDB's results_data attribute.
+from json import loads as j_loads
+from struct import Struct, error as StructError
+from typing import Dict, List, Mapping, Sequence, Union
+from zlib import compress as z_compress, decompress as z_decompress, error as ZlibError
+
+RESULTS_DATA_VERSION = 1
+# Columns of the results table (see results.get_results_table()) in encoded order, with the integer scale each is
+# stored at: whole kWh, cents of dollars and hundredths of a percent.
+RESULTS_DATA_COLUMNS = (
+    ('Consumption kWh', 1),
+    ('Cost $', 100),
+    ('Potential kWh', 1),
+    ('Potential Value $', 100),
+    ('Potential Cost $', 100),
+    ('Savings $', 100),
+    ('Cost Reduction %', 100),
+)
+MONTHS = (
+    "January", "February", "March", "April", "May", "June", "July",
+    "August", "September", "October", "November", "December"
+)
+_FLAG_ZLIB = 1
+_HEADER = Struct('<BB')  # version, flags
+_ROWS = len(MONTHS) + 1  # The months and the annual row
+_VALUES = Struct(f'<{len(RESULTS_DATA_COLUMNS) * _ROWS}i')  # The rows of each column, column after column
+
+
+class ResultsDataError(Exception):
+    """Custom exception for results_data that cannot be decoded."""
+
+
+def encode_results_data(table: Mapping[str, Sequence[float]], compress: bool = True) -> bytes:
+    """
+    Encode the 13 rows (months, then annual) of each results table column as little-endian int32s behind a
+    version/flags header. Month names and column labels are implied by the version, dollars are stored as cents
+    and percents as hundredths.
+
+    :param table: Mapping of column name to its 13 values (e.g., a ResultsTable or DataFrame).
+    :param compress: zlib compress the values when that makes them smaller.
+    :return bytes to store as a DynamoDB binary attribute.
+    """
+
+    values = []
+    for column, scale in RESULTS_DATA_COLUMNS:
+        values.extend(round(float(value) * scale) for value in table[column])
+    body, flags = _VALUES.pack(*values), 0
+    if compress:
+        compressed = z_compress(body, 9)
+        if len(compressed) < len(body):
+            body, flags = compressed, _FLAG_ZLIB
+
+    return _HEADER.pack(RESULTS_DATA_VERSION, flags) + body
+
+
+def _decode_legacy(data: str) -> Dict[str, list]:
+    """Decode the pandas DataFrame.to_json() string stored by earlier versions."""
+
+    columns = j_loads(data)
+    return {column: [rows[key] for key in sorted(rows, key=int)] for column, rows in columns.items()}
+
+
+def decode_results_data(data: Union[bytes, bytearray, str]) -> Dict[str, List[Union[int, float]]]:
+    """
+    Decode a results_data attribute into the results table's columns of 13 rows: the months, then the annual row.
+    Accepts the legacy DataFrame json string too.
+
+    :param data: The attribute value, e.g., item['results_data'].value for a boto3 Binary.
+    :return dictionary of column name (starting with 'Month') to its values.
+    """
+
+    if isinstance(data, str):
+        return _decode_legacy(data)
+    data = bytes(data)
+    try:
+        version, flags = _HEADER.unpack_from(data)
+        if version != RESULTS_DATA_VERSION:
+            raise ResultsDataError(f'Unsupported results_data version: {version}')
+        body = data[_HEADER.size:]
+        values = _VALUES.unpack(z_decompress(body) if flags & _FLAG_ZLIB else body)
+    except (StructError, ZlibError) as e:
+        raise ResultsDataError(f'results_data could not be decoded: {e}') from e
+
+    table = {'Month': list(MONTHS) + ['Annual']}
+    for i, (column, scale) in enumerate(RESULTS_DATA_COLUMNS):
+        rows = values[i * _ROWS:(i + 1) * _ROWS]
+        table[column] = list(rows) if scale == 1 else [value / scale for value in rows]
+
+    return table
@@ -1,41 +1,41 @@
 # SolarCalculator/src/utils.py
-from pydantic import BaseModel, conlist, conint, PositiveInt, PositiveFloat
-from boto3 import resource as boto_resource
+from pydantic import BaseModel, Field, conlist, conint, PositiveInt, PositiveFloat
 
 from typing import Union, Dict, Any, List, Type, TypeVar
 from os.path import join
 from pathlib import PurePath, Path
+from threading import Lock
 
 # from config import GOOGLE_API_SHEET_ID
 
 
-DYNAMODB = boto_resource('dynamodb')
-
 JSON = Union[Dict[str, Any], List[Any], int, str, float, bool, Type[None]]
 ROOT = Path(__file__).parents[1]
 
 SAMPLES = {
     # 'sheet': GOOGLE_API_SHEET_ID,
 
-    'csv_valid': join(ROOT, 'src/samples/consumption_valid.csv'),
-    'csv_invalid': join(ROOT, 'src/samples/consumption_invalid.csv'),
+    'csv_valid': join(ROOT, 'samples/files/consumption_valid.csv'),
+    'csv_invalid': join(ROOT, 'samples/files/consumption_invalid.csv'),
+    'csv_bulk': join(ROOT, 'samples/files/consumption_bulk.csv'),
 
-    'xlsx_valid': join(ROOT, 'src/samples/consumption_valid.xlsx'),
+    'xlsx_valid': join(ROOT, 'samples/files/consumption_valid.xlsx'),
+    'xlsx_bulk': join(ROOT, 'samples/files/consumption_bulk.xlsx'),
 
-    'input_valid': join(ROOT, 'src/samples/input_valid.json'),
-    'input_invalid_type': join(ROOT, 'src/samples/input_invalid_type.json'),
-    'input_invalid_value': join(ROOT, 'src/samples/input_invalid_value.json'),
+    'input_valid': join(ROOT, 'samples/event_outputs/input_valid.json'),
+    'input_invalid_type': join(ROOT, 'samples/objects/input_invalid_type.json'),
+    'input_invalid_value': join(ROOT, 'samples/objects/input_invalid_value.json'),
 
     'event_valid_form': join(ROOT, 'samples/event_inputs/input_form.json'),
-    'event_valid_csv': join(ROOT, 'src/samples/event_outputs/input_csv.json'),
-    'event_valid_xlsx': join(ROOT, 'src/samples/event_inputs/input_xlsx.json'),
-    'event_valid_sheet': join(ROOT, 'src/samples/event_inputs/input_sheet.json'),
+    'event_valid_csv': join(ROOT, 'samples/templates/event_valid_csv-template.json'),
+    'event_valid_xlsx': join(ROOT, 'samples/templates/event_valid_xlsx-template.json'),
+    'event_valid_sheet': join(ROOT, 'samples/templates/event_valid_sheet-template.json'),
     'event_ready_for_solar': join(ROOT, 'samples/event_inputs/ready_for_solar.json'),
     'event_ready_for_results': join(ROOT, 'samples/event_inputs/ready_for_results.json'),
 
-    'solar_potential_valid': join(ROOT, 'samples/solar_potential_valid.json'),
+    'solar_potential_valid': join(ROOT, 'samples/event_outputs/solar_potential_valid.json'),
 
-    'results_valid': join(ROOT, 'src/samples/results_valid.json'),
+    'results_valid': join(ROOT, 'samples/event_outputs/results_valid.json'),
 
     'out': PurePath(join(ROOT, 'src/OutputGraphs/RyanZinniger-SolarGraph.png')),
 }
@@ -61,9 +61,36 @@ IntListMonthly = conlist(item_type=int, min_items=12, max_items=12)
 FloatListMonthly = conlist(item_type=float, min_items=12, max_items=12)
 AmbiguousListMonthly = conlist(item_type=float, min_items=12, max_items=12)
 PandasDataFrame = TypeVar('PandasDataFrame')
+NumpyArray = TypeVar('NumpyArray')
 StatusCode = conint(gt=99, lt=600)
 
 
+_AWS_RESOURCES = {}
+_AWS_RESOURCES_LOCK = Lock()
+
+
+def get_aws_resource(service_name: str):
+    """
+    Return the process wide boto3 resource for a service (e.g., 's3', 'dynamodb'), importing boto3 and creating it
+    on first use, so modules that never touch AWS do not pay for it at import (cold start).
+    """
+
+    with _AWS_RESOURCES_LOCK:
+        # Creating resources from boto3's default session is not thread-safe
+        if service_name not in _AWS_RESOURCES:
+            from boto3 import resource as boto_resource
+            _AWS_RESOURCES[service_name] = boto_resource(service_name)
+        return _AWS_RESOURCES[service_name]
+
+
+def __getattr__(name: str):
+    """Create the module level DYNAMODB resource only when it is first used."""
+
+    if name == 'DYNAMODB':
+        return get_aws_resource('dynamodb')
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def post_item_to_dynamodb(dynamo_table, item: dict) -> int:
     """Post a db item to DynamoDB and return the response code."""
 
@@ -141,20 +168,29 @@ def export_json(j_obj: JSON, target_directory: str, out_name: str) -> None:
 def delete_s3_obj(bucket_name: str, obj_key: str) -> int:
     """Delete an s3 object given bucket name and object's key and return the http response code."""
 
-    from boto3 import resource as boto_resource
+    response = get_aws_resource('s3').Object(bucket_name, obj_key).delete()
+    return response['ResponseMetadata']['HTTPStatusCode']
 
-    s3 = boto_resource('s3', aws_access_key_id=AWS_ACCESS_KEY, aws_secret_access_key=AWS_SECRET_KEY)
 
-    response = s3.Object(bucket_name, obj_key).delete()
-    return response['ResponseMetadata']['HTTPStatusCode']
+class PipelineModel(BaseModel):
+    """
+    BaseModel with read-only dict style access, so stages accept a validated model from the in-process pipeline
+    or its .dict() from a Lambda event interchangeably.
+    """
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
 
+    def __getitem__(self, key: str) -> Any:
+        return getattr(self, key)
 
-class Status(BaseModel):
+
+class Status(PipelineModel):
     status_code: StatusCode
     message: str
 
 
-class InputData(BaseModel):
+class InputData(PipelineModel):
     # Required
     uid: str
     name: str
@@ -176,7 +212,7 @@ class InputData(BaseModel):
     sym_cost = "$"
 
 
-class SolarPotentialData(BaseModel):
+class SolarPotentialData(PipelineModel):
     # Required
     uid: str
     name: str
@@ -186,14 +222,19 @@ class SolarPotentialData(BaseModel):
     solar_potential_monthly: IntListMonthly
     solar_potential_annual: PositiveInt
     needed_kwh: PositiveInt
+    # Optional - 8760 hourly kWh values as a float32 numpy array. Not validated item by item, not serialized.
+    solar_potential_hourly: NumpyArray = Field(default=None, exclude=True)
     # Default
     note = "Solar potential (kWh) reported over a 30 year average."
     source = "pvwatts.nrel.gov/pvwatts.php"
     units_solar_potential = "kiloWattHours"
     sym_solar_potential = "kWh"
 
+    class Config:
+        arbitrary_types_allowed = True
+
 
-class Results(BaseModel):
+class Results(PipelineModel):
     # Required
     uid: str
     name: str
@@ -211,8 +252,10 @@ class Results(BaseModel):
     mod_quantity: PositiveInt
     results_data_json: JSON
     url_data_csv: str
-    url_graph_cost: str
-    url_graph_energy: str
+    # Optional - None when the graphs are drawn by the browser from chart_data instead of rendered as pngs
+    url_graph_cost: str = None
+    url_graph_energy: str = None
+    chart_data: JSON = None
 
 
 if __name__ == '__main__':